@@ -81,6 +81,8 @@ common = '''
 .. |NumpyVectorArrays| replace:: :class:`NumpyVectorArrays <pymor.vectorarrays.numpy.NumpyVectorArray>`
 .. |ListVectorArray| replace:: :class:`~pymor.vectorarrays.list.ListVectorArray`
 .. |ListVectorArrays| replace:: :class:`ListVectorArrays <pymor.vectorarrays.list.ListVectorArray>`
+.. |MemmapVectorArray| replace:: :class:`~pymor.vectorarrays.memmap.MemmapVectorArray`
+.. |MemmapVectorArrays| replace:: :class:`MemmapVectorArrays <pymor.vectorarrays.memmap.MemmapVectorArray>`
 
 .. |OperatorBase| replace:: :class:`~pymor.operators.basic.OperatorBase`
 .. |NumpyMatrixOperator| replace:: :class:`~pymor.operators.numpy.NumpyMatrixOperator`
@@ -92,6 +94,7 @@ common = '''
 .. |Concatenation| replace:: :class:`~pymor.operators.constructions.Concatenation`
 .. |NumpyVectorSpace| replace:: :func:`~pymor.vectorarrays.numpy.NumpyVectorSpace`
 .. |NumpyVectorSpaces| replace:: :func:`NumpyVectorSpaces <pymor.vectorarrays.numpy.NumpyVectorSpace>`
+.. |MemmapVectorSpace| replace:: :class:`~pymor.vectorarrays.memmap.MemmapVectorSpace`
 
 .. |StationaryModel| replace:: :class:`~pymor.models.basic.StationaryModel`
 .. |StationaryModels| replace:: :class:`StationaryModels <pymor.models.basic.StationaryModel>`
@@ -101,6 +104,8 @@ common = '''
 .. |ParameterTypes| replace:: :class:`ParameterTypes <pymor.parameters.base.ParameterType>`
 .. |Parameter| replace:: :class:`~pymor.parameters.base.Parameter`
 .. |Parameters| replace:: :class:`Parameters <pymor.parameters.base.Parameter>`
+.. |ParameterArray| replace:: :class:`~pymor.parameters.base.ParameterArray`
+.. |ParameterArrays| replace:: :class:`ParameterArrays <pymor.parameters.base.ParameterArray>`
 .. |Parametric| replace:: :class:`~pymor.parameters.base.Parametric`
 .. |parametric| replace:: :attr:`~pymor.parameters.base.Parametric.parametric`
 
@@ -2,6 +2,7 @@
 # Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
+import heapq
 import time
 
 import numpy as np
@@ -13,7 +14,8 @@ from pymor.parallel.manager import RemoteObjectManager
 
 
 def greedy(fom, reductor, samples, use_estimator=True, error_norm=None,
-           atol=None, rtol=None, max_extensions=None, extension_params=None, pool=None):
+           atol=None, rtol=None, max_extensions=None, extension_params=None, pool=None, batch_size=1,
+           lazy=False, coarse_samples=None):
     """Greedy basis generation algorithm.
 
     This algorithm generates a reduced basis by iteratively adding the
@@ -24,6 +26,12 @@ def greedy(fom, reductor, samples, use_estimator=True, error_norm=None,
     extension steps are performed by calling the methods provided by the
     `reductor` and `extension_algorithm` arguments.
 
+    If `batch_size > 1`, the solution snapshots for the `batch_size` worst
+    approximated parameters are computed in parallel on `pool` in each
+    iteration and added to the basis in a single, POD-compressed extension
+    step. This keeps the workers busy during the snapshot computations, which
+    otherwise are performed sequentially on the main process.
+
     Parameters
     ----------
     fom
@@ -57,6 +65,21 @@ def greedy(fom, reductor, samples, use_estimator=True, error_norm=None,
         `dict` of parameters passed to the `reductor.extend_basis` method.
     pool
         If not `None`, the |WorkerPool| to use for parallelization.
+    batch_size
+        Number of solution snapshots computed per extension step. If larger
+        than one, `extension_params` defaults to
+        `{'method': 'pod', 'pod_modes': batch_size}`.
+    lazy
+        If `True`, the errors on the training set are only computed once for
+        each training set. The estimates are kept in a priority queue and in
+        later iterations only those samples are re-evaluated whose previous
+        error could still exceed the current maximum error. This assumes
+        that the (estimated) errors do not increase when the basis is
+        extended. The re-evaluations are performed on the main process.
+    coarse_samples
+        If not `None`, a coarse training set on which the greedy search is
+        performed first. When the error tolerances are reached on
+        `coarse_samples`, the search continues on `samples`.
 
     Returns
     -------
@@ -66,33 +89,44 @@ def greedy(fom, reductor, samples, use_estimator=True, error_norm=None,
                                  computed basis.
         :max_errs:               Sequence of maximum errors during the greedy run.
         :max_err_mus:            The parameters corresponding to `max_errs`.
-        :extensions:             Number of performed basis extensions.
+        :extensions:             Number of performed basis extensions (each
+                                 extension adds up to `batch_size` vectors).
         :time:                   Total runtime of the algorithm.
     """
 
     logger = getLogger('pymor.algorithms.greedy.greedy')
+    assert batch_size >= 1
     samples = list(samples)
     sample_count = len(samples)
-    extension_params = extension_params or {}
+    stages = [samples] if coarse_samples is None else [list(coarse_samples), samples]
+    if batch_size > 1:
+        extension_params = dict({'method': 'pod', 'pod_modes': batch_size}, **(extension_params or {}))
+    else:
+        extension_params = extension_params or {}
     logger.info(f'Started greedy search on {sample_count} samples')
+    if coarse_samples is not None:
+        logger.info(f'Starting with coarse training set of {len(stages[0])} samples')
     if pool is None or pool is dummy_pool:
         pool = dummy_pool
     else:
         logger.info(f'Using pool of {len(pool)} workers for parallel greedy search')
 
-    with RemoteObjectManager() as rom:
+    with RemoteObjectManager() as manager:
         # Push everything we need during the greedy search to the workers.
-        # Distribute the training set evenly among the workes.
+        if not use_estimator or batch_size > 1:
+            manager.manage(pool.push(fom))
         if not use_estimator:
-            rom.manage(pool.push(fom))
             if error_norm:
-                rom.manage(pool.push(error_norm))
-        samples = rom.manage(pool.scatter_list(samples))
+                manager.manage(pool.push(error_norm))
+        error_kwargs = ({'fom': None, 'reductor': None, 'error_norm': None} if use_estimator else
+                        {'fom': fom, 'reductor': reductor, 'error_norm': error_norm})
 
         tic = time.time()
         extensions = 0
         max_errs = []
         max_err_mus = []
+        stage = 0
+        stage_samples = distributed_samples = heap = None
 
         while True:
             with logger.block('Reducing ...'):
@@ -104,30 +138,64 @@ def greedy(fom, reductor, samples, use_estimator=True, error_norm=None,
                         'max_errs': [], 'max_err_mus': [], 'extensions': 0,
                         'time': time.time() - tic}
 
+            if stage_samples is not stages[stage]:
+                stage_samples = stages[stage]
+                if not lazy:
+                    # Distribute the training set evenly among the workes.
+                    distributed_samples = manager.manage(pool.scatter_list(stage_samples))
+
             with logger.block('Estimating errors ...'):
-                if use_estimator:
-                    errors, mus = list(zip(*pool.apply(_estimate, rom=rom, fom=None, reductor=None,
-                                                       samples=samples, error_norm=None)))
+                if lazy and heap is not None:
+                    errors, mus, evaluations = _lazy_estimate(heap, stage_samples, batch_size, extensions,
+                                                              rom=rom, **error_kwargs)
+                    logger.info(f'Updated {evaluations} of {len(stage_samples)} error estimates')
+                elif lazy:
+                    errors = pool.map(_error, stage_samples, rom=rom, **error_kwargs)
+                    heap = [(-err, i, extensions) for i, err in enumerate(errors)]
+                    heapq.heapify(heap)
+                    worst = heapq.nsmallest(batch_size, heap)
+                    errors, mus = [-e for e, _, _ in worst], [stage_samples[i] for _, i, _ in worst]
                 else:
-                    errors, mus = list(zip(*pool.apply(_estimate, rom=rom, fom=fom, reductor=reductor,
-                                                       samples=samples, error_norm=error_norm)))
-            max_err_ind = np.argmax(errors)
-            max_err, max_err_mu = errors[max_err_ind], mus[max_err_ind]
+                    results = pool.apply(_estimate, rom=rom, samples=distributed_samples, count=batch_size,
+                                         **error_kwargs)
+                    errors = [e for worker_errors, _ in results for e in worker_errors]
+                    mus = [mu for _, worker_mus in results for mu in worker_mus]
+            errors = np.array(errors)
+            worst = np.argsort(-errors, kind='stable')[:batch_size]
+            max_err, max_err_mu = errors[worst[0]], mus[worst[0]]
 
             max_errs.append(max_err)
             max_err_mus.append(max_err_mu)
             logger.info(f'Maximum error after {extensions} extensions: {max_err} (mu = {max_err_mu})')
 
+            tolerance_reached = False
             if atol is not None and max_err <= atol:
-                logger.info(f'Absolute error tolerance ({atol}) reached! Stoping extension loop.')
-                break
+                logger.info(f'Absolute error tolerance ({atol}) reached!')
+                tolerance_reached = True
+            elif rtol is not None and max_err / max_errs[0] <= rtol:
+                logger.info(f'Relative error tolerance ({rtol}) reached!')
+                tolerance_reached = True
 
-            if rtol is not None and max_err / max_errs[0] <= rtol:
-                logger.info(f'Relative error tolerance ({rtol}) reached! Stoping extension loop.')
-                break
+            if tolerance_reached:
+                if stage == len(stages) - 1:
+                    logger.info('Stoping extension loop.')
+                    break
+                logger.info('Switching to full training set.')
+                # the error on the coarse set is superseded by the error on the full set
+                max_errs.pop()
+                max_err_mus.pop()
+                stage += 1
+                heap = None
+                continue
 
-            with logger.block(f'Computing solution snapshot for mu = {max_err_mu} ...'):
-                U = fom.solve(max_err_mu)
+            if batch_size == 1:
+                with logger.block(f'Computing solution snapshot for mu = {max_err_mu} ...'):
+                    U = fom.solve(max_err_mu)
+            else:
+                with logger.block(f'Computing {len(worst)} solution snapshots ...'):
+                    U = fom.solution_space.empty()
+                    for u in pool.map(_solve, [mus[i] for i in worst], fom=fom):
+                        U.append(u)
             with logger.block('Extending basis with solution snapshot ...'):
                 try:
                     reductor.extend_basis(U, copy_U=False, **extension_params)
@@ -151,19 +219,51 @@ def greedy(fom, reductor, samples, use_estimator=True, error_norm=None,
                 'time': tictoc}
 
 
-def _estimate(rom=None, fom=None, reductor=None, samples=None, error_norm=None):
-    if not samples:
-        return -1., None
-
+def _error(mu, rom=None, fom=None, reductor=None, error_norm=None):
     if fom is None:
-        errors = [rom.estimate(rom.solve(mu), mu) for mu in samples]
+        err = rom.estimate(rom.solve(mu), mu)
     elif error_norm is not None:
-        errors = [error_norm(fom.solve(mu) - reductor.reconstruct(rom.solve(mu))) for mu in samples]
+        err = error_norm(fom.solve(mu) - reductor.reconstruct(rom.solve(mu)))
     else:
-        errors = [(fom.solve(mu) - reductor.reconstruct(rom.solve(mu))).l2_norm() for mu in samples]
+        err = (fom.solve(mu) - reductor.reconstruct(rom.solve(mu))).l2_norm()
     # most error_norms will return an array of length 1 instead of a number, so we extract the numbers
     # if necessary
-    errors = [x[0] if hasattr(x, '__len__') else x for x in errors]
-    max_err_ind = np.argmax(errors)
+    return err[0] if hasattr(err, '__len__') else err
+
+
+def _estimate(rom=None, fom=None, reductor=None, samples=None, error_norm=None, count=1):
+    if not samples:
+        return [], []
+
+    errors = np.array([_error(mu, rom=rom, fom=fom, reductor=reductor, error_norm=error_norm) for mu in samples])
+    worst = np.argsort(-errors, kind='stable')[:count]
+
+    return list(errors[worst]), [samples[i] for i in worst]
+
+
+def _lazy_estimate(heap, samples, count, extensions, **error_kwargs):
+    """Determine the `count` largest errors using the cached estimates in `heap`.
+
+    `heap` contains tuples `(-error, index, extensions)` recording the error for
+    `samples[index]` computed after the given number of extensions. As errors do
+    not increase when the basis is extended, outdated entries are upper bounds
+    for the current errors, so only samples whose bound reaches the top of the
+    heap need to be re-evaluated.
+    """
+    worst = []
+    evaluations = 0
+    while heap and len(worst) < count:
+        entry = heapq.heappop(heap)
+        _, i, stamp = entry
+        if stamp == extensions:
+            worst.append(entry)
+        else:
+            heapq.heappush(heap, (-_error(samples[i], **error_kwargs), i, extensions))
+            evaluations += 1
+    for entry in worst:
+        heapq.heappush(heap, entry)
+    return [-e for e, _, _ in worst], [samples[i] for _, i, _ in worst], evaluations
+
 
-    return errors[max_err_ind], samples[max_err_ind]
+def _solve(mu, fom=None):
+    return fom.solve(mu)
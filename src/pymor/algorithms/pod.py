@@ -11,12 +11,15 @@ from pymor.core.exceptions import AccuracyError
 from pymor.core.logger import getLogger
 from pymor.operators.interfaces import OperatorInterface
 from pymor.tools.floatcmp import float_cmp_all
+from pymor.tools.random import new_random_state
 from pymor.vectorarrays.interfaces import VectorArrayInterface
 
 
-@defaults('rtol', 'atol', 'l2_err', 'symmetrize', 'orthonormalize', 'check', 'check_tol')
+@defaults('rtol', 'atol', 'l2_err', 'symmetrize', 'orthonormalize', 'check', 'check_tol', 'method', 'block_size',
+          'oversampling', 'power_iterations')
 def pod(A, modes=None, product=None, rtol=4e-8, atol=0., l2_err=0.,
-        symmetrize=False, orthonormalize=True, check=True, check_tol=1e-10):
+        symmetrize=False, orthonormalize=True, check=True, check_tol=1e-10,
+        method='method_of_snapshots', block_size=1000, oversampling=10, power_iterations=2, random_state=None):
     """Proper orthogonal decomposition of `A`.
 
     Viewing the |VectorArray| `A` as a `A.dim` x `len(A)` matrix,
@@ -55,6 +58,27 @@ def pod(A, modes=None, product=None, rtol=4e-8, atol=0., l2_err=0.,
         If `True`, check the computed POD modes for orthonormality.
     check_tol
         Tolerance for the orthonormality check.
+    method
+        Algorithm used for computing the POD:
+
+        - `'method_of_snapshots'`: compute the eigenvalue decomposition of the
+          Gramian of `A`,
+        - `'method_of_snapshots_blocked'`: as above, but assemble the Gramian
+          from blocks of `block_size` vectors, applying `product` only to a
+          single block at a time,
+        - `'randomized'`: randomized range finder with `modes + oversampling`
+          random samples and `power_iterations` power iterations. If `modes`
+          is `None`, a range of dimension `len(A)` is sampled.
+    block_size
+        Number of vectors per block for `method='method_of_snapshots_blocked'`.
+    oversampling
+        Number of additional random samples for `method='randomized'`.
+    power_iterations
+        Number of power iterations for `method='randomized'`.
+    random_state
+        :class:`~numpy.random.RandomState` used for `method='randomized'`. If `None`,
+        a new random state with :func:`default <pymor.tools.random.new_random_state>`
+        seed is created.
 
     Returns
     -------
@@ -69,41 +93,41 @@ def pod(A, modes=None, product=None, rtol=4e-8, atol=0., l2_err=0.,
     assert modes is None or modes <= len(A)
     assert product is None or isinstance(product, OperatorInterface)
 
-    logger = getLogger('pymor.algorithms.pod.pod')
+    assert method in ('method_of_snapshots', 'method_of_snapshots_blocked', 'randomized')
 
-    with logger.block(f'Computing Gramian ({len(A)} vectors) ...'):
-        B = A.gramian(product)
+    logger = getLogger('pymor.algorithms.pod.pod')
 
-        if symmetrize:     # according to rbmatlab this is necessary due to rounding
-            B = B + B.T
-            B *= 0.5
+    if method == 'randomized':
+        POD, SVALS = _randomized_pod(A, modes, product, rtol, atol, l2_err, oversampling, power_iterations,
+                                     random_state, logger)
+        if len(POD) == 0:
+            return POD, SVALS
+        expected_modes = len(POD)
+    else:
+        with logger.block(f'Computing Gramian ({len(A)} vectors) ...'):
+            B = A.gramian(product) if method == 'method_of_snapshots' else _blocked_gramian(A, product, block_size)
 
-    with logger.block('Computing eigenvalue decomposition ...'):
-        eigvals = None if (modes is None or l2_err > 0.) else (len(B) - modes, len(B) - 1)
+            if symmetrize:     # according to rbmatlab this is necessary due to rounding
+                B = B + B.T
+                B *= 0.5
 
-        EVALS, EVECS = eigh(B, overwrite_a=True, turbo=True, eigvals=eigvals)
-        EVALS = EVALS[::-1]
-        EVECS = EVECS.T[::-1, :]  # is this a view? yes it is!
+        with logger.block('Computing eigenvalue decomposition ...'):
+            eigvals = None if (modes is None or l2_err > 0.) else (len(B) - modes, len(B) - 1)
 
-        tol = max(rtol ** 2 * EVALS[0], atol ** 2)
-        above_tol = np.where(EVALS >= tol)[0]
-        if len(above_tol) == 0:
-            return A.space.empty(), np.array([])
-        last_above_tol = above_tol[-1]
+            EVALS, EVECS = eigh(B, overwrite_a=True, turbo=True, eigvals=eigvals)
+            EVALS = EVALS[::-1]
+            EVECS = EVECS.T[::-1, :]  # is this a view? yes it is!
 
-        errs = np.concatenate((np.cumsum(EVALS[::-1])[::-1], [0.]))
-        below_err = np.where(errs <= l2_err**2)[0]
-        first_below_err = below_err[0]
+            selected_modes = _select_modes(EVALS, modes, rtol, atol, l2_err)
+            if selected_modes == 0:
+                return A.space.empty(), np.array([])
 
-        selected_modes = min(first_below_err, last_above_tol + 1)
-        if modes is not None:
-            selected_modes = min(selected_modes, modes)
+            SVALS = np.sqrt(EVALS[:selected_modes])
+            EVECS = EVECS[:selected_modes]
 
-        SVALS = np.sqrt(EVALS[:selected_modes])
-        EVECS = EVECS[:selected_modes]
-
-    with logger.block(f'Computing left-singular vectors ({len(EVECS)} vectors) ...'):
-        POD = A.lincomb(EVECS / SVALS[:, np.newaxis])
+        with logger.block(f'Computing left-singular vectors ({len(EVECS)} vectors) ...'):
+            POD = A.lincomb(EVECS / SVALS[:, np.newaxis])
+        expected_modes = len(EVECS)
 
     if orthonormalize:
         with logger.block('Re-orthonormalizing POD modes ...'):
@@ -111,10 +135,75 @@ def pod(A, modes=None, product=None, rtol=4e-8, atol=0., l2_err=0.,
 
     if check:
         logger.info('Checking orthonormality ...')
-        if not float_cmp_all(POD.inner(POD, product), np.eye(len(POD)), atol=check_tol, rtol=0.):
-            err = np.max(np.abs(POD.inner(POD, product) - np.eye(len(POD))))
+        G = POD.gramian(product)
+        if not float_cmp_all(G, np.eye(len(POD)), atol=check_tol, rtol=0.):
+            err = np.max(np.abs(G - np.eye(len(POD))))
             raise AccuracyError(f'result not orthogonal (max err={err})')
-        if len(POD) < len(EVECS):
+        if len(POD) < expected_modes:
             raise AccuracyError('additional orthonormalization removed basis vectors')
 
     return POD, SVALS
+
+
+def _select_modes(EVALS, modes, rtol, atol, l2_err, tail=0.):
+    """Number of modes to keep for the decreasingly sorted eigenvalues `EVALS` of the Gramian.
+
+    `tail` is the part of the squared Frobenius norm of `A` not captured by `EVALS`.
+    """
+    tol = max(rtol ** 2 * EVALS[0], atol ** 2)
+    above_tol = np.where(EVALS >= tol)[0]
+    if len(above_tol) == 0:
+        return 0
+    last_above_tol = above_tol[-1]
+
+    errs = np.concatenate((np.cumsum(EVALS[::-1])[::-1], [0.])) + tail
+    below_err = np.where(errs <= l2_err**2)[0]
+    first_below_err = below_err[0] if len(below_err) else len(EVALS)
+
+    selected_modes = min(first_below_err, last_above_tol + 1)
+    if modes is not None:
+        selected_modes = min(selected_modes, modes)
+    return selected_modes
+
+
+def _blocked_gramian(A, product, block_size):
+    """Gramian of `A` w.r.t. `product`, computed from its upper triangular blocks."""
+    n = len(A)
+    B = None
+    for i in range(0, n, block_size):
+        A_i = A[i:i+block_size]
+        if product is not None:
+            A_i = product.apply(A_i)
+        for j in range(i, n, block_size):
+            G = A_i.dot(A[j:j+block_size])
+            if B is None:
+                B = np.empty((n, n), dtype=G.dtype)
+            B[i:i+block_size, j:j+block_size] = G
+            if j > i:
+                B[j:j+block_size, i:i+block_size] = G.T.conj()
+    return B
+
+
+def _randomized_pod(A, modes, product, rtol, atol, l2_err, oversampling, power_iterations, random_state, logger):
+    random_state = random_state or new_random_state()
+    n = len(A)
+    k = n if modes is None else min(modes + oversampling, n)
+
+    with logger.block(f'Sampling range of A ({k} samples, {power_iterations} power iterations) ...'):
+        Q = A.lincomb(random_state.normal(size=(k, n)))
+        Q = gram_schmidt(Q, product=product, copy=False)
+        for _ in range(power_iterations):
+            Q = A.lincomb(A.inner(Q, product).T)
+            Q = gram_schmidt(Q, product=product, copy=False)
+
+    with logger.block(f'Computing SVD of projected snapshots ({len(Q)} x {n}) ...'):
+        U, S, _ = np.linalg.svd(Q.inner(A, product), full_matrices=False)
+        EVALS = S ** 2
+        tail = max(np.sum(A.norm2(product)) - np.sum(EVALS), 0.)
+        selected_modes = _select_modes(EVALS, modes, rtol, atol, l2_err, tail=tail)
+        if selected_modes == 0:
+            return A.space.empty(), np.array([])
+
+    with logger.block(f'Computing left-singular vectors ({selected_modes} vectors) ...'):
+        POD = Q.lincomb(U[:, :selected_modes].T)
+    return POD, S[:selected_modes]
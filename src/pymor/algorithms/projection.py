@@ -13,6 +13,7 @@ from pymor.operators.constructions import (LincombOperator, Concatenation, Const
 from pymor.operators.ei import EmpiricalInterpolatedOperator, ProjectedEmpiciralInterpolatedOperator
 from pymor.operators.interfaces import OperatorInterface
 from pymor.operators.numpy import NumpyMatrixOperator
+from pymor.tools.random import new_random_state
 from pymor.vectorarrays.numpy import NumpyVectorSpace
 
 
@@ -224,6 +225,160 @@ class ProjectRules(RuleTable):
         return ProjectedOperator(op, self.range_basis, self.source_basis, self.product)
 
 
+def project_incrementally(op, projected_op, range_basis, source_basis, product=None):
+    """Update the Petrov-Galerkin projection of an |Operator| after basis extension.
+
+    Given an |Operator| `op` which has already been projected onto initial segments
+    `range_basis[:M]`, `source_basis[:N]` of the given bases, i.e. ::
+
+        projected_op == project(op, range_basis[:M], source_basis[:N], product)
+
+    this method computes ::
+
+        project(op, range_basis, source_basis, product)
+
+    while only applying `op` to the newly added basis vectors whenever possible. For
+    a linear, non-parametric `op`, the previously computed projection matrix is
+    extended by the new columns `( c_i, op(b_j) )`, `j >= N`, which requires
+    one application of `op` per new source basis vector, and by the new rows
+    `( c_i, op(b_j) )`, `i >= M`, `j < N`, which are computed using one application
+    of `op.apply_adjoint` per new range basis vector.
+
+    The first basis vectors of `range_basis` and `source_basis` must not have been
+    modified since the computation of `projected_op`.
+
+    The exact algorithm is specified in :class:`ProjectIncrementallyRules`.
+
+    Parameters
+    ----------
+    op
+        The |Operator| to project.
+    projected_op
+        The result of the projection of `op` onto the initial segments of the bases.
+    range_basis
+        The extended range basis as a |VectorArray| or `None`.
+    source_basis
+        The extended source basis as a |VectorArray| or `None`.
+    product
+        An |Operator| representing the inner product.  If `None`, the
+        Euclidean inner product is chosen.
+
+    Returns
+    -------
+    The projected |Operator|.
+    """
+    assert source_basis is None or source_basis in op.source
+    assert range_basis is None or range_basis in op.range
+    assert product is None or product.source == product.range == op.range
+
+    return ProjectIncrementallyRules(projected_op, range_basis, source_basis, product).apply(op)
+
+
+class ProjectIncrementallyRules(RuleTable):
+    """|RuleTable| for the :func:`project_incrementally` algorithm."""
+
+    def __init__(self, projected_op, range_basis, source_basis, product):
+        super().__init__()
+        self.projected_op, self.range_basis, self.source_basis, self.product = \
+            projected_op, range_basis, source_basis, product
+
+    @match_generic(lambda op: op.linear and not op.parametric, 'linear and not parametric')
+    def action_apply_basis(self, op):
+        projected_op, range_basis, source_basis, product = \
+            self.projected_op, self.range_basis, self.source_basis, self.product
+        if range_basis is None and source_basis is None:
+            return op
+        if not isinstance(projected_op, NumpyMatrixOperator) or projected_op.sparse:
+            raise RuleNotMatchingError('Projected operator is not a dense NumpyMatrixOperator')
+
+        old_matrix = projected_op.matrix
+        old_range_dim = len(old_matrix) if range_basis is not None else None
+        old_source_dim = old_matrix.shape[1] if source_basis is not None else None
+        if (range_basis is not None and old_range_dim > len(range_basis)
+                or source_basis is not None and old_source_dim > len(source_basis)):
+            raise RuleNotMatchingError('Bases are smaller than projected operator')
+
+        if range_basis is None:
+            V = op.apply(source_basis[old_source_dim:])
+            matrix = np.hstack([old_matrix, V.to_numpy().T])
+        elif source_basis is None:
+            R = range_basis[old_range_dim:]
+            try:
+                V = op.apply_adjoint(product.apply(R) if product else R)
+            except NotImplementedError:
+                raise RuleNotMatchingError('apply_adjoint not implemented')
+            matrix = np.vstack([old_matrix, V.to_numpy()])
+        else:
+            R_new, S_old, S_new = range_basis[old_range_dim:], source_basis[:old_source_dim], \
+                source_basis[old_source_dim:]
+            # new columns for all range basis vectors
+            V = op.apply(S_new)
+            new_columns = product.apply2(range_basis, V) if product else range_basis.inner(V)
+            # new rows for the old source basis vectors
+            if len(R_new) > 0 and len(S_old) > 0:
+                try:
+                    W = op.apply_adjoint(product.apply(R_new) if product else R_new)
+                    new_rows = W.inner(S_old)
+                except NotImplementedError:
+                    self.logger.warning('apply_adjoint not implemented, applying operator to old source basis')
+                    V = op.apply(S_old)
+                    new_rows = product.apply2(R_new, V) if product else R_new.inner(V)
+            else:
+                new_rows = np.zeros((len(R_new), len(S_old)))
+            matrix = np.empty((len(range_basis), len(source_basis)),
+                              dtype=np.promote_types(np.promote_types(old_matrix.dtype, new_columns.dtype),
+                                                     new_rows.dtype))
+            matrix[:old_range_dim, :old_source_dim] = old_matrix
+            matrix[old_range_dim:, :old_source_dim] = new_rows
+            matrix[:, old_source_dim:] = new_columns
+
+        return projected_op.with_(matrix=matrix)
+
+    @match_class(LincombOperator)
+    def action_LincombOperator(self, op):
+        projected_op = self.projected_op
+        if not isinstance(projected_op, LincombOperator) or len(projected_op.operators) != len(op.operators):
+            raise RuleNotMatchingError('Projected operator is not a matching LincombOperator')
+        operators = tuple(type(self)(p, self.range_basis, self.source_basis, self.product).apply(o)
+                          for o, p in zip(op.operators, projected_op.operators))
+        return projected_op.with_(operators=operators)
+
+    @match_class(OperatorInterface)
+    def action_project(self, op):
+        return project(op, self.range_basis, self.source_basis, self.product)
+
+
+def _basis_digest(basis):
+    """Digest of `basis` used by :func:`_basis_extended`.
+
+    The digest consists of the norms of the basis vectors and their inner products
+    with a random linear combination of the basis vectors, which is stored along with it.
+    """
+    if len(basis) == 0:
+        return basis, 0, None, None
+    probe = basis.lincomb(new_random_state().uniform(-1, 1, len(basis)))
+    return basis, len(basis), probe, _digest_values(basis, probe)
+
+
+def _basis_extended(basis, digest):
+    """Check if `basis` has only been extended since `digest` was computed by :func:`_basis_digest`.
+
+    Returns `False` if `basis` is a different |VectorArray|, has been shortened or any of
+    the initial basis vectors has been modified.
+    """
+    old_basis, length, probe, values = digest
+    if basis is not old_basis or len(basis) < length:
+        return False
+    if length == 0:
+        return True
+    new_values = _digest_values(basis[:length], probe)
+    return np.allclose(new_values, values, rtol=1e-12, atol=1e-12 * np.max(np.abs(values)))
+
+
+def _digest_values(basis, probe):
+    return np.concatenate([basis.dot(probe).ravel(), basis.l2_norm()])
+
+
 def project_to_subbasis(op, dim_range=None, dim_source=None):
     """Project already projected |Operator| to a subbasis.
 
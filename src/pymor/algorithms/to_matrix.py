@@ -2,15 +2,18 @@
 # Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
+from functools import reduce
+
 import numpy as np
 import scipy.linalg as spla
 import scipy.sparse as sps
 import scipy.sparse.linalg as spsla
 
-from pymor.algorithms.rules import RuleTable, match_class
+from pymor.algorithms.rules import RuleTable, match_class, match_generic
 from pymor.operators.block import BlockOperatorBase
 from pymor.operators.constructions import (AdjointOperator, ComponentProjection, Concatenation, IdentityOperator,
                                            LincombOperator, VectorArrayOperator, ZeroOperator)
+from pymor.operators.interfaces import OperatorInterface
 from pymor.operators.numpy import NumpyMatrixOperator
 
 
@@ -156,3 +159,59 @@ class ToMatrixRules(RuleTable):
             return np.zeros((op.range.dim, op.source.dim))
         else:
             return getattr(sps, format + '_matrix')((op.range.dim, op.source.dim))
+
+
+def to_matrix_batch(op, mus):
+    """Convert a linear |Operator| to dense matrices for several |Parameters|.
+
+    In contrast to calling :func:`to_matrix` for each |Parameter|, the
+    matrices of non-parametric parts of `op` are only computed once and
+    the coefficients of |LincombOperators| are evaluated for all |Parameters|
+    before the matrices are combined in a single vectorized operation.
+
+    Parameters
+    ----------
+    op
+        The |Operator| to convert.
+    mus
+        |ParameterArray| or list of |Parameters| for which to convert `op`.
+
+    Returns
+    -------
+    res
+        |NumPy array| of shape `(len(mus), op.range.dim, op.source.dim)` or,
+        if `op` is not parametric, of shape `(1, op.range.dim, op.source.dim)`.
+    """
+    assert op.linear
+    mus = op.parse_parameter_array(mus)
+    return ToMatrixBatchRules(mus).apply(op)
+
+
+class ToMatrixBatchRules(RuleTable):
+
+    def __init__(self, mus):
+        super().__init__()
+        self.mus = mus
+
+    @match_generic(lambda op: not op.parametric, 'non-parametric operator')
+    def action_non_parametric(self, op):
+        return to_matrix(op, format='dense')[np.newaxis, ...]
+
+    @match_class(LincombOperator)
+    def action_LincombOperator(self, op):
+        coefficients = op.evaluate_coefficients_many(self.mus)
+        mats = [self.apply(o) for o in op.operators]
+        if all(len(m) == 1 for m in mats):
+            return np.tensordot(coefficients, np.concatenate(mats), axes=1)
+        res = coefficients[:, 0, np.newaxis, np.newaxis] * mats[0]
+        for i in range(1, len(mats)):
+            res = res + coefficients[:, i, np.newaxis, np.newaxis] * mats[i]
+        return res
+
+    @match_class(Concatenation)
+    def action_Concatenation(self, op):
+        return reduce(np.matmul, (self.apply(o) for o in op.operators))
+
+    @match_class(OperatorInterface)
+    def action_generic(self, op):
+        return np.array([to_matrix(op, format='dense', mu=mu) for mu in self.mus])
@@ -62,7 +62,7 @@ from pymor.operators.numpy import NumpyGenericOperator, NumpyMatrixOperator
 from pymor.parallel.default import new_parallel_pool
 from pymor.parallel.manager import RemoteObjectManager
 
-from pymor.parameters.base import Parameter
+from pymor.parameters.base import Parameter, ParameterArray
 from pymor.parameters.functionals import (ProjectionParameterFunctional, GenericParameterFunctional,
                                           ExpressionParameterFunctional)
 from pymor.parameters.spaces import CubicParameterSpace
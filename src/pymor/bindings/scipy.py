@@ -2,6 +2,9 @@
 # Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
+from collections import OrderedDict
+import hashlib
+import weakref
 
 import numpy as np
 from packaging.version import Version
@@ -16,6 +19,7 @@ from pymor.algorithms.to_matrix import to_matrix
 from pymor.core.config import config
 from pymor.core.defaults import defaults
 from pymor.core.exceptions import InversionError
+from pymor.core.interfaces import BasicInterface
 from pymor.core.logger import getLogger
 from pymor.operators.numpy import NumpyMatrixOperator
 
@@ -72,7 +76,8 @@ def solver_options(bicgstab_tol=1e-15,
     spsolve_permc_spec
         See :func:`scipy.sparse.linalg.spsolve`.
     spsolve_keep_factorization
-        See :func:`scipy.sparse.linalg.spsolve`.
+        If `True`, keep the LU factorization in the global
+        :class:`FactorizationCache` for reuse in later solves.
     lgmres_tol
         See :func:`scipy.sparse.linalg.lgmres`.
     lgmres_maxiter
@@ -224,49 +229,25 @@ def apply_inverse(op, V, options=None, least_squares=False, check_finite=True,
                                          format(info))
     elif options['type'] == 'scipy_spsolve':
         try:
-            # maybe remove unusable factorization:
-            if hasattr(matrix, 'factorization'):
-                fdtype = matrix.factorizationdtype
-                if not np.can_cast(V.dtype, fdtype, casting='safe'):
-                    del matrix.factorization
-
-            if Version(scipy.version.version) >= Version('0.14'):
-                if hasattr(matrix, 'factorization'):
-                    # we may use a complex factorization of a real matrix to
-                    # apply it to a real vector. In that case, we downcast
-                    # the result here, removing the imaginary part,
-                    # which should be zero.
-                    R = matrix.factorization.solve(V.T).T.astype(promoted_type, copy=False)
-                elif options['keep_factorization']:
-                    # the matrix is always converted to the promoted type.
-                    # if matrix.dtype == promoted_type, this is a no_op
-                    matrix.factorization = splu(matrix_astype_nocopy(matrix.tocsc(), promoted_type),
-                                                permc_spec=options['permc_spec'])
-                    matrix.factorizationdtype = promoted_type
-                    R = matrix.factorization.solve(V.T).T
-                else:
-                    # the matrix is always converted to the promoted type.
-                    # if matrix.dtype == promoted_type, this is a no_op
-                    R = spsolve(matrix_astype_nocopy(matrix, promoted_type), V.T, permc_spec=options['permc_spec']).T
+            if options['keep_factorization']:
+                # we may use a complex factorization of a real matrix to
+                # apply it to a real vector. In that case, we downcast
+                # the result here, removing the imaginary part,
+                # which should be zero.
+                R = factorization_cache().factorization(matrix, promoted_type, options['permc_spec']) \
+                    .solve(V.T).T.astype(promoted_type, copy=False)
+            elif Version(scipy.version.version) >= Version('0.14'):
+                # the matrix is always converted to the promoted type.
+                # if matrix.dtype == promoted_type, this is a no_op
+                R = spsolve(matrix_astype_nocopy(matrix, promoted_type), V.T, permc_spec=options['permc_spec']).T
+            elif len(V) > 1:
+                factorization = splu(matrix_astype_nocopy(matrix.tocsc(), promoted_type),
+                                     permc_spec=options['permc_spec'])
+                for i, VV in enumerate(V):
+                    R[i] = factorization.solve(VV)
             else:
-                # see if-part for documentation
-                if hasattr(matrix, 'factorization'):
-                    for i, VV in enumerate(V):
-                        R[i] = matrix.factorization.solve(VV).astype(promoted_type, copy=False)
-                elif options['keep_factorization']:
-                    matrix.factorization = splu(matrix_astype_nocopy(matrix.tocsc(), promoted_type),
-                                                permc_spec=options['permc_spec'])
-                    matrix.factorizationdtype = promoted_type
-                    for i, VV in enumerate(V):
-                        R[i] = matrix.factorization.solve(VV)
-                elif len(V) > 1:
-                    factorization = splu(matrix_astype_nocopy(matrix.tocsc(), promoted_type),
-                                         permc_spec=options['permc_spec'])
-                    for i, VV in enumerate(V):
-                        R[i] = factorization.solve(VV)
-                else:
-                    R = spsolve(matrix_astype_nocopy(matrix, promoted_type), V.T,
-                                permc_spec=options['permc_spec']).reshape((1, -1))
+                R = spsolve(matrix_astype_nocopy(matrix, promoted_type), V.T,
+                            permc_spec=options['permc_spec']).reshape((1, -1))
         except RuntimeError as e:
             raise InversionError(e)
     elif options['type'] == 'scipy_lgmres':
@@ -323,6 +304,154 @@ def matrix_astype_nocopy(matrix, dtype):
         return matrix.astype(dtype)
 
 
+class FactorizationCache(BasicInterface):
+    """LRU cache for the sparse LU factorizations computed by :func:`apply_inverse`.
+
+    Factorizations are looked up by the identity of the matrix and, if the
+    matrix is not known, by a digest of its contents. Hence, factorizations are
+    also found for equal matrices which have been recreated, e.g. for |Operators|
+    which are repeatedly unpickled on the workers of a |WorkerPool|.
+    Further, the column ordering computed for the factorization of a matrix is
+    reused for all matrices with the same sparsity pattern, such as
+    `s*E - A` for different shifts `s`.
+
+    Cache hits and misses are logged with level `DEBUG` and counted in the
+    `hits` and `misses` attributes.
+
+    Parameters
+    ----------
+    max_memory
+        Maximum number of bytes occupied by the cached factorizations and orderings.
+        The least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_memory):
+        self.max_memory = max_memory
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self._factorizations = OrderedDict()
+        self._orderings = OrderedDict()
+        self._digests = {}
+
+    def factorization(self, matrix, dtype, permc_spec):
+        """Return the LU factorization of `matrix` converted to `dtype`.
+
+        The returned object has a `solve` method, which accepts one- and
+        two-dimensional right-hand sides.
+        """
+        digest, pattern_digest = self._matrix_digests(matrix)
+        key = (digest, np.dtype(dtype).str, permc_spec)
+        entry = self._factorizations.get(key)
+        if entry is not None:
+            self._factorizations.move_to_end(key)
+            self.hits += 1
+            self.logger.debug(f'Factorization cache hit (hits: {self.hits}, misses: {self.misses}).')
+            return entry[0]
+
+        self.misses += 1
+        matrix = matrix_astype_nocopy(matrix.tocsc(), dtype)
+        pattern_key = (pattern_digest, permc_spec)
+        perm = self._orderings.get(pattern_key)
+        if perm is not None:
+            self._orderings.move_to_end(pattern_key)
+            self.logger.debug(f'Factorization cache miss, reusing column ordering '
+                              f'(hits: {self.hits}, misses: {self.misses}).')
+            factorization = _PermutedSuperLU(splu(matrix[:, perm], permc_spec='NATURAL'), perm)
+        else:
+            self.logger.debug(f'Factorization cache miss (hits: {self.hits}, misses: {self.misses}).')
+            lu = splu(matrix, permc_spec=permc_spec)
+            factorization = _PermutedSuperLU(lu, None)
+            perm = np.argsort(lu.perm_c)
+            self._orderings[pattern_key] = perm
+            self.memory += perm.nbytes
+
+        nbytes = factorization.lu.nnz * (np.dtype(dtype).itemsize + np.dtype(np.int32).itemsize)
+        self._factorizations[key] = (factorization, nbytes)
+        self.memory += nbytes
+        self._evict()
+        return factorization
+
+    def clear(self):
+        """Remove all factorizations and orderings from the cache."""
+        self._factorizations.clear()
+        self._orderings.clear()
+        self._digests.clear()
+        self.memory = 0
+
+    def _evict(self):
+        # keep the most recent factorization, even if it exceeds the memory budget
+        while self.memory > self.max_memory and len(self._factorizations) > 1:
+            _, (_, nbytes) = self._factorizations.popitem(last=False)
+            self.memory -= nbytes
+        while self.memory > self.max_memory and len(self._orderings) > 1:
+            _, perm = self._orderings.popitem(last=False)
+            self.memory -= perm.nbytes
+
+    def _matrix_digests(self, matrix):
+        entry = self._digests.get(id(matrix))
+        if entry is not None and entry[0]() is matrix:
+            return entry[1], entry[2]
+
+        if matrix.format not in ('csc', 'csr'):
+            matrix = matrix.tocsc()
+        h = hashlib.sha256()
+        h.update(f'{matrix.format}{matrix.shape}'.encode())
+        h.update(np.ascontiguousarray(matrix.indptr).view(np.uint8))
+        h.update(np.ascontiguousarray(matrix.indices).view(np.uint8))
+        pattern_digest = h.hexdigest()
+        h.update(matrix.dtype.str.encode())
+        h.update(np.ascontiguousarray(matrix.data).view(np.uint8))
+        digest = h.hexdigest()
+
+        try:
+            key = id(matrix)
+            ref = weakref.ref(matrix, lambda _: self._digests.pop(key, None))
+        except TypeError:
+            return digest, pattern_digest
+        self._digests[key] = (ref, digest, pattern_digest)
+        return digest, pattern_digest
+
+
+class _PermutedSuperLU:
+    """SuperLU factorization of `A[:, perm]`, solving systems with `A`."""
+
+    def __init__(self, lu, perm):
+        self.lu = lu
+        self.perm = perm
+
+    def solve(self, rhs):
+        if Version(scipy.version.version) >= Version('0.14') or rhs.ndim == 1:
+            Y = self.lu.solve(rhs)
+        else:
+            Y = np.stack([self.lu.solve(r) for r in rhs.T], axis=1)
+        if self.perm is None:
+            return Y
+        X = np.empty_like(Y)
+        X[self.perm] = Y
+        return X
+
+
+_factorization_cache = None
+
+
+@defaults('max_memory')
+def factorization_cache(max_memory=2**30):
+    """Return the global :class:`FactorizationCache` used by :func:`apply_inverse`.
+
+    Parameters
+    ----------
+    max_memory
+        Maximum number of bytes occupied by the cached factorizations.
+    """
+    global _factorization_cache
+    if _factorization_cache is None:
+        _factorization_cache = FactorizationCache(max_memory)
+    else:
+        _factorization_cache.max_memory = max_memory
+    return _factorization_cache
+
+
 def lyap_lrcf_solver_options():
     """Returns available Lyapunov equation solvers with default solver options for the SciPy backend.
 
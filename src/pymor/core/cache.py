@@ -23,6 +23,12 @@ the following data:
     3. the |state id| of the arguments,
     4. the |state id| of pyMOR's global |defaults|.
 
+For regions with :attr:`~CacheRegion.hashable_keys` (e.g. :class:`MemoryRegion`),
+the key is instead a tuple of the instance's `uid`, the method name, a canonical
+hashable representation of the arguments and the |state id| of the |defaults|,
+which avoids the costly computation of a |state id| for each call. Arguments
+for which no such representation is available fall back to |state id| generation.
+
 Note that instances of |ImmutableInterface| are allowed to have mutable
 private attributes. It is the implementors responsibility not to break things.
 (See this :ref:`warning <ImmutableInterfaceWarning>`.)
@@ -37,13 +43,14 @@ to select a cache region which should be used by the instance.
 (Setting :attr:`~CacheableInterface.cache_region` to `None` or `'none'` disables caching.)
 
 By default, a 'memory', a 'disk' and a 'persistent' cache region are configured. The
-paths and maximum sizes of the disk regions, as well as the maximum number of keys of
-the memory cache region can be configured via the
+paths and maximum sizes of the disk regions, as well as the maximum number of keys and
+the maximum size of the memory cache region can be configured via the
 `pymor.core.cache.default_regions.disk_path`,
 `pymor.core.cache.default_regions.disk_max_size`,
 `pymor.core.cache.default_regions.persistent_path`,
-`pymor.core.cache.default_regions.persistent_max_size` and
-`pymor.core.cache.default_regions.memory_max_keys` |defaults|.
+`pymor.core.cache.default_regions.persistent_max_size`,
+`pymor.core.cache.default_regions.memory_max_keys` and
+`pymor.core.cache.default_regions.memory_max_size` |defaults|.
 
 There two ways to disable and enable caching in pyMOR:
 
@@ -60,15 +67,20 @@ any call to :func:`enable_caching`.
 
 A cache region can be emptied using :meth:`CacheRegion.clear`. The function
 :func:`clear_caches` clears each cache region registered in `cache_regions`.
+Usage statistics of a region (e.g. `cache_regions['memory'].stats()`) can be
+obtained via :meth:`CacheRegion.stats`.
 """
 
 import atexit
 from collections import OrderedDict
 import functools
+from numbers import Number
 import getpass
 import inspect
 import os
+import sys
 import tempfile
+import time
 from types import MethodType
 import diskcache
 
@@ -95,9 +107,13 @@ class CacheRegion:
     persistent
         If `True`, cache entries are kept between multiple
         program runs.
+    hashable_keys
+        If `True`, the region accepts arbitrary hashable keys,
+        otherwise keys are |state id| strings.
     """
 
     persistent = False
+    hashable_keys = False
 
     def get(self, key):
         """Return cache entry for given key.
@@ -129,39 +145,116 @@ class CacheRegion:
         """Clear the entire cache region."""
         raise NotImplementedError
 
+    def stats(self):
+        """Return usage statistics of the cache region.
+
+        Returns
+        -------
+        A `dict` of statistics. The available statistics depend
+        on the implementation of the cache region.
+        """
+        raise NotImplementedError
+
 
 class MemoryRegion(CacheRegion):
+    """In-memory cache region with least-recently-used eviction.
+
+    When either the number of stored keys or the total (estimated) size
+    in bytes of the stored values exceeds the respective limit, the
+    least recently used entries are evicted from the region. Values
+    larger than `max_size` are not cached at all.
+
+    Parameters
+    ----------
+    max_keys
+        The maximum number of keys stored in the region.
+    max_size
+        The maximum total size in bytes of all values stored in the region.
+        If `None`, the size of the region is only limited by `max_keys`.
+    """
 
     NO_VALUE = {}
+    hashable_keys = True
 
-    def __init__(self, max_keys):
+    def __init__(self, max_keys, max_size=None):
         self.max_keys = max_keys
+        self.max_size = max_size
         self._cache = OrderedDict()
+        self._size = 0
+        self._pending = OrderedDict()
+        self._hits = self._misses = self._evictions = 0
+        self._time_saved = 0.
 
     def get(self, key):
-        value = self._cache.get(key, self.NO_VALUE)
-        if value is self.NO_VALUE:
+        entry = self._cache.get(key, self.NO_VALUE)
+        if entry is self.NO_VALUE:
+            self._misses += 1
+            # keys for which `set` is never called (e.g. since the computation of the value
+            # failed) are dropped when more than `max_keys` misses are pending
+            self._pending[key] = time.perf_counter()
+            if len(self._pending) > self.max_keys:
+                self._pending.popitem(last=False)
             return False, None
         else:
+            self._cache.move_to_end(key)
+            value, _, creation_time = entry
+            self._hits += 1
+            self._time_saved += creation_time
             from pymor.vectorarrays.interfaces import VectorArrayInterface
             if isinstance(value, VectorArrayInterface):
                 value = value.copy()
             return True, value
 
     def set(self, key, value):
+        # the time since the cache miss for `key` approximates the time needed to compute `value`
+        start = self._pending.pop(key, None)
+        creation_time = 0. if start is None else time.perf_counter() - start
         if key in self._cache:
             getLogger('pymor.core.cache.MemoryRegion').warn('Key already present in cache region, ignoring.')
             return
-        if len(self._cache) == self.max_keys:
-            self._cache.popitem(last=False)
+
+        size = _memory_size(value)
+        if self.max_size is not None and size > self.max_size:
+            getLogger('pymor.core.cache.MemoryRegion').debug(f'Value of size {size} exceeds max_size, not caching.')
+            return
+        while self._cache and (len(self._cache) >= self.max_keys
+                               or self.max_size is not None and self._size + size > self.max_size):
+            _, (_, evicted_size, _) = self._cache.popitem(last=False)
+            self._size -= evicted_size
+            self._evictions += 1
 
         import numpy as np
         if isinstance(value, np.ndarray):
             value.setflags(write=False)
-        self._cache[key] = value
+        self._cache[key] = (value, size, creation_time)
+        self._size += size
 
     def clear(self):
         self._cache = OrderedDict()
+        self._size = 0
+        self._pending = OrderedDict()
+
+    def stats(self):
+        """Return usage statistics of the cache region.
+
+        Returns
+        -------
+        A `dict` with the following items:
+
+            :hits:        Number of successful lookups.
+            :misses:      Number of failed lookups.
+            :evictions:   Number of entries evicted to make room for new entries.
+            :keys:        Number of currently stored entries.
+            :size:        Total (estimated) size in bytes of the stored values.
+            :max_keys:    Maximum number of stored entries.
+            :max_size:    Maximum total size of the stored values (`None` if unbounded).
+            :time_saved:  Accumulated time in seconds the values returned on cache hits
+                          took to be computed.
+        """
+        return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                'keys': len(self._cache), 'size': self._size,
+                'max_keys': self.max_keys, 'max_size': self.max_size,
+                'time_saved': self._time_saved}
 
 
 class DiskRegion(CacheRegion):
@@ -172,6 +265,7 @@ class DiskRegion(CacheRegion):
         self.persistent = persistent
         self._cache = diskcache.Cache(path)
         self._cache.reset('size_limit', int(max_size))
+        self._cache.stats(enable=True)
 
         if not persistent:
             self.clear()
@@ -190,14 +284,57 @@ class DiskRegion(CacheRegion):
     def clear(self):
         self._cache.clear()
 
+    def stats(self):
+        """Return usage statistics of the cache region.
+
+        Returns
+        -------
+        A `dict` with the following items:
+
+            :hits:      Number of successful lookups.
+            :misses:    Number of failed lookups.
+            :keys:      Number of currently stored entries.
+            :size:      Size in bytes of the cache directory.
+            :max_size:  Maximum size of the cache directory.
+        """
+        hits, misses = self._cache.stats()
+        return {'hits': hits, 'misses': misses, 'keys': len(self._cache), 'size': self._cache.volume(),
+                'max_size': self.max_size}
+
+
+def _memory_size(value):
+    """Estimate the memory in bytes occupied by the data of `value`."""
+    import numpy as np
+    from scipy.sparse import issparse
+    from pymor.vectorarrays.interfaces import VectorArrayInterface
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    elif isinstance(value, VectorArrayInterface):
+        if len(value) == 0 or value.dim == 0:
+            return 0
+        # accessing all the data might be expensive, so only determine the dtype of a single entry
+        return len(value) * value.dim * value[0].dofs([0]).dtype.itemsize
+    elif issparse(value):
+        value = value.tocsr() if value.format not in ('csr', 'csc') else value
+        return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+    elif isinstance(value, (list, tuple)):
+        return sum(_memory_size(v) for v in value)
+    elif isinstance(value, dict):
+        return sum(_memory_size(v) for v in value.values())
+    else:
+        return sys.getsizeof(value)
+
 
 @defaults('disk_path', 'disk_max_size', 'persistent_path', 'persistent_max_size', 'memory_max_keys',
-          sid_ignore=('disk_path', 'disk_max_size', 'persistent_path', 'persistent_max_size', 'memory_max_keys'))
+          'memory_max_size',
+          sid_ignore=('disk_path', 'disk_max_size', 'persistent_path', 'persistent_max_size', 'memory_max_keys',
+                      'memory_max_size'))
 def default_regions(disk_path=os.path.join(tempfile.gettempdir(), 'pymor.cache.' + getpass.getuser()),
                     disk_max_size=1024 ** 3,
                     persistent_path=os.path.join(tempfile.gettempdir(), 'pymor.persistent.cache.' + getpass.getuser()),
                     persistent_max_size=1024 ** 3,
-                    memory_max_keys=1000):
+                    memory_max_keys=1000,
+                    memory_max_size=None):
 
     parse_size_string = lambda size: \
         int(size[:-1]) * 1024 if size[-1] == 'K' else \
@@ -207,10 +344,12 @@ def default_regions(disk_path=os.path.join(tempfile.gettempdir(), 'pymor.cache.'
 
     if isinstance(disk_max_size, str):
         disk_max_size = parse_size_string(disk_max_size)
+    if isinstance(memory_max_size, str):
+        memory_max_size = parse_size_string(memory_max_size)
 
     cache_regions['disk'] = DiskRegion(path=disk_path, max_size=disk_max_size, persistent=False)
     cache_regions['persistent'] = DiskRegion(path=persistent_path, max_size=persistent_max_size, persistent=True)
-    cache_regions['memory'] = MemoryRegion(memory_max_keys)
+    cache_regions['memory'] = MemoryRegion(memory_max_keys, memory_max_size)
 
 
 cache_regions = {}
@@ -304,11 +443,7 @@ class CacheableInterface(ImmutableInterface):
         if _caching_disabled or self.cache_region is None:
             return method(*args, **kwargs)
 
-        params = inspect.signature(method).parameters
-        if any(v.kind == v.VAR_POSITIONAL for v in params.values()):
-            raise NotImplementedError
-        argnames = list(params.keys())[1:]  # first argument is self
-        defaults = {k: v.default for k, v in params.items() if v.default is not v.empty}
+        argnames, defaults = _method_arguments(method.__func__)
         return self._cached_method_call(method, False, argnames, defaults, args, kwargs)
 
     def _cached_method_call(self, method, pass_self, argnames, defaults, args, kwargs):
@@ -335,7 +470,14 @@ class CacheableInterface(ImmutableInterface):
             if defaults:
                 kwargs = dict(defaults, **kwargs)
 
-            key = generate_sid((method.__name__, self_id, kwargs, defaults_sid()))
+            key = None
+            if region.hashable_keys:
+                try:
+                    key = (method.__name__, self_id, _hashable_key(kwargs), defaults_sid())
+                except _UnhashableError:
+                    pass
+            if key is None:
+                key = generate_sid((method.__name__, self_id, kwargs, defaults_sid()))
             found, value = region.get(key)
             if found:
                 return value
@@ -349,11 +491,7 @@ class CacheableInterface(ImmutableInterface):
 def cached(function):
     """Decorator to make a method of `CacheableInterface` actually cached."""
 
-    params = inspect.signature(function).parameters
-    if any(v.kind == v.VAR_POSITIONAL for v in params.values()):
-        raise NotImplementedError
-    argnames = list(params.keys())[1:]  # first argument is self
-    defaults = {k: v.default for k, v in params.items() if v.default is not v.empty}
+    argnames, defaults = _method_arguments(function)
 
     @functools.wraps(function)
     def wrapper(self, *args, **kwargs):
@@ -362,3 +500,63 @@ def cached(function):
         return self._cached_method_call(function, True, argnames, defaults, args, kwargs)
 
     return wrapper
+
+
+def _method_arguments(function):
+    """Return argument names (without `self`) and default values of the method `function`.
+
+    The result is stored as `_method_arguments` attribute of `function` and reused as long
+    as the signature of `function` is unchanged (it may be updated by the
+    :func:`~pymor.core.defaults.defaults` decorator).
+    """
+    signature = getattr(inspect.unwrap(function), '__signature__', None)
+    entry = getattr(function, '_method_arguments', None)
+    if entry is not None and entry[0] is signature:
+        return entry[1]
+
+    params = inspect.signature(function).parameters
+    if any(v.kind == v.VAR_POSITIONAL for v in params.values()):
+        raise NotImplementedError
+    argnames = list(params.keys())[1:]  # first argument is self
+    defaults = {k: v.default for k, v in params.items() if v.default is not v.empty}
+    function._method_arguments = (signature, (argnames, defaults))
+    return argnames, defaults
+
+
+class _UnhashableError(Exception):
+    pass
+
+
+_ATOMIC_KEY_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _hashable_key(obj):
+    """Canonical hashable representation of `obj` for :class:`MemoryRegion` keys.
+
+    Two objects have the same representation if they have the same type and
+    equal values. |NumPy arrays| are represented by their dtype, shape and data,
+    |immutable| objects by their `uid`. Raises `_UnhashableError` for other objects.
+    """
+    t = type(obj)
+    if t in _ATOMIC_KEY_TYPES:
+        return obj if t is str else (t, obj)
+    if t is tuple or t is list:
+        return (t,) + tuple(_hashable_key(v) for v in obj)
+    if isinstance(obj, dict):
+        try:
+            items = sorted(obj.items(), key=_first)
+        except TypeError:
+            raise _UnhashableError
+        return (t,) + tuple((_hashable_key(k), _hashable_key(v)) for k, v in items)
+    import numpy as np
+    if t is np.ndarray and obj.dtype != object:
+        return (t, obj.dtype.str, obj.shape, obj.tobytes())
+    if isinstance(obj, (Number, np.generic)) and not isinstance(obj, np.ndarray):
+        return (t, obj)
+    if isinstance(obj, ImmutableInterface):
+        return (t, obj.uid)
+    raise _UnhashableError
+
+
+def _first(item):
+    return item[0]
@@ -60,6 +60,7 @@ _PACKAGES = {
     'DOCOPT': lambda: import_module('docopt').__version__,
     'FENICS': _get_fenics_version,
     'GL': lambda: import_module('OpenGL.GL') and import_module('OpenGL').__version__,
+    'H5PY': lambda: import_module('h5py').__version__,
     'IPYTHON': _get_ipython_version,
     'MATPLOTLIB': _get_matplotib_version,
     'IPYWIDGETS': lambda: import_module('ipywidgets').__version__,
@@ -74,6 +75,7 @@ _PACKAGES = {
     'QTOPENGL': lambda: bool(import_module('Qt.QtOpenGL')),
     'SCIPY': lambda: import_module('scipy').__version__,
     'SCIPY_LSMR': lambda: hasattr(import_module('scipy.sparse.linalg'), 'lsmr'),
+    'SHARED_MEMORY': lambda: bool(import_module('multiprocessing.shared_memory')),
     'SLYCOT': lambda: _get_slycot_version(),
     'SPHINX': lambda: import_module('sphinx').__version__,
 }
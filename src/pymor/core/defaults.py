@@ -131,6 +131,7 @@ Defaults
 
         func.argnames = argnames
         func.defaultsdict = defaultsdict
+        func.defaults_namespace = {}
         self._update_function_signature(func)
 
     def _update_function_signature(self, func):
@@ -138,6 +139,7 @@ Defaults
         params = OrderedDict(sig.parameters)
         for n, v in func.defaultsdict.items():
             params[n] = params[n].replace(default=v)
+            func.defaults_namespace['_default_' + n] = v
         func.__signature__ = sig.replace(parameters=params.values())
 
     def update(self, defaults, type='user'):
@@ -248,22 +250,60 @@ def defaults(*args, sid_ignore=()):
         global _default_container
         _default_container._add_defaults_for_function(func, args=args, sid_ignore=sid_ignore)
 
-        @functools.wraps(func, updated=())  # ensure that __signature__ is not copied
-        def wrapper(*wrapper_args, **wrapper_kwargs):
-            for k, v in zip(func.argnames, wrapper_args):
-                if k in wrapper_kwargs:
-                    raise TypeError(f"{func.__name__} got multiple values for argument '{k}'")
-                wrapper_kwargs[k] = v
-            wrapper_kwargs = {k: v if v is not None else func.defaultsdict.get(k, None)
-                              for k, v in wrapper_kwargs.items()}
-            wrapper_kwargs = dict(func.defaultsdict, **wrapper_kwargs)
-            return func(**wrapper_kwargs)
-
+        wrapper = _generate_wrapper(func)
+        functools.update_wrapper(wrapper, func, updated=())  # ensure that __signature__ is not copied
         return wrapper
 
     return the_decorator
 
 
+def _generate_wrapper(func):
+    """Generate the code of a wrapper function for a function decorated with :func:`defaults`.
+
+    The wrapper has the same parameters as `func`, but with `None` as default for
+    all arguments in `func.defaultsdict`. These arguments are replaced by their
+    current default value when `None` is passed. The current values are looked up
+    in `func.defaults_namespace`, which serves as the globals of the wrapper and is
+    updated by :class:`DefaultContainer` whenever the defaults change. Thus, no
+    dictionaries have to be built on each call.
+    """
+    namespace = func.defaults_namespace
+    namespace['_defaults_func'] = func
+    params, call_args, body = [], [], []
+    kw_only = False
+    for p in inspect.signature(func).parameters.values():
+        name = p.name
+        assert not name.startswith('_default')
+        if p.kind == p.POSITIONAL_ONLY:
+            raise NotImplementedError
+        elif p.kind == p.VAR_POSITIONAL:
+            params.append('*' + name)
+            call_args.append('*' + name)
+            kw_only = True
+        elif p.kind == p.VAR_KEYWORD:
+            params.append('**' + name)
+            call_args.append('**' + name)
+        else:
+            if p.kind == p.KEYWORD_ONLY and not kw_only:
+                params.append('*')
+                kw_only = True
+            if name in func.defaultsdict:
+                params.append(name + '=None')
+                body.append(f'    if {name} is None:\n        {name} = _default_{name}\n')
+            elif p.default is not p.empty:
+                namespace['_default_value_' + name] = p.default
+                params.append(f'{name}=_default_value_{name}')
+            else:
+                params.append(name)
+            call_args.append(f'{name}={name}' if p.kind == p.KEYWORD_ONLY else name)
+
+    source = (f'def {func.__name__}({", ".join(params)}):\n'
+              + ''.join(body)
+              + f'    return _defaults_func({", ".join(call_args)})\n')
+    exec(compile(source, f'<defaults wrapper of {func.__module__}.{func.__qualname__}>', 'exec'), namespace)
+    return namespace[func.__name__]
+
+
 def _import_all(package_name='pymor'):
 
     package = importlib.import_module(package_name)
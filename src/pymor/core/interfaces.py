@@ -75,6 +75,7 @@ import os
 import time
 from types import FunctionType, BuiltinFunctionType
 import uuid
+import weakref
 
 import numpy as np
 
@@ -389,8 +390,8 @@ class ImmutableInterface(BasicInterface, metaclass=ImmutableMeta):
         else:
             return self._generate_sid(debug, ())
 
-    def _generate_sid(self, debug, seen_immutables):
-        sid_generator = _SIDGenerator()
+    def _generate_sid(self, debug, seen_immutables, digests=None):
+        sid_generator = _SIDGenerator(digests)
         sid, has_cycles = sid_generator.generate(self, debug, seen_immutables)
         self.__dict__['sid'] = sid
         self.__dict__['_sid_contains_cycles'] = has_cycles
@@ -472,8 +473,9 @@ STRING_TYPES = (str, bytes)
 
 class _SIDGenerator:
 
-    def __init__(self):
+    def __init__(self, digests=None):
         self.memo = {}
+        self.digests = {} if digests is None else digests
         self.logger = logger.getLogger('pymor.core.interfaces')
 
     def generate(self, obj, debug, seen_immutables):
@@ -482,6 +484,8 @@ class _SIDGenerator:
         self.has_cycles = False
         self.seen_immutables = seen_immutables + (id(obj),)
         self.debug = debug
+        self.hashed_bytes = 0
+        self.hashing_time = 0.
         state = self.deterministic_state(obj, first_obj=True)
 
         if debug:
@@ -501,12 +505,77 @@ class _SIDGenerator:
             print()
 
         name = getattr(obj, 'name', None)
+        msg = f'SID generation took {time.time()-start} seconds'
+        if self.hashed_bytes:
+            msg += f' ({self.hashed_bytes} array bytes hashed in {self.hashing_time} seconds)'
         if name:
-            self.logger.debug(f'{name}: SID generation took {time.time()-start} seconds')
+            self.logger.debug(f'{name}: {msg}')
         else:
-            self.logger.debug(f'SID generation took {time.time()-start} seconds')
+            self.logger.debug(msg)
         return sid, self.has_cycles
 
+    def array_digest(self, obj):
+        """Content digest of a non-object |NumPy array|.
+
+        The array data is fed into the hash through the buffer protocol.
+        Digests of read-only arrays are cached for the lifetime of the array.
+        """
+        entry = self.digests.get(id(obj))
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+        cacheable = _is_frozen_array(obj)
+        if cacheable:
+            entry = _digest_cache.get(id(obj))
+            if entry is not None and entry[0]() is obj:
+                self.digests[id(obj)] = (obj, entry[1])
+                return entry[1]
+
+        start = time.time()
+        h = hashlib.sha256()
+        h.update(f'{obj.dtype.str}{obj.shape}'.encode())
+        data = np.ascontiguousarray(obj).reshape(-1)
+        h.update(data.view(np.uint8))
+        digest = h.hexdigest()
+        self.hashing_time += time.time() - start
+        self.hashed_bytes += data.nbytes
+
+        self.digests[id(obj)] = (obj, digest)
+        if cacheable:
+            _cache_digest(obj, digest)
+        return digest
+
+    def sparse_digest(self, obj):
+        """Content digest of a |SciPy| sparse matrix in compressed, COO or DIA format.
+
+        Returns `None` if the matrix format is not handled. The digest is cached
+        as long as all component arrays of the matrix are read-only.
+        """
+        fmt = obj.format
+        if fmt in ('csr', 'csc', 'bsr'):
+            arrays = (obj.data, obj.indices, obj.indptr)
+        elif fmt == 'coo':
+            arrays = (obj.data, obj.row, obj.col)
+        elif fmt == 'dia':
+            arrays = (obj.data, obj.offsets)
+        else:
+            return None
+        if not all(type(a) is np.ndarray and a.dtype != object for a in arrays):
+            return None
+
+        entry = _digest_cache.get(id(obj))
+        if (entry is not None and entry[0]() is obj
+                and all(a is b for a, b in zip(arrays, entry[2])) and all(_is_frozen_array(a) for a in arrays)):
+            return entry[1]
+
+        h = hashlib.sha256()
+        h.update(f'{fmt}{obj.shape}'.encode())
+        for a in arrays:
+            h.update(self.array_digest(a).encode())
+        digest = h.hexdigest()
+        if all(_is_frozen_array(a) for a in arrays):
+            _cache_digest(obj, digest, arrays)
+        return digest
+
     def deterministic_state(self, obj, first_obj=False):
         v = self.memo.get(id(obj))
         if v:
@@ -521,8 +590,13 @@ class _SIDGenerator:
         if t in STRING_TYPES:
             return obj
 
-        if t is np.ndarray and t.dtype != object:
-            return obj
+        if t is np.ndarray and obj.dtype != object:
+            return (t, self.array_digest(obj))
+
+        if t.__module__.startswith('scipy.sparse') and hasattr(obj, 'format'):
+            digest = self.sparse_digest(obj)
+            if digest is not None:
+                return (t, digest)
 
         if t is tuple:
             return (tuple,) + tuple(self.deterministic_state(x) for x in obj)
@@ -545,7 +619,7 @@ class _SIDGenerator:
                 if id(obj) in self.seen_immutables:
                     raise _SIDGenerationRecursionError
                 try:
-                    obj._generate_sid(self.debug, self.seen_immutables)
+                    obj._generate_sid(self.debug, self.seen_immutables, self.digests)
                     return (t, obj.sid)
                 except _SIDGenerationRecursionError:
                     self.has_cycles = True
@@ -605,6 +679,24 @@ class _SIDGenerator:
         return state if first_obj else (t,) + state
 
 
+# content digests of read-only arrays and sparse matrices, keyed by id(obj)
+_digest_cache = {}
+
+
+def _cache_digest(obj, digest, *extra):
+    key = id(obj)
+    _digest_cache[key] = (weakref.ref(obj, lambda _: _digest_cache.pop(key, None)), digest) + extra
+
+
+def _is_frozen_array(a):
+    """`True` if neither `a` nor any array it is a view of can be written to."""
+    while isinstance(a, np.ndarray):
+        if a.flags.writeable:
+            return False
+        a = a.base
+    return a is None or isinstance(a, bytes)
+
+
 class _MemoKey:
     def __init__(self, key, obj):
         self.key = key
@@ -0,0 +1,207 @@
+# This file is part of the pyMOR project (http://www.pymor.org).
+# Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
+
+"""Storage of topology and geometry data computed by grids.
+
+The default implementations of the grid interfaces compute quantities like
+superentity relations, jacobians, integration elements or quadrature points
+on first access. These are stored in a :class:`GridDataStore` owned by the
+grid (see :func:`grid_data`) instead of a |CacheRegion|: they are never
+evicted, do not count towards the limits of the `'memory'` cache region and
+are freed together with the grid.
+
+The data is not pickled along with the grid, unless pickling happens inside
+a :func:`shared_grid_data` context, which is used by
+:class:`~pymor.parallel.process.ProcessPool` when pushing objects to its
+workers. In this case, the stored arrays are copied once into shared memory
+blocks, and the workers operate on read-only views of these blocks instead
+of recomputing or unpickling their own copies.
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+import functools
+import inspect
+import weakref
+
+import numpy as np
+
+from pymor.core.config import config
+from pymor.core.defaults import defaults
+
+if config.HAVE_SHARED_MEMORY:
+    from multiprocessing.shared_memory import SharedMemory
+
+
+_sharing_min_bytes = None
+
+
+class GridDataStore:
+    """Dict-like store for data computed by a grid.
+
+    Parameters
+    ----------
+    data
+        Initial contents of the store.
+    attached_memory
+        List of attached shared memory blocks `data` refers to.
+    """
+
+    def __init__(self, data=None, attached_memory=None):
+        self._data = {} if data is None else data
+        self._attached_memory = attached_memory
+        self._shared_memory = []
+        self._exported = {}
+        self._finalizer = None
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        self._data[key] = value
+
+    def __len__(self):
+        return len(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+    def clear(self):
+        self._data.clear()
+        self._exported.clear()
+
+    @property
+    def nbytes(self):
+        """Total size in bytes of the stored arrays."""
+        def size(value):
+            if isinstance(value, np.ndarray):
+                return value.nbytes
+            elif isinstance(value, tuple):
+                return sum(size(v) for v in value)
+            else:
+                return 0
+        return sum(size(v) for v in self._data.values())
+
+    def __reduce__(self):
+        if _sharing_min_bytes is None:
+            return (GridDataStore, ())
+        if self._finalizer is None:
+            # release the shared memory blocks together with the store
+            self._finalizer = weakref.finalize(self, _release_shared_memory, self._shared_memory)
+        for key, value in self._data.items():
+            if key not in self._exported:
+                self._exported[key] = _export(value, self._shared_memory, _sharing_min_bytes)
+        return (_attach_grid_data, (self._exported,))
+
+
+def grid_data(function):
+    """Decorator storing the return value of a grid method in the grid's :class:`GridDataStore`.
+
+    The store is created on first use and kept in the `_grid_data` attribute
+    of the grid. The arguments of the method have to be hashable.
+    """
+
+    params = list(inspect.signature(function).parameters.values())[1:]  # first argument is self
+    names = tuple(p.name for p in params)
+    defaults = tuple(p.default for p in params)
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if kwargs or len(args) < len(names):
+            args += tuple(kwargs.pop(n) if n in kwargs else d
+                          for n, d in zip(names[len(args):], defaults[len(args):]))
+            if kwargs or any(a is inspect.Parameter.empty for a in args):
+                raise TypeError(f'invalid arguments for {function.__name__}')
+        key = (function.__name__,) + args
+        try:
+            store = self._grid_data
+        except AttributeError:
+            store = self._grid_data = GridDataStore()
+        try:
+            return store[key]
+        except KeyError:
+            value = store[key] = function(self, *args)
+            return value
+
+    return wrapper
+
+
+@contextmanager
+@defaults('min_bytes')
+def shared_grid_data(min_bytes=2**16):
+    """Context manager to pickle :class:`GridDataStores <GridDataStore>` using shared memory.
+
+    Inside the context, pickling a :class:`GridDataStore` copies its arrays of
+    at least `min_bytes` bytes into shared memory blocks (only once per array),
+    which are attached as read-only views when unpickling. The blocks are released
+    when the store is garbage collected. Smaller arrays are pickled by value.
+    Without shared memory support (Python < 3.8), stores are pickled empty as usual.
+    """
+    global _sharing_min_bytes
+    if not config.HAVE_SHARED_MEMORY:
+        yield
+        return
+    old_min_bytes, _sharing_min_bytes = _sharing_min_bytes, min_bytes
+    try:
+        yield
+    finally:
+        _sharing_min_bytes = old_min_bytes
+
+
+def grid_data_state(grid):
+    """State to be returned by `__reduce__` of grids, so that their data is shared.
+
+    Returns `None` outside of a :func:`shared_grid_data` context.
+    """
+    if _sharing_min_bytes is None or '_grid_data' not in grid.__dict__:
+        return None
+    return {'_grid_data': grid._grid_data}
+
+
+_SharedArray = namedtuple('_SharedArray', 'name shape dtype')
+
+
+def _export(value, shared_memory, min_bytes):
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject and value.nbytes >= max(min_bytes, 1):
+        shm = SharedMemory(create=True, size=value.nbytes)
+        np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)[...] = value
+        shared_memory.append(shm)
+        return _SharedArray(shm.name, value.shape, value.dtype.str)
+    elif type(value) is tuple:
+        return tuple(_export(v, shared_memory, min_bytes) for v in value)
+    else:
+        return value
+
+
+def _attach(value, shared_memory):
+    if isinstance(value, _SharedArray):
+        shm = SharedMemory(name=value.name)
+        shared_memory.append(shm)
+        array = np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)
+        array.setflags(write=False)
+        return array
+    elif type(value) is tuple:
+        return tuple(_attach(v, shared_memory) for v in value)
+    else:
+        return value
+
+
+def _attach_grid_data(exported):
+    attached_memory = []
+    data = {k: _attach(v, attached_memory) for k, v in exported.items()}
+    return GridDataStore(data, attached_memory)
+
+
+def _release_shared_memory(shared_memory):
+    for shm in shared_memory:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
@@ -5,14 +5,46 @@
 import numpy as np
 
 from pymor.core.cache import cached
+from pymor.grids.datastore import grid_data
 from pymor.tools.inverse import inv_transposed_two_by_two
 from pymor.tools.relations import inverse_relation
 
 
+def _unique_entries_per_row(A, chunk_size=2**20):
+    """Remove duplicate and negative entries from each row of `A`.
+
+    The remaining entries of each row are kept in the order of their first
+    occurrence and moved to the front of the row. The result is padded with
+    `-1` to the maximum number of remaining entries per row. To limit the
+    memory usage, `A` is processed in chunks of about `chunk_size` entries.
+    """
+    R = np.full(A.shape, -1, dtype=A.dtype)
+    if A.size == 0:
+        return R[:, :0]
+    max_count = 0
+    rows_per_chunk = max(chunk_size // A.shape[1], 1)
+    for start in range(0, A.shape[0], rows_per_chunk):
+        B = A[start:start + rows_per_chunk]
+        rows = np.arange(B.shape[0])[:, np.newaxis]
+        order = np.argsort(B, axis=1, kind='mergesort')  # stable, so first occurrences come first
+        S = B[rows, order]
+        keep_sorted = np.empty(S.shape, dtype=bool)
+        keep_sorted[:, 0] = True
+        np.not_equal(S[:, 1:], S[:, :-1], out=keep_sorted[:, 1:])
+        keep_sorted &= S >= 0
+        keep = np.empty_like(keep_sorted)
+        keep[rows, order] = keep_sorted
+
+        positions = np.cumsum(keep, axis=1) - 1
+        R[start + np.nonzero(keep)[0], positions[keep]] = B[keep]
+        max_count = max(max_count, positions[:, -1].max() + 1)
+    return R[:, :max_count]
+
+
 class ConformalTopologicalGridDefaultImplementations:
     """Provides default informations for |ConformalTopologicalGrids|."""
 
-    @cached
+    @grid_data
     def _subentities(self, codim, subentity_codim):
         assert 0 <= codim < self.dim, 'Invalid codimension'
         if subentity_codim > codim + 1:
@@ -20,35 +52,29 @@ class ConformalTopologicalGridDefaultImplementations:
             SESE = self.subentities(subentity_codim - 1, subentity_codim)
 
             # we assume that there is only one geometry type ...
-            num_subsubentities = np.unique(SESE[SE[0]]).size
-
-            SSE = np.empty((SE.shape[0], num_subsubentities), dtype=np.int32)
-            SSE.fill(-1)
-
-            for ei in range(SE.shape[0]):
-                X = SESE[SE[ei]].ravel()
-                SSE[ei] = X[np.sort(np.unique(X, return_index=True)[1])]
+            SSE = _unique_entries_per_row(SESE[SE].reshape((SE.shape[0], -1)))
+            assert np.all(SSE >= 0)
 
             return SSE
         else:
             raise NotImplementedError
 
-    @cached
+    @grid_data
     def _superentities_with_indices(self, codim, superentity_codim):
         assert 0 <= codim <= self.dim, f'Invalid codimension (was {codim})'
         assert 0 <= superentity_codim <= codim, f'Invalid codimension (was {superentity_codim})'
         SE = self.subentities(superentity_codim, codim)
         return inverse_relation(SE, size_rhs=self.size(codim), with_indices=True)
 
-    @cached
+    @grid_data
     def _superentities(self, codim, superentity_codim):
         return self._superentities_with_indices(codim, superentity_codim)[0]
 
-    @cached
+    @grid_data
     def _superentity_indices(self, codim, superentity_codim):
         return self._superentities_with_indices(codim, superentity_codim)[1]
 
-    @cached
+    @grid_data
     def _neighbours(self, codim, neighbour_codim, intersection_codim):
         assert 0 <= codim <= self.dim, 'Invalid codimension'
         assert 0 <= neighbour_codim <= self.dim, 'Invalid codimension'
@@ -70,29 +96,13 @@ class ConformalTopologicalGridDefaultImplementations:
             EI = self.subentities(codim, intersection_codim)
             ISE = self.superentities(intersection_codim, neighbour_codim)
 
-            NB = np.empty((EI.shape[0], EI.shape[1] * ISE.shape[1]), dtype=np.int32)
-            NB.fill(-1)
-            NB_COUNTS = np.zeros(EI.shape[0], dtype=np.int32)
-
+            C = ISE[EI].reshape((EI.shape[0], -1))
+            C[np.repeat(EI < 0, ISE.shape[1], axis=1)] = -1
             if codim == neighbour_codim:
-                for ii, i in np.ndenumerate(EI):
-                    if i >= 0:
-                        for _, n in np.ndenumerate(ISE[i]):
-                            if n != ii[0] and n not in NB[ii[0]]:
-                                NB[ii[0], NB_COUNTS[ii[0]]] = n
-                                NB_COUNTS[ii[0]] += 1
-            else:
-                for ii, i in np.ndenumerate(EI):
-                    if i >= 0:
-                        for _, n in np.ndenumerate(ISE[i]):
-                            if n not in NB[ii[0]]:
-                                NB[ii[0], NB_COUNTS[ii[0]]] = n
-                                NB_COUNTS[ii[0]] += 1
-
-            NB = NB[:NB.shape[0], :NB_COUNTS.max()]
-            return NB
+                C[C == np.arange(EI.shape[0], dtype=np.int32)[:, np.newaxis]] = -1
+            return _unique_entries_per_row(C)
 
-    @cached
+    @grid_data
     def _boundaries(self, codim):
         assert 0 <= codim <= self.dim, 'Invalid codimension'
         if codim == 1:
@@ -118,7 +128,7 @@ class ConformalTopologicalGridDefaultImplementations:
             else:
                 return np.array([], dtype=np.int32)
 
-    @cached
+    @grid_data
     def _boundary_mask(self, codim):
         M = np.zeros(self.size(codim), dtype='bool')
         B = self.boundaries(codim)
@@ -161,7 +171,7 @@ class ReferenceElementDefaultImplementations:
 class AffineGridDefaultImplementations:
     """Provides default implementations for |AffineGrids|."""
 
-    @cached
+    @grid_data
     def _subentities(self, codim, subentity_codim):
         assert 0 <= codim <= self.dim, 'Invalid codimension'
         assert 0 < codim, 'Not implemented'
@@ -170,13 +180,9 @@ class AffineGridDefaultImplementations:
         SE = self.subentities(codim - 1, subentity_codim)[P]
         RSE = self.reference_element(codim - 1).subentities(1, subentity_codim - (codim - 1))[I]
 
-        SSE = np.empty_like(RSE)
-        for i in range(RSE.shape[0]):
-            SSE[i, :] = SE[i, RSE[i]]
+        return SE[np.arange(SE.shape[0])[:, np.newaxis], RSE]
 
-        return SSE
-
-    @cached
+    @grid_data
     def _embeddings(self, codim):
         assert codim > 0, NotImplemented
         E = self.superentities(codim, codim - 1)[:, 0]
@@ -193,7 +199,7 @@ class AffineGridDefaultImplementations:
             B[INDS] = np.dot(A0[INDS], B1[i]) + B0[INDS]
         return A, B
 
-    @cached
+    @grid_data
     def _jacobian_inverse_transposed(self, codim):
         assert 0 <= codim < self.dim,\
             f'Invalid Codimension (must be between 0 and {self.dim} but was {codim})'
@@ -205,7 +211,7 @@ class AffineGridDefaultImplementations:
             JIT = np.array([pinv(j) for j in J]).swapaxes(1, 2)
         return JIT
 
-    @cached
+    @grid_data
     def _integration_elements(self, codim):
         assert 0 <= codim <= self.dim,\
             f'Invalid Codimension (must be between 0 and {self.dim} but was {codim})'
@@ -227,7 +233,7 @@ class AffineGridDefaultImplementations:
 
         return np.sqrt(D)
 
-    @cached
+    @grid_data
     def _volumes(self, codim):
         assert 0 <= codim <= self.dim,\
             f'Invalid Codimension (must be between 0 and {self.dim} but was {codim})'
@@ -235,17 +241,17 @@ class AffineGridDefaultImplementations:
             return np.ones(self.size(self.dim))
         return self.reference_element(codim).volume * self.integration_elements(codim)
 
-    @cached
+    @grid_data
     def _volumes_inverse(self, codim):
         return np.reciprocal(self.volumes(codim))
 
-    @cached
+    @grid_data
     def _unit_outer_normals(self):
         JIT = self.jacobian_inverse_transposed(0)
         N = np.dot(JIT, self.reference_element(0).unit_outer_normals().T).swapaxes(1, 2)
         return N / np.apply_along_axis(np.linalg.norm, 2, N)[:, :, np.newaxis]
 
-    @cached
+    @grid_data
     def _centers(self, codim):
         assert 0 <= codim <= self.dim,\
             f'Invalid Codimension (must be between 0 and {self.dim} but was {codim})'
@@ -253,19 +259,19 @@ class AffineGridDefaultImplementations:
         C = self.reference_element(codim).center()
         return np.dot(A, C) + B
 
-    @cached
+    @grid_data
     def _diameters(self, codim):
         assert 0 <= codim <= self.dim,\
             f'Invalid Codimension (must be between 0 and {self.dim} but was {codim})'
         return np.reshape(self.reference_element(codim).mapped_diameter(self.embeddings(codim)[0]), (-1,))
 
-    @cached
+    @grid_data
     def _quadrature_points(self, codim, order, npoints, quadrature_type):
         P, _ = self.reference_element(codim).quadrature(order, npoints, quadrature_type)
         A, B = self.embeddings(codim)
         return np.einsum('eij,kj->eki', A, P) + B[:, np.newaxis, :]
 
-    @cached
+    @grid_data
     def _bounding_box(self):
         bbox = np.empty((2, self.dim))
         centers = self.centers(self.dim)
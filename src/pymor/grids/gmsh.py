@@ -3,6 +3,12 @@
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
 from collections import defaultdict
+import hashlib
+import os
+import struct
+import tempfile
+import warnings
+import zipfile
 
 import numpy as np
 import time
@@ -13,13 +19,23 @@ from pymor.grids.interfaces import BoundaryInfoInterface
 from pymor.grids.unstructured import UnstructuredTriangleGrid
 
 
-def load_gmsh(gmsh_file):
+def load_gmsh(gmsh_file, cache_file=None):
     """Parse a Gmsh file and create a corresponding :class:`GmshGrid` and :class:`GmshBoundaryInfo`.
 
+    ASCII and binary MSH-files of version 2.2 and 4.1 are supported.
+
     Parameters
     ----------
     gmsh_file
-        File handle of the Gmsh MSH-file.
+        Path or file handle of the Gmsh MSH-file.
+    cache_file
+        If not `None`, path of an `.npz`-file in which the grid, its derived
+        topology arrays and the boundary masks are stored together with the
+        SHA-256 hash of the contents of `gmsh_file`. If the file exists and
+        the stored hash matches, the grid is loaded from this file instead of
+        parsing `gmsh_file`. The arrays are memory-mapped, so loading only
+        takes the time needed for reading and hashing `gmsh_file`.
+        Otherwise, the file is (re-)written after parsing `gmsh_file`.
 
     Returns
     -------
@@ -30,9 +46,20 @@ def load_gmsh(gmsh_file):
     """
     logger = getLogger('pymor.grids.gmsh.load_gmsh')
 
+    data = _read_gmsh_file(gmsh_file)
+    source_hash = hashlib.sha256(data).hexdigest()
+
+    if cache_file is not None and _cache_is_valid(cache_file, source_hash):
+        logger.info(f'Loading grid from {cache_file} ...')
+        tic = time.time()
+        grid, bi = _load_cache(cache_file)
+        toc = time.time()
+        logger.info(f'Loading took {toc - tic} s')
+        return grid, bi
+
     logger.info('Parsing gmsh file ...')
     tic = time.time()
-    sections = _parse_gmsh_file(gmsh_file)
+    sections = _parse_gmsh_file(data)
     toc = time.time()
     t_parse = toc - tic
 
@@ -50,6 +77,10 @@ def load_gmsh(gmsh_file):
 
     logger.info(f'Parsing took {t_parse} s; Grid creation took {t_grid} s; BoundaryInfo creation took {t_bi} s')
 
+    if cache_file is not None:
+        logger.info(f'Writing {cache_file} ...')
+        _save_cache(cache_file, grid, bi, sections, source_hash)
+
     return grid, bi
 
 
@@ -59,22 +90,56 @@ class GmshGrid(UnstructuredTriangleGrid):
     Parameters
     ----------
     sections
-        Parsed sections of the MSH-file as returned by :func:`load_gmsh`.
+        Parsed sections of the MSH-file as returned by :func:`_parse_gmsh_file`.
+        Ignored if `topology` is given.
+    topology
+        If not `None`, a dict of the grid's vertices, faces and derived topology
+        arrays, as stored in the `cache_file` of :func:`load_gmsh`. The stored
+        topology arrays are returned instead of being recomputed.
     """
 
-    def __init__(self, sections):
+    def __init__(self, sections, topology=None):
+        if topology is not None:
+            self._topology = {k: v for k, v in topology.items() if k in _TOPOLOGY_KEYS}
+            super().__init__(topology['vertices'], topology['faces'], edges=topology['edges'])
+            return
+
         self.logger.info('Checking if grid is a 2d triangular grid ...')
         assert {'Nodes', 'Elements', 'PhysicalNames'} <= set(sections.keys())
         assert set(sections['Elements'].keys()) <= {'line', 'triangle'}
         assert 'triangle' in sections['Elements']
-        assert all(n[1][2] == 0 for n in sections['Nodes'])
+        node_tags, coordinates = sections['Nodes']
+        assert np.all(coordinates[:, 2] == 0)
+
+        self._topology = {}
+        faces = _node_indices(node_tags, sections['Elements']['triangle'][1])
+        super().__init__(coordinates[:, :2], faces)
 
-        node_ids = dict(zip([n[0] for n in sections['Nodes']], np.arange(len(sections['Nodes']), dtype=np.int32)))
-        vertices = np.array([n[1][0:2] for n in sections['Nodes']])
+    def subentities(self, codim=0, subentity_codim=None):
+        if subentity_codim is None:
+            subentity_codim = codim + 1
+        try:
+            return self._topology[f'subentities_{codim}_{subentity_codim}']
+        except KeyError:
+            return super().subentities(codim, subentity_codim)
 
-        faces = np.array([[node_ids[nodes[0]], node_ids[nodes[1]], node_ids[nodes[2]]]
-                         for _, _, nodes in sections['Elements']['triangle']])
-        super().__init__(vertices, faces)
+    def superentities(self, codim, superentity_codim):
+        try:
+            return self._topology[f'superentities_{codim}_{superentity_codim}']
+        except KeyError:
+            return super().superentities(codim, superentity_codim)
+
+    def superentity_indices(self, codim, superentity_codim):
+        try:
+            return self._topology[f'superentity_indices_{codim}_{superentity_codim}']
+        except KeyError:
+            return super().superentity_indices(codim, superentity_codim)
+
+    def boundaries(self, codim):
+        try:
+            return self._topology[f'boundaries_{codim}']
+        except KeyError:
+            return super().boundaries(codim)
 
     def __str__(self):
         return f'GmshGrid with {self.size(0)} triangles, {self.size(1)} edges, {self.size(2)} vertices'
@@ -88,43 +153,34 @@ class GmshBoundaryInfo(BoundaryInfoInterface):
     grid
         The corresponding :class:`GmshGrid`.
     sections
-        Parsed sections of the MSH-file as returned by :func:`load_gmsh`.
+        Parsed sections of the MSH-file as returned by :func:`_parse_gmsh_file`.
+        Ignored if `masks` is given.
+    masks
+        If not `None`, a dict mapping each boundary type to the list
+        `[edge_mask, vertex_mask]` of its boundary masks, as stored in the
+        `cache_file` of :func:`load_gmsh`.
     """
 
-    def __init__(self, grid, sections):
+    def __init__(self, grid, sections, masks=None):
         assert isinstance(grid, GmshGrid)
         self.grid = grid
 
-        # Save boundary types.
-        self.boundary_types = [pn[2] for pn in sections['PhysicalNames'] if pn[1] == 1]
-
-        # Compute ids, since Gmsh starts numbering with 1 instead of 0.
-        name_ids = dict(zip([pn[0] for pn in sections['PhysicalNames']], np.arange(len(sections['PhysicalNames']),
-                                                                                   dtype=np.int32)))
-        node_ids = dict(zip([n[0] for n in sections['Nodes']], np.arange(len(sections['Nodes']), dtype=np.int32)))
-
-        if 'line' in sections['Elements']:
-            superentities = grid.superentities(2, 1)
-
-            # find the edge for given vertices.
-            def find_edge(vertices):
-                edge_set = set(superentities[vertices[0]]).intersection(superentities[vertices[1]]) - {-1}
-                if len(edge_set) != 1:
-                    raise ValueError
-                return next(iter(edge_set))
-
-            line_ids = {l[0]: find_edge([node_ids[l[2][0]], node_ids[l[2][1]]]) for l in sections['Elements']['line']}
-
-        # compute boundary masks for all boundary types.
-        masks = {}
-        for bt in self.boundary_types:
-            masks[bt] = [np.array([False]*grid.size(1)), np.array([False]*grid.size(2))]
-            masks[bt][0][[line_ids[l[0]] for l in sections['Elements']['line']]] = \
-                [(bt == sections['PhysicalNames'][name_ids[l[1][0]]][2]) for l in sections['Elements']['line']]
-            ind = np.array([node_ids[n] for l in sections['Elements']['line'] for n in l[2]])
-            val = masks[bt][0][[line_ids[l[0]] for l in sections['Elements']['line'] for n in l[2]]]
-            masks[bt][1][ind[val]] = True
+        if masks is None:
+            names = {tag: name for tag, dim, name in sections['PhysicalNames'] if dim == 1}
+            masks = {name: [np.zeros(grid.size(1), dtype=bool), np.zeros(grid.size(2), dtype=bool)]
+                     for name in names.values()}
+
+            if 'line' in sections['Elements'] and masks:
+                physical_tags, nodes = sections['Elements']['line']
+                vertices = _node_indices(sections['Nodes'][0], nodes)
+                edges = _find_edges(grid, vertices)
+                for tag, name in names.items():
+                    ind = physical_tags == tag
+                    masks[name][0][edges[ind]] = True
+                    masks[name][1][vertices[ind].ravel()] = True
 
+        # Save boundary types.
+        self.boundary_types = list(masks)
         self._masks = masks
 
     def mask(self, boundary_type, codim):
@@ -133,152 +189,472 @@ class GmshBoundaryInfo(BoundaryInfoInterface):
         return self._masks[boundary_type][codim - 1]
 
 
-def _parse_gmsh_file(f):
-
-    allowed_sections = ['Nodes', 'Elements', 'PhysicalNames', 'Periodic', 'NodeData',
-                        'ElementData', 'ElementNodeData']
-
-    supported_sections = ['Nodes', 'Elements', 'PhysicalNames']
-
-    try:
-
-        l = next(f).strip()
-        if l != '$MeshFormat':
-            raise GmshError(f'expected $MeshFormat, got {l}')
+def _node_indices(node_tags, nodes):
+    """Map Gmsh node tags to row indices of the node arrays."""
+    num_nodes = len(node_tags)
+    if num_nodes == 0:
+        raise GmshError('no nodes defined')
+    if node_tags[0] == 1 and node_tags[-1] == num_nodes and np.all(np.diff(node_tags) == 1):
+        if nodes.size and (nodes.min() < 1 or nodes.max() > num_nodes):
+            raise GmshError('element references unknown node')
+        return (nodes - 1).astype(np.int32)
+    sorter = np.argsort(node_tags, kind='stable')
+    ind = sorter[np.minimum(np.searchsorted(node_tags, nodes, sorter=sorter), num_nodes - 1)]
+    if np.any(node_tags[ind] != nodes):
+        raise GmshError('element references unknown node')
+    return ind.astype(np.int32)
+
+
+def _find_edges(grid, vertices):
+    """Global indices of the edges of `grid` given by the vertex pairs in `vertices`.
+
+    Edges are identified by the hash `min(v0, v1) * num_vertices + max(v0, v1)`
+    of their sorted vertex pairs, which is looked up in the sorted hashes of
+    all grid edges.
+    """
+    def keys(pairs):
+        pairs = pairs.astype(np.int64)
+        return np.minimum(pairs[:, 0], pairs[:, 1]) * grid.size(2) + np.maximum(pairs[:, 0], pairs[:, 1])
 
-        l = next(f).strip()
-        header = l.split(' ')
-        if len(header) != 3:
-            raise GmshError(f'header {l} has {len(header)} fields, expected 3')
+    edge_keys = keys(grid.subentities(1, 2))
+    line_keys = keys(vertices)
+    sorter = np.argsort(edge_keys)
+    edges = sorter[np.minimum(np.searchsorted(edge_keys, line_keys, sorter=sorter), len(edge_keys) - 1)]
+    if np.any(edge_keys[edges] != line_keys):
+        raise GmshError('line element does not match an edge of the grid')
+    return edges
 
-        if header[0] != '2.2':
-            raise GmshError(f'wrong file format version: got {header[0]}, expected 2.2')
 
-        try:
-            file_type = int(header[1])
-        except ValueError:
-            raise GmshError(f'malformed header: expected integer, got {header[1]}')
+_TOPOLOGY = (('subentities', 1, 2),
+             ('superentities', 1, 0), ('superentities', 2, 0), ('superentities', 2, 1),
+             ('superentity_indices', 1, 0), ('superentity_indices', 2, 0), ('superentity_indices', 2, 1),
+             ('boundaries', 0), ('boundaries', 1), ('boundaries', 2))
+_TOPOLOGY_KEYS = tuple('_'.join(map(str, t)) for t in _TOPOLOGY)
 
-        if file_type != 0:
-            raise GmshError('wrong file type: only ASCII gmsh files are supported')
 
-        try:
-            data_size = int(header[2])    # NOQA
-        except ValueError:
-            raise GmshError(f'malformed header: expected integer, got {header[2]}')
-
-        l = next(f).strip()
-        if l != '$EndMeshFormat':
-            raise GmshError(f'expected $EndMeshFormat, got {l}')
-
-    except StopIteration:
-        raise GmshError('unexcpected end of file')
-
-    in_section = False
-    sections = defaultdict(list)
-
-    for l in f:
-        l = l.strip()
-        if l == '':
-            continue
-        if not in_section:
-            if not l.startswith('$'):
-                raise GmshError(f'expected section name, got {l}')
-            section = l[1:]
-            if section not in allowed_sections:
-                raise GmshError(f'unknown section type: {section}')
-            if section not in supported_sections:
-                raise GmshError(f'unsupported section type: {section}')
-            if section in sections:
-                raise GmshError(f'only one {section} section allowed')
-            in_section = True
-        elif l.startswith('$'):
-            if l != '$End' + section:
-                raise GmshError(f'expected $End{section}, got {l}')
-            in_section = False
-        else:
-            sections[section].append(l)
+def _cache_is_valid(cache_file, source_hash):
+    """Check if `cache_file` is readable and was created for a MSH-file with hash `source_hash`."""
+    try:
+        with np.load(cache_file) as npz:
+            return str(npz['source_hash']) == source_hash
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return False
+
+
+def _save_cache(cache_file, grid, bi, sections, source_hash):
+    arrays = {'source_hash': np.array(source_hash),
+              'vertices': sections['Nodes'][1][:, :2],
+              'faces': grid.subentities(0, 2),
+              'edges': grid.subentities(0, 1),
+              'boundary_types': np.array(bi.boundary_types, dtype=str)}
+    for key, (method, *args) in zip(_TOPOLOGY_KEYS, _TOPOLOGY):
+        arrays[key] = getattr(grid, method)(*args)
+    for i, bt in enumerate(bi.boundary_types):
+        arrays[f'mask_{i}_1'] = bi.mask(bt, 1)
+        arrays[f'mask_{i}_2'] = bi.mask(bt, 2)
+    # write to a temporary file which replaces cache_file afterwards, so that an existing
+    # cache_file, which might still be memory-mapped, is not truncated; writing through a
+    # file handle ensures that numpy does not append '.npz' to the file name
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_file)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
 
-    if in_section:
-        raise GmshError(f'file ended while in section {section}')
 
-    # now we parse each section ...
+def _load_cache(cache_file):
+    arrays = _load_npz(cache_file)
+    grid = GmshGrid(None, topology=arrays)
+    masks = {str(bt): [arrays[f'mask_{i}_1'], arrays[f'mask_{i}_2']]
+             for i, bt in enumerate(arrays['boundary_types'])}
+    return grid, GmshBoundaryInfo(grid, None, masks=masks)
 
-    def parse_nodes(nodes):
-        try:
-            num_nodes = int(nodes[0])
-        except ValueError:
-            raise GmshError(f'first line of nodes sections is not a number: {nodes[0]}')
-        if len(nodes) != num_nodes + 1:
-            raise GmshError('number-of-nodes field does not match number of lines in nodes section')
 
-        nodes = [n.split(' ') for n in nodes[1:]]
-        if not all(len(n) == 4 for n in nodes):
-            raise GmshError('malformed nodes section')
+def _load_npz(path):
+    """Load all arrays of an uncompressed `.npz`-file as read-only memory maps.
 
+    :func:`numpy.load` ignores `mmap_mode` for `.npz`-files. As :func:`numpy.savez`
+    stores its members uncompressed, we locate the data of each member ourselves.
+    Empty, zero-dimensional or compressed members are loaded into memory.
+    """
+    arrays = {}
+    header_readers = {(1, 0): np.lib.format.read_array_header_1_0,
+                      (2, 0): np.lib.format.read_array_header_2_0}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type == zipfile.ZIP_STORED:
+                # skip the local file header, whose extra field may differ from the
+                # central directory
+                f.seek(info.header_offset)
+                name_length, extra_length = struct.unpack('<HH', f.read(30)[26:30])
+                f.seek(info.header_offset + 30 + name_length + extra_length)
+                version = np.lib.format.read_magic(f)
+                if version in header_readers:
+                    shape, fortran_order, dtype = header_readers[version](f)
+                    if len(shape) > 0 and np.prod(shape) > 0 and not dtype.hasobject:
+                        arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                                 order='F' if fortran_order else 'C')
+                        continue
+            with zf.open(info) as member:
+                arrays[name] = np.lib.format.read_array(member)
+    return arrays
+
+
+_ELEMENT_TYPES = {1: 'line', 2: 'triangle', 15: 'point'}
+_ELEMENT_NODES = {'line': 2, 'triangle': 3, 'point': 1}
+
+_KNOWN_SECTIONS = {'MeshFormat', 'PhysicalNames', 'Entities', 'PartitionedEntities', 'Nodes', 'Elements',
+                   'Periodic', 'GhostElements', 'Parametrizations', 'NodeData', 'ElementData', 'ElementNodeData',
+                   'InterpolationScheme'}
+
+
+class _MshBuffer:
+    """Read position in the raw contents of a MSH-file."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def line(self, eof_ok=False):
+        """Return the next non-empty line."""
+        data = self.data
+        while self.pos < len(data):
+            end = data.find(b'\n', self.pos)
+            if end == -1:
+                end = len(data)
+            l = data[self.pos:end].strip()
+            self.pos = end + 1
+            if l:
+                return l.decode('utf-8', errors='replace')
+        if eof_ok:
+            return None
+        raise GmshError('unexpected end of file')
+
+    def ints(self, count):
+        """Parse the next non-empty line as `count` integers."""
+        l = self.line()
         try:
-            nodes = [(int(a), (float(b), float(c), float(d))) for a, b, c, d in nodes]
+            values = [int(v) for v in l.split()]
         except ValueError:
-            raise GmshError('malformed nodes section')
+            raise GmshError(f'malformed line: expected integers, got {l}')
+        if len(values) != count:
+            raise GmshError(f'line {l} has {len(values)} fields, expected {count}')
+        return values
+
+    def section_body(self, section):
+        """Return the raw contents up to `$End<section>`."""
+        end = self.data.find(b'$End' + section.encode(), self.pos)
+        if end == -1:
+            raise GmshError(f'file ended while in section {section}')
+        body = self.data[self.pos:end]
+        self.pos = end
+        return body
+
+    def ascii_values(self, section, dtype):
+        """Parse the remaining contents of `section` as whitespace-separated numbers."""
+        with warnings.catch_warnings():
+            # numpy warns when it cannot parse the data to its end;
+            # we check the number of values instead
+            warnings.simplefilter('ignore', DeprecationWarning)
+            return np.fromstring(self.section_body(section), dtype=dtype, sep=' ')
+
+    def binary(self, dtype, count=1):
+        """Read the next `count` binary values of type `dtype`."""
+        dtype = np.dtype(dtype)
+        if self.pos + dtype.itemsize * count > len(self.data):
+            raise GmshError('unexpected end of file')
+        values = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.pos)
+        self.pos += dtype.itemsize * count
+        return values
+
+    def end_section(self, section):
+        l = self.line()
+        if l != '$End' + section:
+            raise GmshError(f'expected $End{section}, got {l}')
+
+
+def _read_gmsh_file(f):
+    """Return the raw contents of the MSH-file given by a path or a file handle."""
+    if isinstance(f, (str, os.PathLike)):
+        with open(f, 'rb') as fh:
+            return fh.read()
+    data = f.buffer.read() if hasattr(f, 'buffer') else f.read()
+    if isinstance(data, str):
+        data = data.encode()
+    return data
+
+
+def _parse_gmsh_file(data):
+    """Parse the contents of a Gmsh MSH-file of version 2.2 or 4.1 into a dict of |NumPy arrays|.
+
+    The returned dict has the following items:
+
+        'Nodes'          `(node_tags, coordinates)`
+        'Elements'       dict mapping `'line'` and `'triangle'` to `(physical_tags, node_tags)`,
+                         where `physical_tags` is `-1` for elements without physical group
+        'PhysicalNames'  list of `(physical_tag, dim, name)` tuples
+
+    ASCII sections are parsed as a whole with :func:`numpy.fromstring`, binary
+    sections are read with :func:`numpy.frombuffer`.
+    """
+    buf = _MshBuffer(data)
 
-        return nodes
+    l = buf.line()
+    if l != '$MeshFormat':
+        raise GmshError(f'expected $MeshFormat, got {l}')
 
-    def parse_elements(elements):
-        try:
-            num_elements = int(elements[0])
-        except ValueError:
-            raise GmshError(f'first line of elements sections is not a number: {elements[0]}')
-        if len(elements) != num_elements + 1:
-            raise GmshError('number-of-elements field does not match number of lines in elements section')
+    l = buf.line()
+    header = l.split()
+    if len(header) != 3:
+        raise GmshError(f'header {l} has {len(header)} fields, expected 3')
 
-        elements = [e.split(' ') for e in elements[1:]]
-        try:
-            elements = [tuple(int(f) for f in e) for e in elements]
-        except ValueError:
-            raise GmshError('malformed elements section')
+    version = header[0]
+    if version not in ('2.2', '4.1'):
+        raise GmshError(f'wrong file format version: got {version}, expected 2.2 or 4.1')
 
-        element_types = {1: 'line', 2: 'triangle'}
-        element_nodes = {'line': 2, 'triangle': 3}
+    try:
+        file_type = int(header[1])
+    except ValueError:
+        raise GmshError(f'malformed header: expected integer, got {header[1]}')
+    if file_type not in (0, 1):
+        raise GmshError(f'wrong file type: got {file_type}, expected 0 (ASCII) or 1 (binary)')
 
-        def parse_line(fields):
-            if fields[1] not in element_types:
-                raise GmshError(f'element type {fields[0]} not supported')
-            element_type = element_types[fields[1]]
-            num_nodes = element_nodes[element_type]
-            num_tags = fields[2]
-            if len(fields) != num_nodes + num_tags + 3:
-                raise GmshError('malformed elements section')
-            return element_type, (fields[0], tuple(fields[3:3 + num_tags]), fields[3 + num_tags:])
+    try:
+        data_size = int(header[2])
+    except ValueError:
+        raise GmshError(f'malformed header: expected integer, got {header[2]}')
+    if data_size != 8:
+        raise GmshError(f'unsupported data size {data_size}, expected 8')
+
+    byteorder = None
+    if file_type == 1:
+        one = buf.binary('<i4')[0]
+        if one == 1:
+            byteorder = '<'
+        elif one.byteswap() == 1:
+            byteorder = '>'
+        else:
+            raise GmshError('malformed header: cannot determine byte order')
+
+    buf.end_section('MeshFormat')
+
+    parser_map = {'PhysicalNames': _parse_physical_names, 'Nodes': _parse_nodes, 'Elements': _parse_elements}
+    if version == '4.1':
+        parser_map['Entities'] = _parse_entities
+
+    sections = {}
+    while True:
+        l = buf.line(eof_ok=True)
+        if l is None:
+            break
+        if not l.startswith('$'):
+            raise GmshError(f'expected section name, got {l}')
+        section = l[1:]
+        if section not in _KNOWN_SECTIONS:
+            raise GmshError(f'unknown section type: {section}')
+        if section in sections:
+            raise GmshError(f'only one {section} section allowed')
+        if section in parser_map:
+            sections[section] = parser_map[section](buf, version, byteorder, sections)
+        else:
+            buf.section_body(section)
+        buf.end_section(section)
 
-        elements_by_type = defaultdict(list)
-        for e in elements:
-            t, l = parse_line(e)
-            elements_by_type[t].append(l)
+    if 'Nodes' not in sections or 'Elements' not in sections:
+        raise GmshError('Nodes or Elements section missing')
+    sections.pop('Entities', None)
+    sections.setdefault('PhysicalNames', [])
 
-        return elements_by_type
+    return sections
 
-    def parse_names(physical_names):
-        try:
-            num_elements = int(physical_names[0])
-        except ValueError:
-            raise GmshError(f'first line of physical names sections is not a number: {physical_names[0]}')
-        if len(physical_names) != num_elements + 1:
-            raise GmshError('number-of-names field does not match number of lines in physical names section')
 
-        physical_names = [pn.split(' ') for pn in physical_names[1:]]
-        if not all(len(pn) == 3 for pn in physical_names):
+def _parse_physical_names(buf, version, byteorder, sections):
+    num_names, = buf.ints(1)
+    physical_names = []
+    for _ in range(num_names):
+        pn = buf.line().split(maxsplit=2)
+        if len(pn) != 3:
             raise GmshError('malformed physical names section')
-
         try:
-            physical_names = [(int(b), int(a), str(c).replace('"', '')) for a, b, c in physical_names]
+            physical_names.append((int(pn[1]), int(pn[0]), pn[2].replace('"', '')))
         except ValueError:
             raise GmshError('malformed physical names section')
-
-        return physical_names
-
-    parser_map = {'Nodes': parse_nodes, 'Elements': parse_elements, 'PhysicalNames': parse_names}
-
-    for k, v in sections.items():
-        sections[k] = parser_map[k](v)
-
-    return sections
+    return physical_names
+
+
+def _parse_entities(buf, version, byteorder, sections):
+    """Return a dict mapping `(dim, entity_tag)` to the first physical tag of the entity."""
+    physical_tags = {}
+    if byteorder is None:
+        counts = buf.ints(4)
+        for dim, count in enumerate(counts):
+            for _ in range(count):
+                fields = buf.line().split()
+                try:
+                    num_physical = int(fields[4 if dim == 0 else 7])
+                    physical_tags[dim, int(fields[0])] = int(fields[5 if dim == 0 else 8]) if num_physical else -1
+                except (ValueError, IndexError):
+                    raise GmshError('malformed entities section')
+    else:
+        size_t, int_t = byteorder + 'u8', byteorder + 'i4'
+        counts = buf.binary(size_t, 4)
+        for dim, count in enumerate(counts):
+            for _ in range(count):
+                tag = int(buf.binary(int_t)[0])
+                buf.binary(byteorder + 'f8', 3 if dim == 0 else 6)
+                tags = buf.binary(int_t, int(buf.binary(size_t)[0]))
+                physical_tags[dim, tag] = int(tags[0]) if len(tags) else -1
+                if dim > 0:
+                    buf.binary(int_t, int(buf.binary(size_t)[0]))
+    return physical_tags
+
+
+def _parse_nodes(buf, version, byteorder, sections):
+    if version == '2.2':
+        num_nodes, = buf.ints(1)
+        if byteorder is None:
+            nodes = buf.ascii_values('Nodes', np.float64)
+            if len(nodes) != 4 * num_nodes:
+                raise GmshError('malformed nodes section')
+            nodes = nodes.reshape((num_nodes, 4))
+            return nodes[:, 0].astype(np.int64), nodes[:, 1:]
+        else:
+            nodes = buf.binary([('tag', byteorder + 'i4'), ('coordinates', byteorder + 'f8', (3,))], num_nodes)
+            return nodes['tag'].astype(np.int64), nodes['coordinates'].astype(np.float64)
+
+    tags, coordinates = [], []
+    if byteorder is None:
+        num_blocks, num_nodes, _, _ = buf.ints(4)
+        values = buf.ascii_values('Nodes', np.float64)
+        pos = 0
+        for _ in range(num_blocks):
+            if pos + 4 > len(values):
+                raise GmshError('malformed nodes section')
+            dim, _, parametric, count = values[pos:pos + 4].astype(int)
+            pos += 4
+            width = 3 + dim * parametric
+            if pos + count * (1 + width) > len(values):
+                raise GmshError('malformed nodes section')
+            tags.append(values[pos:pos + count].astype(np.int64))
+            pos += count
+            coordinates.append(values[pos:pos + count * width].reshape((count, width))[:, :3])
+            pos += count * width
+        if pos != len(values):
+            raise GmshError('malformed nodes section')
+    else:
+        size_t = byteorder + 'u8'
+        num_blocks, num_nodes, _, _ = buf.binary(size_t, 4).astype(int)
+        for _ in range(num_blocks):
+            dim, _, parametric = buf.binary(byteorder + 'i4', 3)
+            count = int(buf.binary(size_t)[0])
+            tags.append(buf.binary(size_t, count).astype(np.int64))
+            width = 3 + dim * parametric
+            coordinates.append(buf.binary(byteorder + 'f8', count * width).reshape((count, width))[:, :3])
+
+    tags = np.concatenate(tags) if tags else np.zeros(0, dtype=np.int64)
+    coordinates = np.concatenate(coordinates).astype(np.float64) if coordinates else np.zeros((0, 3))
+    if len(tags) != num_nodes:
+        raise GmshError('number-of-nodes field does not match number of nodes in nodes section')
+    return tags, coordinates
+
+
+def _element_type(element_type):
+    try:
+        return _ELEMENT_TYPES[element_type]
+    except KeyError:
+        raise GmshError(f'element type {element_type} not supported')
+
+
+def _parse_elements(buf, version, byteorder, sections):
+    elements = defaultdict(list)
+
+    if version == '2.2' and byteorder is None:
+        num_elements, = buf.ints(1)
+        body = buf.section_body('Elements')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            values = np.fromstring(body, dtype=np.int64, sep=' ')
+
+        # lines have different lengths, so we compute the offset of each line
+        # by counting the starts of whitespace-separated fields in each line
+        chars = np.frombuffer(body, dtype=np.uint8)
+        space = chars <= 32
+        starts = ~space
+        starts[1:] &= space[:-1]
+        line_starts = np.concatenate(([0], np.flatnonzero(chars == 10) + 1))
+        line_starts = line_starts[line_starts < len(chars)]
+        lengths = np.add.reduceat(starts, line_starts, dtype=np.int64) if len(line_starts) else np.zeros(0, np.int64)
+        lengths = lengths[lengths > 0]
+        if len(lengths) != num_elements or lengths.sum() != len(values):
+            raise GmshError('malformed elements section')
+        offsets = np.cumsum(lengths) - lengths
+
+        types = values[offsets + 1]
+        num_tags = values[offsets + 2]
+        for t in np.unique(types):
+            element_type = _element_type(t)
+            num_nodes = _ELEMENT_NODES[element_type]
+            ind = types == t
+            o, k = offsets[ind], num_tags[ind]
+            if np.any(lengths[ind] != 3 + k + num_nodes):
+                raise GmshError('malformed elements section')
+            physical_tags = np.where(k > 0, values[o + 3], -1)
+            elements[element_type].append((physical_tags, values[(o + 3 + k)[:, np.newaxis] + np.arange(num_nodes)]))
+
+    elif version == '2.2':
+        num_elements, = buf.ints(1)
+        int_t = byteorder + 'i4'
+        read = 0
+        while read < num_elements:
+            t, count, num_tags = buf.binary(int_t, 3)
+            element_type = _element_type(t)
+            width = 1 + num_tags + _ELEMENT_NODES[element_type]
+            block = buf.binary(int_t, count * width).reshape((count, width))
+            physical_tags = block[:, 1] if num_tags > 0 else np.full(count, -1)
+            elements[element_type].append((physical_tags, block[:, 1 + num_tags:]))
+            read += count
+        if read != num_elements:
+            raise GmshError('number-of-elements field does not match number of elements in elements section')
+
+    else:
+        entities = sections.get('Entities', {})
+        blocks = []
+        if byteorder is None:
+            num_blocks, num_elements, _, _ = buf.ints(4)
+            values = buf.ascii_values('Elements', np.int64)
+            pos = 0
+            for _ in range(num_blocks):
+                if pos + 4 > len(values):
+                    raise GmshError('malformed elements section')
+                dim, entity, t, count = values[pos:pos + 4]
+                pos += 4
+                width = 1 + _ELEMENT_NODES[_element_type(t)]
+                if pos + count * width > len(values):
+                    raise GmshError('malformed elements section')
+                blocks.append((dim, entity, t, values[pos:pos + count * width].reshape((count, width))))
+                pos += count * width
+            if pos != len(values):
+                raise GmshError('malformed elements section')
+        else:
+            size_t = byteorder + 'u8'
+            num_blocks, num_elements, _, _ = buf.binary(size_t, 4).astype(int)
+            for _ in range(num_blocks):
+                dim, entity, t = buf.binary(byteorder + 'i4', 3)
+                count = int(buf.binary(size_t)[0])
+                width = 1 + _ELEMENT_NODES[_element_type(t)]
+                blocks.append((dim, entity, t, buf.binary(size_t, count * width).reshape((count, width))))
+
+        if sum(len(b[3]) for b in blocks) != num_elements:
+            raise GmshError('number-of-elements field does not match number of elements in elements section')
+        for dim, entity, t, block in blocks:
+            elements[_element_type(t)].append((np.full(len(block), entities.get((int(dim), int(entity)), -1)),
+                                               block[:, 1:]))
+
+    elements.pop('point', None)
+    return {k: (np.concatenate([e[0] for e in v]).astype(np.int64),
+                np.concatenate([e[1] for e in v]).astype(np.int64))
+            for k, v in elements.items()}
@@ -17,8 +17,9 @@ class ConformalTopologicalGridInterface(ConformalTopologicalGridDefaultImplement
     The grid is completely determined via the subentity relation given by
     :meth:`~ConformalTopologicalGridInterface.subentities`. In addition,
     only :meth:`~ConformalTopologicalGridInterface.size` has to be
-    implemented, cached default implementations for all other methods are
+    implemented, default implementations for all other methods are
     provided by :class:`~pymor.grids.defaultimpl.ConformalTopologicalGridDefaultImplementations`.
+    Their results are kept in the grid's :class:`~pymor.grids.datastore.GridDataStore`.
 
     Attributes
     ----------
@@ -26,6 +27,7 @@ class ConformalTopologicalGridInterface(ConformalTopologicalGridDefaultImplement
         The dimension of the grid.
     """
 
+    sid_ignore = CacheableInterface.sid_ignore | {'_grid_data'}
     cache_region = 'memory'
 
     @abstractmethod
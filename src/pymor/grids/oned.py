@@ -5,6 +5,7 @@
 
 import numpy as np
 
+from pymor.grids.datastore import grid_data_state
 from pymor.grids.interfaces import AffineGridWithOrthogonalCentersInterface
 from pymor.grids.referenceelements import line
 
@@ -40,7 +41,8 @@ class OnedGrid(AffineGridWithOrthogonalCentersInterface):
 
     def __reduce__(self):
         return (OnedGrid,
-                (self._domain, self._num_intervals, self._identify_left_right))
+                (self._domain, self._num_intervals, self._identify_left_right),
+                grid_data_state(self))
 
     def __str__(self):
         return (f'OnedGrid, domain [{self._domain[0]},{self._domain[1]}], '
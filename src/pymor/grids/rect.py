@@ -4,6 +4,7 @@
 
 import numpy as np
 
+from pymor.grids.datastore import grid_data_state
 from pymor.grids.interfaces import AffineGridWithOrthogonalCentersInterface
 from pymor.grids.referenceelements import square
 
@@ -139,7 +140,8 @@ class RectGrid(AffineGridWithOrthogonalCentersInterface):
 
     def __reduce__(self):
         return (RectGrid,
-                (self.num_intervals, self.domain, self.identify_left_right, self.identify_bottom_top))
+                (self.num_intervals, self.domain, self.identify_left_right, self.identify_bottom_top),
+                grid_data_state(self))
 
     def __str__(self):
         return (f'Rect-Grid on domain '
@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from pymor.core.cache import cached
+from pymor.grids.datastore import grid_data, grid_data_state
 from pymor.grids.interfaces import AffineGridWithOrthogonalCentersInterface
 from pymor.grids.referenceelements import triangle
 
@@ -168,7 +168,8 @@ class TriaGrid(AffineGridWithOrthogonalCentersInterface):
 
     def __reduce__(self):
         return (TriaGrid,
-                (self.num_intervals, self.domain, self.identify_left_right, self.identify_bottom_top))
+                (self.num_intervals, self.domain, self.identify_left_right, self.identify_bottom_top),
+                grid_data_state(self))
 
     def __str__(self):
         return (f'Tria-Grid on domain '
@@ -206,7 +207,7 @@ class TriaGrid(AffineGridWithOrthogonalCentersInterface):
     def bounding_box(self):
         return np.array(self.domain)
 
-    @cached
+    @grid_data
     def orthogonal_centers(self):
         embeddings = self.embeddings(0)
         ne4 = len(embeddings[0]) // 4
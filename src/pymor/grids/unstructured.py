@@ -23,19 +23,29 @@ class UnstructuredTriangleGrid(AffineGridInterface):
         of the vertices which define a given triangle in the grid.
         The row numbers in the array will be the global indices of the
         given triangles (codim 0 entities).
+    edges
+        If not `None`, a (num_faces, 3)-shaped |array| containing the
+        global indices of the edges of each triangle, as computed by
+        :func:`~pymor.grids._unstructured.compute_edges`. Allows to skip
+        the recomputation of the edges for previously stored grids.
     """
 
     dim = 2
     reference_element = triangle
 
-    def __init__(self, vertices, faces):
+    def __init__(self, vertices, faces, edges=None):
         assert faces.shape[1] == 3
         assert np.min(faces) == 0
         assert np.max(faces) == len(vertices) - 1
 
         vertices = vertices.astype(np.float64, copy=False)
         faces = faces.astype(np.int32, copy=False)
-        edges, num_edges = compute_edges(faces, len(vertices))
+        if edges is None:
+            edges, num_edges = compute_edges(faces, len(vertices))
+        else:
+            assert edges.shape == faces.shape
+            edges = edges.astype(np.int32, copy=False)
+            num_edges = int(np.max(edges)) + 1
 
         COORDS = vertices[faces]
         SHIFTS = COORDS[:, 0, :]
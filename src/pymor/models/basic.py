@@ -2,12 +2,18 @@
 # Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
+import numpy as np
+
 from pymor.algorithms.timestepping import TimeStepperInterface
+from pymor.algorithms.to_matrix import to_matrix_batch
+from pymor.core.defaults import defaults
+from pymor.core.exceptions import InversionError
 from pymor.models.interfaces import ModelInterface
 from pymor.operators.constructions import VectorOperator, induced_norm
 from pymor.operators.interfaces import OperatorInterface
 from pymor.tools.frozendict import FrozenDict
 from pymor.vectorarrays.interfaces import VectorArrayInterface
+from pymor.vectorarrays.numpy import NumpyVectorSpace
 
 
 class ModelBase(ModelInterface):
@@ -52,6 +58,29 @@ class ModelBase(ModelInterface):
         else:
             raise NotImplementedError('Model has no estimator.')
 
+    def estimate_batch(self, U, mus):
+        """Estimate the errors of several solutions.
+
+        Parameters
+        ----------
+        U
+            |VectorArray| of solutions, where `U[i]` is the solution for
+            the |Parameter| `mus[i]`.
+        mus
+            |ParameterArray| or list of |Parameters| for which to estimate the errors.
+
+        Returns
+        -------
+        |NumPy array| of the estimated errors.
+        """
+        assert len(U) == len(mus)
+        if self.estimator is None:
+            raise NotImplementedError('Model has no estimator.')
+        elif hasattr(self.estimator, 'estimate_batch'):
+            return self.estimator.estimate_batch(U, mus, m=self)
+        else:
+            return np.hstack([self.estimate(U[i], mu=mu) for i, mu in enumerate(mus)])
+
 
 class StationaryModel(ModelBase):
     """Generic class for models of stationary problems.
@@ -138,6 +167,63 @@ class StationaryModel(ModelBase):
 
         return self.operator.apply_inverse(self.rhs.as_range_array(mu), mu=mu)
 
+    @defaults('max_batch_dim', 'batch_size')
+    def solve_batch(self, mus, max_batch_dim=1000, batch_size=None):
+        """Solve the discrete problem for several |Parameters|.
+
+        For linear models with a |NumPy|-based solution space of dimension at
+        most `max_batch_dim`, like reduced models obtained by projection, the
+        system matrices and right-hand sides for all |Parameters| are
+        assembled using :func:`~pymor.algorithms.to_matrix.to_matrix_batch`
+        and the systems are solved by a single call of :func:`numpy.linalg.solve`.
+        Otherwise, :meth:`~pymor.models.interfaces.ModelInterface.solve` is
+        called for each |Parameter|. In the former case, the solutions are
+        not :mod:`cached <pymor.core.cache>`.
+
+        Parameters
+        ----------
+        mus
+            |ParameterArray| or list of |Parameters| for which to solve.
+        max_batch_dim
+            Maximum dimension of the solution space for which the batched
+            solver is used.
+        batch_size
+            Number of systems which are assembled and solved at once. If `None`,
+            the batch size is chosen such that the stacked system matrices occupy
+            at most 128 MiB.
+
+        Returns
+        -------
+        The solution |VectorArray|, where the `i`-th vector is the solution for `mus[i]`.
+        """
+        mus = self.parse_parameter_array(mus)
+        dim = self.solution_space.dim
+        if not (self.operator.linear and isinstance(self.solution_space, NumpyVectorSpace)
+                and 0 < dim <= max_batch_dim):
+            U = self.solution_space.empty(reserve=len(mus))
+            for mu in mus:
+                U.append(self.solve(mu))
+            return U
+
+        if not self.logging_disabled:
+            self.logger.info(f'Solving {self.name} for {len(mus)} parameters ...')
+
+        batch_size = batch_size or max(1, 2**24 // dim**2)
+        solutions = []
+        for i in range(0, len(mus), batch_size):
+            batch = mus[i:i+batch_size]
+            A = to_matrix_batch(self.operator, batch)
+            F = np.broadcast_to(to_matrix_batch(self.rhs, batch)[..., 0], (len(batch), dim))
+            try:
+                if len(A) == 1:  # operator is not parametric, solve all systems at once
+                    solutions.append(np.linalg.solve(A[0], F.T).T)
+                else:
+                    solutions.append(np.linalg.solve(A, F[..., np.newaxis])[..., 0])
+            except np.linalg.LinAlgError as e:
+                raise InversionError(f'{str(type(e))}: {str(e)}')
+
+        return self.solution_space.from_numpy(np.vstack(solutions) if solutions else np.empty((0, dim)))
+
 
 class InstationaryModel(ModelBase):
     """Generic class for models of instationary problems.
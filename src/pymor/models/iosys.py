@@ -15,11 +15,29 @@ from pymor.operators.block import (BlockOperator, BlockRowOperator, BlockColumnO
                                    SecondOrderModelOperator)
 from pymor.operators.constructions import Concatenation, IdentityOperator, LincombOperator, ZeroOperator
 from pymor.operators.numpy import NumpyMatrixOperator
+from pymor.parallel.dummy import dummy_pool
+from pymor.parallel.manager import RemoteObjectManager
 from pymor.vectorarrays.block import BlockVectorSpace
 
 SPARSE_MIN_SIZE = 1000  # minimal sparse problem size for which to warn about converting to dense
 
 
+def _eval_batch(model, method, s, pool):
+    if pool is None or pool is dummy_pool:
+        values = [getattr(model, method)(si) for si in s]
+    else:
+        with RemoteObjectManager() as rom:
+            remote_model = rom.manage(pool.push(model))
+            values = pool.map(_eval, list(s), model=remote_model, method=method)
+    if not values:
+        return np.empty((0, model.output_dim, model.input_dim))
+    return np.stack(values)
+
+
+def _eval(s, model=None, method=None):
+    return getattr(model, method)(s)
+
+
 class InputOutputModel(ModelBase):
     """Base class for input-output systems."""
 
@@ -49,6 +67,44 @@ class InputOutputModel(ModelBase):
         """Evaluate the derivative of the transfer function."""
         raise NotImplementedError
 
+    def eval_tf_batch(self, s, pool=None):
+        """Evaluate the transfer function at several points.
+
+        Parameters
+        ----------
+        s
+            One-dimensional array-like of complex numbers.
+        pool
+            If not `None`, the |WorkerPool| on which the evaluations
+            are distributed.
+
+        Returns
+        -------
+        tfs
+            Transfer function values at the points in `s`,
+            |NumPy array| of shape `(len(s), self.output_dim, self.input_dim)`.
+        """
+        return _eval_batch(self, 'eval_tf', s, pool)
+
+    def eval_dtf_batch(self, s, pool=None):
+        """Evaluate the derivative of the transfer function at several points.
+
+        Parameters
+        ----------
+        s
+            One-dimensional array-like of complex numbers.
+        pool
+            If not `None`, the |WorkerPool| on which the evaluations
+            are distributed.
+
+        Returns
+        -------
+        dtfs
+            Derivatives of the transfer function at the points in `s`,
+            |NumPy array| of shape `(len(s), self.output_dim, self.input_dim)`.
+        """
+        return _eval_batch(self, 'eval_dtf', s, pool)
+
     @cached
     def bode(self, w):
         """Evaluate the transfer function on the imaginary axis.
@@ -68,7 +124,7 @@ class InputOutputModel(ModelBase):
         if not self.cont_time:
             raise NotImplementedError
 
-        return np.stack([self.eval_tf(1j * wi) for wi in w])
+        return self.eval_tf_batch(1j * np.asarray(w))
 
     def mag_plot(self, w, ax=None, ord=None, Hz=False, dB=False, **mpl_kwargs):
         """Draw the magnitude Bode plot.
@@ -642,6 +698,107 @@ class LTIModel(InputStateOutputModel):
                 C.as_source_array())))).to_numpy().conj()
         return dtfs
 
+    def eval_tf_batch(self, s, pool=None):
+        """Evaluate the transfer function at several points.
+
+        For models with dense |NumPy| matrices `A` and `E`, like reduced
+        models, the pencil `(A, E)` is reduced once to (generalized) Schur form,
+        such that each evaluation only requires the solution of a triangular
+        system. Otherwise, :meth:`eval_tf` is called for each point,
+        optionally in parallel on `pool`.
+
+        Parameters
+        ----------
+        s
+            One-dimensional array-like of complex numbers.
+        pool
+            If not `None`, the |WorkerPool| on which the evaluations
+            are distributed.
+
+        Returns
+        -------
+        tfs
+            Transfer function values at the points in `s`,
+            |NumPy array| of shape `(len(s), self.output_dim, self.input_dim)`.
+        """
+        if not self._has_dense_pencil():
+            return super().eval_tf_batch(s, pool=pool)
+
+        T, S, QhB, CZ = self._schur_form()
+        tfs = np.empty((len(s), self.output_dim, self.input_dim), dtype=complex)
+        for i, si in enumerate(s):
+            sSmT = si * S - T
+            if self.input_dim <= self.output_dim:
+                tfs[i] = CZ.dot(spla.solve_triangular(sSmT, QhB))
+            else:
+                tfs[i] = spla.solve_triangular(sSmT, CZ.conj().T, trans=2).conj().T.dot(QhB)
+        if not isinstance(self.D, ZeroOperator):
+            tfs += to_matrix(self.D, format='dense')
+        return tfs
+
+    def eval_dtf_batch(self, s, pool=None):
+        """Evaluate the derivative of the transfer function at several points.
+
+        See :meth:`eval_tf_batch`.
+
+        Parameters
+        ----------
+        s
+            One-dimensional array-like of complex numbers.
+        pool
+            If not `None`, the |WorkerPool| on which the evaluations
+            are distributed.
+
+        Returns
+        -------
+        dtfs
+            Derivatives of the transfer function at the points in `s`,
+            |NumPy array| of shape `(len(s), self.output_dim, self.input_dim)`.
+        """
+        if not self._has_dense_pencil():
+            return super().eval_dtf_batch(s, pool=pool)
+
+        T, S, QhB, CZ = self._schur_form()
+        dtfs = np.empty((len(s), self.output_dim, self.input_dim), dtype=complex)
+        for i, si in enumerate(s):
+            sSmT = si * S - T
+            if self.input_dim <= self.output_dim:
+                dtfs[i] = -CZ.dot(spla.solve_triangular(sSmT, S.dot(spla.solve_triangular(sSmT, QhB))))
+            else:
+                dtfs[i] = -spla.solve_triangular(sSmT, S.conj().T.dot(
+                    spla.solve_triangular(sSmT, CZ.conj().T, trans=2)), trans=2).conj().T.dot(QhB)
+        return dtfs
+
+    def _has_dense_pencil(self):
+        return (isinstance(self.A, NumpyMatrixOperator) and not self.A.sparse
+                and (isinstance(self.E, IdentityOperator)
+                     or isinstance(self.E, NumpyMatrixOperator) and not self.E.sparse))
+
+    @cached
+    def _schur_form(self):
+        """Compute the complex (generalized) Schur form of the pencil `(A, E)`.
+
+        Returns
+        -------
+        T, S
+            Upper triangular |NumPy arrays| with `A = Q T Z^H` and `E = Q S Z^H`
+            for unitary matrices `Q` and `Z`.
+        QhB
+            |NumPy array| `Q^H B`.
+        CZ
+            |NumPy array| `C Z`.
+        """
+        A = to_matrix(self.A, format='dense')
+        B = to_matrix(self.B, format='dense')
+        C = to_matrix(self.C, format='dense')
+        if isinstance(self.E, IdentityOperator):
+            T, Z = spla.schur(A, output='complex')
+            S = np.eye(self.order)
+            Q = Z
+        else:
+            T, S, Q, Z = spla.qz(A, to_matrix(self.E, format='dense'), output='complex')
+        return T, S, Q.conj().T.dot(B), C.dot(Z)
+
     @cached
     def gramian(self, typ):
         """Compute a Gramian.
@@ -4,6 +4,8 @@
 
 """ This module provides some operators for continuous finite element discretizations."""
 
+from weakref import WeakKeyDictionary
+
 import numpy as np
 from scipy.sparse import coo_matrix, csc_matrix
 
@@ -13,6 +15,83 @@ from pymor.operators.numpy import NumpyMatrixBasedOperator
 from pymor.vectorarrays.numpy import NumpyVectorSpace
 
 
+_sparsity_patterns = WeakKeyDictionary()
+
+
+def _assemble_system_matrix(g, bi, SF_INTS, clear_rows, clear_columns, clear_diag):
+    """Assemble global system matrix from local element matrices.
+
+    The sparsity pattern of the matrix and the permutation mapping the
+    local matrix entries to the entries of the CSC data array only depend on
+    `g`, `bi` and the Dirichlet treatment. They are computed once and stored,
+    such that subsequent assemblies (e.g. for different |Parameters|) only need
+    to sum up the local entries.
+
+    Parameters
+    ----------
+    g
+        The |Grid|.
+    bi
+        The |BoundaryInfo|.
+    SF_INTS
+        Flattened array of the local matrix entries of all elements.
+    clear_rows, clear_columns, clear_diag
+        Dirichlet treatment as described for :class:`L2ProductP1`.
+
+    Returns
+    -------
+    The system matrix as |SciPy spmatrix| in CSC format.
+    """
+    key = (bi.uid, clear_rows, clear_columns, clear_diag)
+    patterns = _sparsity_patterns.setdefault(g, {})
+    if key not in patterns:
+        patterns[key] = _sparsity_pattern(g, bi, clear_rows, clear_columns, clear_diag)
+    shape, indices, indptr, permutation, mask, num_diag = patterns[key]
+
+    if mask is not None:
+        SF_INTS = np.where(mask, 0, SF_INTS)
+    if num_diag:
+        SF_INTS = np.hstack((SF_INTS, np.ones(num_diag)))
+    if np.iscomplexobj(SF_INTS):
+        data = (np.bincount(permutation, weights=SF_INTS.real, minlength=len(indices))
+                + 1j * np.bincount(permutation, weights=SF_INTS.imag, minlength=len(indices)))
+    else:
+        data = np.bincount(permutation, weights=SF_INTS, minlength=len(indices))
+
+    return csc_matrix((data, indices.copy(), indptr.copy()), shape=shape)
+
+
+def _sparsity_pattern(g, bi, clear_rows, clear_columns, clear_diag):
+    n = g.size(g.dim)
+    nodes = g.subentities(0, g.dim)
+    SF_I0 = np.repeat(nodes, nodes.shape[1], axis=1).ravel()
+    SF_I1 = np.tile(nodes, [1, nodes.shape[1]]).ravel()
+
+    mask, num_diag = None, 0
+    if bi.has_dirichlet and (clear_rows or clear_columns):
+        dirichlet_mask = bi.dirichlet_mask(g.dim)
+        mask = np.zeros(len(SF_I0), dtype=bool)
+        if clear_rows:
+            mask |= dirichlet_mask[SF_I0]
+        if clear_columns:
+            mask |= dirichlet_mask[SF_I1]
+        if not clear_diag:
+            dirichlet_dofs = bi.dirichlet_boundaries(g.dim)
+            num_diag = dirichlet_dofs.size
+            SF_I0 = np.hstack((SF_I0, dirichlet_dofs))
+            SF_I1 = np.hstack((SF_I1, dirichlet_dofs))
+
+    # entries are ordered by column, then row index in CSC format
+    keys, permutation = np.unique(SF_I1.astype(np.int64) * n + SF_I0, return_inverse=True)
+    index_dtype = np.int32 if len(SF_I0) < np.iinfo(np.int32).max else np.int64
+    indices = (keys % n).astype(index_dtype)
+    indptr = np.zeros(n + 1, dtype=index_dtype)
+    np.cumsum(np.bincount(keys // n, minlength=n), out=indptr[1:])
+    permutation = permutation.astype(index_dtype)
+
+    return (n, n), indices, indptr, permutation, mask, num_diag
+
+
 def CGVectorSpace(grid, id_='STATE'):
     return NumpyVectorSpace(grid.size(grid.dim), id_)
 
@@ -399,25 +478,9 @@ class L2ProductP1(NumpyMatrixBasedOperator):
 
         del SFQ
 
-        self.logger.info('Determine global dofs ...')
-        SF_I0 = np.repeat(g.subentities(0, g.dim), g.dim + 1, axis=1).ravel()
-        SF_I1 = np.tile(g.subentities(0, g.dim), [1, g.dim + 1]).ravel()
-
-        self.logger.info('Boundary treatment ...')
-        if bi.has_dirichlet:
-            if self.dirichlet_clear_rows:
-                SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I0], 0, SF_INTS)
-            if self.dirichlet_clear_columns:
-                SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I1], 0, SF_INTS)
-            if not self.dirichlet_clear_diag and (self.dirichlet_clear_rows or self.dirichlet_clear_columns):
-                SF_INTS = np.hstack((SF_INTS, np.ones(bi.dirichlet_boundaries(g.dim).size)))
-                SF_I0 = np.hstack((SF_I0, bi.dirichlet_boundaries(g.dim)))
-                SF_I1 = np.hstack((SF_I1, bi.dirichlet_boundaries(g.dim)))
-
         self.logger.info('Assemble system matrix ...')
-        A = coo_matrix((SF_INTS, (SF_I0, SF_I1)), shape=(g.size(g.dim), g.size(g.dim)))
-        del SF_INTS, SF_I0, SF_I1
-        A = csc_matrix(A).copy()  # See DiffusionOperatorP1 for why copy() is necessary
+        A = _assemble_system_matrix(g, bi, SF_INTS, self.dirichlet_clear_rows, self.dirichlet_clear_columns,
+                                    self.dirichlet_clear_diag)
 
         return A
 
@@ -495,25 +558,9 @@ class L2ProductQ1(NumpyMatrixBasedOperator):
 
         del SFQ
 
-        self.logger.info('Determine global dofs ...')
-        SF_I0 = np.repeat(g.subentities(0, g.dim), 4, axis=1).ravel()
-        SF_I1 = np.tile(g.subentities(0, g.dim), [1, 4]).ravel()
-
-        self.logger.info('Boundary treatment ...')
-        if bi.has_dirichlet:
-            if self.dirichlet_clear_rows:
-                SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I0], 0, SF_INTS)
-            if self.dirichlet_clear_columns:
-                SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I1], 0, SF_INTS)
-            if not self.dirichlet_clear_diag and (self.dirichlet_clear_rows or self.dirichlet_clear_columns):
-                SF_INTS = np.hstack((SF_INTS, np.ones(bi.dirichlet_boundaries(g.dim).size)))
-                SF_I0 = np.hstack((SF_I0, bi.dirichlet_boundaries(g.dim)))
-                SF_I1 = np.hstack((SF_I1, bi.dirichlet_boundaries(g.dim)))
-
         self.logger.info('Assemble system matrix ...')
-        A = coo_matrix((SF_INTS, (SF_I0, SF_I1)), shape=(g.size(g.dim), g.size(g.dim)))
-        del SF_INTS, SF_I0, SF_I1
-        A = csc_matrix(A).copy()  # See DiffusionOperatorP1 for why copy() is necessary
+        A = _assemble_system_matrix(g, bi, SF_INTS, self.dirichlet_clear_rows, self.dirichlet_clear_columns,
+                                    self.dirichlet_clear_diag)
 
         return A
 
@@ -610,31 +657,8 @@ class DiffusionOperatorP1(NumpyMatrixBasedOperator):
         if self.diffusion_constant is not None:
             SF_INTS *= self.diffusion_constant
 
-        self.logger.info('Determine global dofs ...')
-        SF_I0 = np.repeat(g.subentities(0, g.dim), g.dim + 1, axis=1).ravel()
-        SF_I1 = np.tile(g.subentities(0, g.dim), [1, g.dim + 1]).ravel()
-
-        self.logger.info('Boundary treatment ...')
-        if bi.has_dirichlet:
-            SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I0], 0, SF_INTS)
-            if self.dirichlet_clear_columns:
-                SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I1], 0, SF_INTS)
-
-            if not self.dirichlet_clear_diag:
-                SF_INTS = np.hstack((SF_INTS, np.ones(bi.dirichlet_boundaries(g.dim).size)))
-                SF_I0 = np.hstack((SF_I0, bi.dirichlet_boundaries(g.dim)))
-                SF_I1 = np.hstack((SF_I1, bi.dirichlet_boundaries(g.dim)))
-
         self.logger.info('Assemble system matrix ...')
-        A = coo_matrix((SF_INTS, (SF_I0, SF_I1)), shape=(g.size(g.dim), g.size(g.dim)))
-        del SF_INTS, SF_I0, SF_I1
-        A = csc_matrix(A).copy()
-
-        # The call to copy() is necessary to resize the data arrays of the sparse matrix:
-        # During the conversion to crs_matrix, entries corresponding with the same
-        # coordinates are summed up, resulting in shorter data arrays. The shortening
-        # is implemented by calling self.prune() which creates the view self.data[:self.nnz].
-        # Thus, the original data array is not deleted and all memory stays allocated.
+        A = _assemble_system_matrix(g, bi, SF_INTS, True, self.dirichlet_clear_columns, self.dirichlet_clear_diag)
 
         return A
 
@@ -730,32 +754,8 @@ class DiffusionOperatorQ1(NumpyMatrixBasedOperator):
         if self.diffusion_constant is not None:
             SF_INTS *= self.diffusion_constant
 
-        self.logger.info('Determine global dofs ...')
-
-        SF_I0 = np.repeat(g.subentities(0, g.dim), 4, axis=1).ravel()
-        SF_I1 = np.tile(g.subentities(0, g.dim), [1, 4]).ravel()
-
-        self.logger.info('Boundary treatment ...')
-        if bi.has_dirichlet:
-            SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I0], 0, SF_INTS)
-            if self.dirichlet_clear_columns:
-                SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I1], 0, SF_INTS)
-
-            if not self.dirichlet_clear_diag:
-                SF_INTS = np.hstack((SF_INTS, np.ones(bi.dirichlet_boundaries(g.dim).size)))
-                SF_I0 = np.hstack((SF_I0, bi.dirichlet_boundaries(g.dim)))
-                SF_I1 = np.hstack((SF_I1, bi.dirichlet_boundaries(g.dim)))
-
         self.logger.info('Assemble system matrix ...')
-        A = coo_matrix((SF_INTS, (SF_I0, SF_I1)), shape=(g.size(g.dim), g.size(g.dim)))
-        del SF_INTS, SF_I0, SF_I1
-        A = csc_matrix(A).copy()
-
-        # The call to copy() is necessary to resize the data arrays of the sparse matrix:
-        # During the conversion to crs_matrix, entries corresponding with the same
-        # coordinates are summed up, resulting in shorter data arrays. The shortening
-        # is implemented by calling self.prune() which creates the view self.data[:self.nnz].
-        # Thus, the original data array is not deleted and all memory stays allocated.
+        A = _assemble_system_matrix(g, bi, SF_INTS, True, self.dirichlet_clear_columns, self.dirichlet_clear_diag)
 
         return A
 
@@ -849,31 +849,8 @@ class AdvectionOperatorP1(NumpyMatrixBasedOperator):
         if self.advection_constant is not None:
             SF_INTS *= self.advection_constant
 
-        self.logger.info('Determine global dofs ...')
-        SF_I0 = np.repeat(g.subentities(0, g.dim), g.dim + 1, axis=1).ravel()
-        SF_I1 = np.tile(g.subentities(0, g.dim), [1, g.dim + 1]).ravel()
-
-        self.logger.info('Boundary treatment ...')
-        if bi.has_dirichlet:
-            SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I0], 0, SF_INTS)
-            if self.dirichlet_clear_columns:
-                SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I1], 0, SF_INTS)
-
-            if not self.dirichlet_clear_diag:
-                SF_INTS = np.hstack((SF_INTS, np.ones(bi.dirichlet_boundaries(g.dim).size)))
-                SF_I0 = np.hstack((SF_I0, bi.dirichlet_boundaries(g.dim)))
-                SF_I1 = np.hstack((SF_I1, bi.dirichlet_boundaries(g.dim)))
-
         self.logger.info('Assemble system matrix ...')
-        A = coo_matrix((SF_INTS, (SF_I0, SF_I1)), shape=(g.size(g.dim), g.size(g.dim)))
-        del SF_INTS, SF_I0, SF_I1
-        A = csc_matrix(A).copy()
-
-        # The call to copy() is necessary to resize the data arrays of the sparse matrix:
-        # During the conversion to crs_matrix, entries corresponding with the same
-        # coordinates are summed up, resulting in shorter data arrays. The shortening
-        # is implemented by calling self.prune() which creates the view self.data[:self.nnz].
-        # Thus, the original data array is not deleted and all memory stays allocated.
+        A = _assemble_system_matrix(g, bi, SF_INTS, True, self.dirichlet_clear_columns, self.dirichlet_clear_diag)
 
         return A
 
@@ -969,32 +946,8 @@ class AdvectionOperatorQ1(NumpyMatrixBasedOperator):
         if self.advection_constant is not None:
             SF_INTS *= self.advection_constant
 
-        self.logger.info('Determine global dofs ...')
-
-        SF_I0 = np.repeat(g.subentities(0, g.dim), 4, axis=1).ravel()
-        SF_I1 = np.tile(g.subentities(0, g.dim), [1, 4]).ravel()
-
-        self.logger.info('Boundary treatment ...')
-        if bi.has_dirichlet:
-            SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I0], 0, SF_INTS)
-            if self.dirichlet_clear_columns:
-                SF_INTS = np.where(bi.dirichlet_mask(g.dim)[SF_I1], 0, SF_INTS)
-
-            if not self.dirichlet_clear_diag:
-                SF_INTS = np.hstack((SF_INTS, np.ones(bi.dirichlet_boundaries(g.dim).size)))
-                SF_I0 = np.hstack((SF_I0, bi.dirichlet_boundaries(g.dim)))
-                SF_I1 = np.hstack((SF_I1, bi.dirichlet_boundaries(g.dim)))
-
         self.logger.info('Assemble system matrix ...')
-        A = coo_matrix((SF_INTS, (SF_I0, SF_I1)), shape=(g.size(g.dim), g.size(g.dim)))
-        del SF_INTS, SF_I0, SF_I1
-        A = csc_matrix(A).copy()
-
-        # The call to copy() is necessary to resize the data arrays of the sparse matrix:
-        # During the conversion to crs_matrix, entries corresponding with the same
-        # coordinates are summed up, resulting in shorter data arrays. The shortening
-        # is implemented by calling self.prune() which creates the view self.data[:self.nnz].
-        # Thus, the original data array is not deleted and all memory stays allocated.
+        A = _assemble_system_matrix(g, bi, SF_INTS, True, self.dirichlet_clear_columns, self.dirichlet_clear_diag)
 
         return A
 
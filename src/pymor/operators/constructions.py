@@ -79,6 +79,23 @@ class LincombOperator(OperatorBase):
         mu = self.parse_parameter(mu)
         return [c.evaluate(mu) if hasattr(c, 'evaluate') else c for c in self.coefficients]
 
+    def evaluate_coefficients_many(self, mus):
+        """Compute the linear coefficients for several |Parameters|.
+
+        Parameters
+        ----------
+        mus
+            |ParameterArray| or list of |Parameters| for which to compute the
+            linear coefficients.
+
+        Returns
+        -------
+        |NumPy array| of shape `(len(mus), len(self.operators))`.
+        """
+        mus = self.parse_parameter_array(mus)
+        return np.array([c.evaluate_many(mus) if hasattr(c, 'evaluate_many') else np.full(len(mus), c)
+                         for c in self.coefficients]).T
+
     def apply(self, U, mu=None):
         coeffs = self.evaluate_coefficients(mu)
         R = self.operators[0].apply(U, mu=mu)
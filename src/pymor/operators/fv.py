@@ -5,7 +5,7 @@
 """ This module provides some operators for finite volume discretizations."""
 
 import numpy as np
-from scipy.sparse import coo_matrix, csc_matrix, dia_matrix
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, dia_matrix
 
 from pymor.core.defaults import defaults
 from pymor.core.interfaces import ImmutableInterface, abstractmethod
@@ -17,7 +17,6 @@ from pymor.operators.basic import OperatorBase
 from pymor.operators.constructions import ComponentProjection
 from pymor.operators.numpy import NumpyMatrixBasedOperator, NumpyMatrixOperator
 from pymor.parameters.base import Parametric
-from pymor.tools.inplace import iadd_masked, isub_masked
 from pymor.tools.quadratures import GaussQuadratures
 from pymor.vectorarrays.numpy import NumpyVectorSpace
 
@@ -51,8 +50,21 @@ class NumericalConvectiveFluxInterface(ImmutableInterface, Parametric):
 
          `evaluate_stage2` returns a |NumPy array| of the flux evaluations
          for each edge.
+
+    To evaluate the fluxes for several vectors at once, the values of all
+    vectors are passed to `evaluate_stage1` as a single one-dimensional array
+    and `evaluate_stage2` receives the edge data, normals and volumes
+    of all vectors stacked along the first axis.
+
+    If `has_derivative` is `True`, the derivatives of the flux w.r.t.
+    `U_inner` and `U_outer` can be evaluated in the same two-stage manner
+    via `evaluate_derivative_stage1` and `evaluate_derivative_stage2`, where
+    the latter returns a tuple of |NumPy arrays| containing the derivatives
+    w.r.t. `U_inner` and `U_outer` for each edge.
     """
 
+    has_derivative = False
+
     @abstractmethod
     def evaluate_stage1(self, U, mu=None):
         pass
@@ -61,6 +73,12 @@ class NumericalConvectiveFluxInterface(ImmutableInterface, Parametric):
     def evaluate_stage2(self, stage1_data, unit_outer_normals, volumes, mu=None):
         pass
 
+    def evaluate_derivative_stage1(self, U, mu=None):
+        raise NotImplementedError
+
+    def evaluate_derivative_stage2(self, stage1_data, unit_outer_normals, volumes, mu=None):
+        raise NotImplementedError
+
 
 class LaxFriedrichsFlux(NumericalConvectiveFluxInterface):
     """Lax-Friedrichs numerical flux.
@@ -107,6 +125,8 @@ class SimplifiedEngquistOsherFlux(NumericalConvectiveFluxInterface):
         |Function| defining the analytical flux derivative `f'`.
     """
 
+    has_derivative = True
+
     def __init__(self, flux, flux_derivative):
         self.flux = flux
         self.flux_derivative = flux_derivative
@@ -126,6 +146,13 @@ class SimplifiedEngquistOsherFlux(NumericalConvectiveFluxInterface):
         F_edge *= volumes
         return F_edge
 
+    def evaluate_derivative_stage1(self, U, mu=None):
+        return [self.flux_derivative(U[..., np.newaxis], mu)]
+
+    def evaluate_derivative_stage2(self, stage1_data, unit_outer_normals, volumes, mu=None):
+        F_d_edge = np.sum(stage1_data[0] * unit_outer_normals[:, np.newaxis, :], axis=2)
+        return np.maximum(F_d_edge[:, 0], 0) * volumes, np.minimum(F_d_edge[:, 1], 0) * volumes
+
 
 class EngquistOsherFlux(NumericalConvectiveFluxInterface):
     """Engquist-Osher numerical flux.
@@ -156,6 +183,8 @@ class EngquistOsherFlux(NumericalConvectiveFluxInterface):
         Number of subintervals to be used for integration.
     """
 
+    has_derivative = True
+
     def __init__(self, flux, flux_derivative, gausspoints=5, intervals=1):
         self.flux = flux
         self.flux_derivative = flux_derivative
@@ -184,12 +213,24 @@ class EngquistOsherFlux(NumericalConvectiveFluxInterface):
         Fs *= volumes
         return Fs
 
+    def evaluate_derivative_stage1(self, U, mu=None):
+        return [self.flux_derivative(U[..., np.newaxis], mu)]
+
+    def evaluate_derivative_stage2(self, stage1_data, unit_outer_normals, volumes, mu=None):
+        F_d_edge = np.sum(stage1_data[0] * unit_outer_normals[:, np.newaxis, :], axis=2)
+        return np.maximum(F_d_edge[:, 0], 0) * volumes, np.minimum(F_d_edge[:, 1], 0) * volumes
+
 
 @defaults('delta')
 def jacobian_options(delta=1e-7):
     return {'delta': delta}
 
 
+@defaults('chunk_size')
+def apply_options(chunk_size=2**22):
+    return {'chunk_size': chunk_size}
+
+
 class NonlinearAdvectionOperator(OperatorBase):
     """Nonlinear finite volume advection |Operator|.
 
@@ -273,6 +314,28 @@ class NonlinearAdvectionOperator(OperatorBase):
                                NEUMANN_BOUNDARIES=bi.neumann_boundaries(1) if bi.has_neumann else None)
         self._grid_data.update(UNIT_OUTER_NORMALS=g.unit_outer_normals()[self._grid_data['SUPE'][:, 0],
                                                                          self._grid_data['SUPI'][:, 0]])
+        SUPE = self._grid_data['SUPE']
+        BOUNDARIES = self._grid_data['BOUNDARIES']
+        INNER = np.setdiff1d(np.arange(g.size(1)), BOUNDARIES)
+        self._grid_data.update(INNER=INNER)
+
+        # codim-0/codim-1 incidence matrix mapping the numerical fluxes to the cell residuals
+        self._grid_data.update(INCIDENCE=csr_matrix(
+            (np.hstack([np.ones(len(SUPE)), -np.ones(len(INNER))]),
+             (np.hstack([SUPE[:, 0], SUPE[INNER, 1]]), np.hstack([np.arange(len(SUPE)), INNER]))),
+            shape=(g.size(0), len(SUPE))
+        ))
+
+        # sparsity pattern of the jacobian: for the entries of the value vector assembled
+        # in `jacobian`, compute the corresponding positions in the data array of the
+        # final CSC matrix
+        n = g.size(0)
+        I0 = np.hstack([SUPE[INNER, 0], SUPE[INNER, 1], SUPE[INNER, 0], SUPE[INNER, 1], SUPE[BOUNDARIES, 0]])
+        I1 = np.hstack([SUPE[INNER, 0], SUPE[INNER, 0], SUPE[INNER, 1], SUPE[INNER, 1], SUPE[BOUNDARIES, 0]])
+        keys, data_indices = np.unique(I1.astype(np.int64) * n + I0, return_inverse=True)
+        indices = (keys % n).astype(np.int32)
+        indptr = np.hstack([[0], np.cumsum(np.bincount(keys // n, minlength=n))]).astype(np.int32)
+        self._grid_data.update(JACOBIAN_PATTERN=(indices, indptr, data_indices, 1. / self._grid_data['VOLS0'][I0]))
 
     def apply(self, U, mu=None):
         assert U in self.source
@@ -294,6 +357,7 @@ class NonlinearAdvectionOperator(OperatorBase):
         DIRICHLET_BOUNDARIES = gd['DIRICHLET_BOUNDARIES']
         NEUMANN_BOUNDARIES = gd['NEUMANN_BOUNDARIES']
         UNIT_OUTER_NORMALS = gd['UNIT_OUTER_NORMALS']
+        INCIDENCE = gd['INCIDENCE']
 
         if bi.has_dirichlet:
             if hasattr(self, '_dirichlet_values'):
@@ -304,26 +368,34 @@ class NonlinearAdvectionOperator(OperatorBase):
                 dirichlet_values = np.zeros_like(DIRICHLET_BOUNDARIES)
             F_dirichlet = self.numerical_flux.evaluate_stage1(dirichlet_values, mu)
 
-        for i, j in enumerate(range(len(U))):
-            Ui = U[j]
-            Ri = R[i]
+        # evaluate the fluxes for chunks of vectors at once; `chunk_size` bounds the number of
+        # edge evaluations per chunk and thus the memory used for the edge data (the default of
+        # 2**22 amounts to 32 MiB per float64 array of edge data)
+        chunk_size = max(1, apply_options()['chunk_size'] // len(SUPE))
+        for start in range(0, len(U), chunk_size):
+            Uc = U[start:start + chunk_size]
+            count = len(Uc)
 
-            F = self.numerical_flux.evaluate_stage1(Ui, mu)
-            F_edge = [f[SUPE] for f in F]
+            F = self.numerical_flux.evaluate_stage1(Uc.ravel(), mu)
+            F_edge = [f.reshape(Uc.shape + f.shape[1:])[:, SUPE] for f in F]
 
             for f in F_edge:
-                f[BOUNDARIES, 1] = f[BOUNDARIES, 0]
+                f[:, BOUNDARIES, 1] = f[:, BOUNDARIES, 0]
             if bi.has_dirichlet:
                 for f, f_d in zip(F_edge, F_dirichlet):
-                    f[DIRICHLET_BOUNDARIES, 1] = f_d
+                    f[:, DIRICHLET_BOUNDARIES, 1] = f_d
+            F_edge = [f.reshape((-1,) + f.shape[2:]) for f in F_edge]
 
-            NUM_FLUX = self.numerical_flux.evaluate_stage2(F_edge, UNIT_OUTER_NORMALS, VOLS1, mu)
+            NUM_FLUX = self.numerical_flux.evaluate_stage2(F_edge,
+                                                           np.tile(UNIT_OUTER_NORMALS, (count, 1)),
+                                                           np.tile(VOLS1, count),
+                                                           mu)
+            NUM_FLUX = NUM_FLUX.reshape((count, -1))
 
             if bi.has_neumann:
-                NUM_FLUX[NEUMANN_BOUNDARIES] = 0
+                NUM_FLUX[:, NEUMANN_BOUNDARIES] = 0
 
-            iadd_masked(Ri, NUM_FLUX, SUPE[:, 0])
-            isub_masked(Ri, NUM_FLUX, SUPE[:, 1])
+            R[start:start + count] = (INCIDENCE @ NUM_FLUX.T).T
 
         R /= VOLS0
 
@@ -342,19 +414,14 @@ class NonlinearAdvectionOperator(OperatorBase):
         bi = self.boundary_info
         gd = self._grid_data
         SUPE = gd['SUPE']
-        VOLS0 = gd['VOLS0']
         VOLS1 = gd['VOLS1']
         BOUNDARIES = gd['BOUNDARIES']
         CENTERS = gd['CENTERS']
         DIRICHLET_BOUNDARIES = gd['DIRICHLET_BOUNDARIES']
         NEUMANN_BOUNDARIES = gd['NEUMANN_BOUNDARIES']
         UNIT_OUTER_NORMALS = gd['UNIT_OUTER_NORMALS']
-        INNER = np.setdiff1d(np.arange(g.size(1)), BOUNDARIES)
-
-        solver_options = self.solver_options
-        delta = solver_options.get('jacobian_delta') if solver_options else None
-        if delta is None:
-            delta = jacobian_options()['delta']
+        INNER = gd['INNER']
+        JACOBIAN_INDICES, JACOBIAN_INDPTR, JACOBIAN_DATA_INDICES, JACOBIAN_SCALING = gd['JACOBIAN_PATTERN']
 
         if bi.has_dirichlet:
             if hasattr(self, '_dirichlet_values'):
@@ -363,6 +430,58 @@ class NonlinearAdvectionOperator(OperatorBase):
                 dirichlet_values = self.dirichlet_data(CENTERS[DIRICHLET_BOUNDARIES], mu=mu)
             else:
                 dirichlet_values = np.zeros_like(DIRICHLET_BOUNDARIES)
+
+        if self.numerical_flux.has_derivative:
+            DF = self.numerical_flux.evaluate_derivative_stage1(U, mu)
+            DF_edge = [f[SUPE] for f in DF]
+            del DF
+            for f in DF_edge:
+                f[BOUNDARIES, 1] = f[BOUNDARIES, 0]
+            if bi.has_dirichlet:
+                DF_dirichlet = self.numerical_flux.evaluate_derivative_stage1(dirichlet_values, mu)
+                for f, f_d in zip(DF_edge, DF_dirichlet):
+                    f[DIRICHLET_BOUNDARIES, 1] = f_d
+            D_NUM_FLUX_0, D_NUM_FLUX_1 = self.numerical_flux.evaluate_derivative_stage2(DF_edge, UNIT_OUTER_NORMALS,
+                                                                                        VOLS1, mu)
+            del DF_edge
+            # on non-Dirichlet boundaries the outer value is the inner value
+            if bi.has_dirichlet:
+                NON_DIRICHLET_BOUNDARIES = np.setdiff1d(BOUNDARIES, DIRICHLET_BOUNDARIES)
+            else:
+                NON_DIRICHLET_BOUNDARIES = BOUNDARIES
+            D_NUM_FLUX_0[NON_DIRICHLET_BOUNDARIES] += D_NUM_FLUX_1[NON_DIRICHLET_BOUNDARIES]
+            if bi.has_neumann:
+                D_NUM_FLUX_0[NEUMANN_BOUNDARIES] = 0
+                D_NUM_FLUX_1[NEUMANN_BOUNDARIES] = 0
+        else:
+            D_NUM_FLUX_0, D_NUM_FLUX_1 = self._finite_difference_flux_derivatives(
+                U, dirichlet_values if bi.has_dirichlet else None, mu
+            )
+
+        V = np.hstack([D_NUM_FLUX_0[INNER], -D_NUM_FLUX_0[INNER], D_NUM_FLUX_1[INNER], -D_NUM_FLUX_1[INNER],
+                       D_NUM_FLUX_0[BOUNDARIES]])
+        V *= JACOBIAN_SCALING
+        data = np.bincount(JACOBIAN_DATA_INDICES, weights=V, minlength=len(JACOBIAN_INDICES))
+        A = csc_matrix((data, JACOBIAN_INDICES, JACOBIAN_INDPTR), shape=(g.size(0),) * 2)
+
+        return NumpyMatrixOperator(A, source_id=self.source.id, range_id=self.range.id)
+
+    def _finite_difference_flux_derivatives(self, U, dirichlet_values, mu):
+        bi = self.boundary_info
+        gd = self._grid_data
+        SUPE = gd['SUPE']
+        VOLS1 = gd['VOLS1']
+        BOUNDARIES = gd['BOUNDARIES']
+        DIRICHLET_BOUNDARIES = gd['DIRICHLET_BOUNDARIES']
+        NEUMANN_BOUNDARIES = gd['NEUMANN_BOUNDARIES']
+        UNIT_OUTER_NORMALS = gd['UNIT_OUTER_NORMALS']
+
+        solver_options = self.solver_options
+        delta = solver_options.get('jacobian_delta') if solver_options else None
+        if delta is None:
+            delta = jacobian_options()['delta']
+
+        if bi.has_dirichlet:
             F_dirichlet = self.numerical_flux.evaluate_stage1(dirichlet_values, mu)
 
         UP = U + delta
@@ -428,16 +547,7 @@ class NonlinearAdvectionOperator(OperatorBase):
             D_NUM_FLUX_1[NEUMANN_BOUNDARIES] = 0
         del NUM_FLUX_1P, NUM_FLUX_1M
 
-        I1 = np.hstack([SUPE[INNER, 0], SUPE[INNER, 0], SUPE[INNER, 1], SUPE[INNER, 1], SUPE[BOUNDARIES, 0]])
-        I0 = np.hstack([SUPE[INNER, 0], SUPE[INNER, 1], SUPE[INNER, 0], SUPE[INNER, 1], SUPE[BOUNDARIES, 0]])
-        V = np.hstack([D_NUM_FLUX_0[INNER], -D_NUM_FLUX_0[INNER], D_NUM_FLUX_1[INNER], -D_NUM_FLUX_1[INNER],
-                       D_NUM_FLUX_0[BOUNDARIES]])
-
-        A = coo_matrix((V, (I0, I1)), shape=(g.size(0), g.size(0)))
-        A = csc_matrix(A).copy()   # See pymor.operators.cg.DiffusionOperatorP1 for why copy() is necessary
-        A = dia_matrix(([1. / VOLS0], [0]), shape=(g.size(0),) * 2) * A
-
-        return NumpyMatrixOperator(A, source_id=self.source.id, range_id=self.range.id)
+        return D_NUM_FLUX_0, D_NUM_FLUX_1
 
 
 def nonlinear_advection_lax_friedrichs_operator(grid, boundary_info, flux, lxf_lambda=1.0,
@@ -12,9 +12,11 @@
 """
 
 from functools import reduce
+import warnings
 
 import numpy as np
 import scipy.sparse
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, lu_factor, lu_solve
 from scipy.sparse import issparse
 from scipy.io import mmwrite, savemat
 
@@ -97,6 +99,44 @@ class NumpyGenericOperator(OperatorBase):
             return self.source.make_array(self._adjoint_mapping(V))
 
 
+def _union_sparsity_pattern(operators, shape, format):
+    """Union of the sparsity patterns of the matrices of `operators`.
+
+    Returns `(indices, indptr, values)` where `indices` and `indptr` describe the
+    union pattern in the given sparse `format` (`'csr'` or `'csc'`) and `values` is a
+    sparse matrix of shape `(nnz, len(operators))` containing the entries of each matrix.
+    The matrix of a linear combination with coefficients `c` thus has `values.dot(c)`
+    as data array.
+    """
+    n_major, n_minor = shape if format == 'csr' else shape[::-1]
+    keys, terms, data = [], [], []
+    for i, op in enumerate(operators):
+        if isinstance(op, ZeroOperator):
+            continue
+        elif isinstance(op, IdentityOperator):
+            matrix = scipy.sparse.eye(shape[0], format='coo')
+        else:
+            matrix = op.matrix.tocoo()
+        # like the sum of scipy.sparse matrices, ignore explicitly stored zeros
+        nonzero = matrix.data != 0
+        major, minor = (matrix.row, matrix.col) if format == 'csr' else (matrix.col, matrix.row)
+        keys.append(major[nonzero].astype(np.int64) * n_minor + minor[nonzero])
+        terms.append(np.full(len(keys[-1]), i))
+        data.append(matrix.data[nonzero])
+    union, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+
+    # most matrix entries only appear in few terms, so values is stored as a sparse matrix
+    # (duplicate entries are summed up by scipy.sparse)
+    values = scipy.sparse.csr_matrix((np.concatenate(data), (inverse, np.concatenate(terms))),
+                                     shape=(len(union), len(operators)))
+
+    index_dtype = np.int32 if max(n_minor, len(union)) < np.iinfo(np.int32).max else np.int64
+    indices = (union % n_minor).astype(index_dtype)
+    indptr = np.zeros(n_major + 1, dtype=index_dtype)
+    np.cumsum(np.bincount(union // n_minor, minlength=n_major), out=indptr[1:])
+    return indices, indptr, values
+
+
 class NumpyMatrixBasedOperator(OperatorBase):
     """Base class for operators which assemble into a |NumpyMatrixOperator|.
 
@@ -242,9 +282,9 @@ class NumpyMatrixOperator(NumpyMatrixBasedOperator):
         assert V in self.range
         return self.H.apply(V, mu=mu)
 
-    @defaults('check_finite', 'default_sparse_solver_backend')
+    @defaults('check_finite', 'default_sparse_solver_backend', 'dense_keep_factorization')
     def apply_inverse(self, V, mu=None, least_squares=False, check_finite=True,
-                      default_sparse_solver_backend='scipy'):
+                      default_sparse_solver_backend='scipy', dense_keep_factorization=True):
         """Apply the inverse operator.
 
         Parameters
@@ -269,6 +309,10 @@ class NumpyMatrixOperator(NumpyMatrixBasedOperator):
             Test if solution only contains finite values.
         default_sparse_solver_backend
             Default sparse solver backend to use (scipy, pyamg, generic).
+        dense_keep_factorization
+            If `True` and the matrix is dense, compute an LU decomposition
+            (or a Cholesky decomposition if the matrix is Hermitian positive
+            definite) on first use and keep it for subsequent solves.
 
         Returns
         -------
@@ -319,6 +363,8 @@ class NumpyMatrixOperator(NumpyMatrixBasedOperator):
                 except np.linalg.LinAlgError as e:
                     raise InversionError(f'{str(type(e))}: {str(e)}')
                 R = R.T
+            elif dense_keep_factorization:
+                R = self._solve_dense(V.to_numpy().T).T
             else:
                 try:
                     R = np.linalg.solve(self.matrix, V.to_numpy().T).T
@@ -331,8 +377,47 @@ class NumpyMatrixOperator(NumpyMatrixBasedOperator):
 
             return self.source.make_array(R)
 
-    def apply_inverse_adjoint(self, U, mu=None, least_squares=False):
-        return self.H.apply_inverse(U, mu=mu, least_squares=least_squares)
+    @defaults('check_finite', 'dense_keep_factorization')
+    def apply_inverse_adjoint(self, U, mu=None, least_squares=False, check_finite=True,
+                              dense_keep_factorization=True):
+        if self.sparse or least_squares or not dense_keep_factorization or self.source.dim == 0:
+            return self.H.apply_inverse(U, mu=mu, least_squares=least_squares)
+        assert U in self.source
+        R = self._solve_dense(U.to_numpy().T, adjoint=True).T
+        if check_finite:
+            if not np.isfinite(np.sum(R)):
+                raise InversionError('Result contains non-finite values')
+        return self.range.make_array(R)
+
+    def _solve_dense(self, V, adjoint=False):
+        factorization = getattr(self, '_factorization', None)
+        if factorization is None:
+            self._factorization = factorization = self._factorize_dense()
+        kind, factors = factorization
+        if kind == 'cholesky':
+            return cho_solve(factors, V, check_finite=False)  # the matrix is Hermitian
+        else:
+            return lu_solve(factors, V, trans=2 if adjoint else 0, check_finite=False)
+
+    def _factorize_dense(self):
+        matrix = self.matrix
+        if matrix.shape[0] != matrix.shape[1]:
+            raise InversionError('Cannot invert non-square matrix')
+        if not np.all(np.isfinite(matrix)):
+            raise InversionError('Matrix contains non-finite values')
+        matrix = matrix.astype(np.result_type(matrix.dtype, np.float64), copy=False)
+        tol = 100 * np.finfo(matrix.dtype).eps * np.max(np.abs(matrix))
+        if np.all(np.diag(matrix).real > 0) and np.allclose(matrix, matrix.T.conj(), rtol=0, atol=tol):
+            try:
+                return 'cholesky', cho_factor(matrix, check_finite=False)
+            except LinAlgError:
+                pass  # not positive definite
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # singularity is checked below
+            lu, piv = lu_factor(matrix, check_finite=False)
+        if np.any(np.diag(lu) == 0):
+            raise InversionError('Matrix is singular')
+        return 'lu', (lu, piv)
 
     def assemble_lincomb(self, operators, coefficients, solver_options=None, name=None):
         if not all(isinstance(op, (NumpyMatrixOperator, ZeroOperator, IdentityOperator)) for op in operators):
@@ -343,6 +428,19 @@ class NumpyMatrixOperator(NumpyMatrixBasedOperator):
         common_coef_dtype = reduce(np.promote_types, (type(c) for c in coefficients))
         common_dtype = np.promote_types(common_mat_dtype, common_coef_dtype)
 
+        pattern = self._lincomb_pattern(operators)
+        if pattern is not None:
+            indices, indptr, values = pattern
+            data = values.dot(np.array(coefficients, dtype=common_coef_dtype)).astype(common_dtype, copy=False)
+            matrix_type = scipy.sparse.csr_matrix if self.matrix.format == 'csr' else scipy.sparse.csc_matrix
+            # the pattern is copied as scipy.sparse might modify it in-place
+            matrix = matrix_type((data, indices.copy(), indptr.copy()), shape=self.matrix.shape)
+            matrix.has_sorted_indices = True
+            return NumpyMatrixOperator(matrix,
+                                       source_id=self.source.id,
+                                       range_id=self.range.id,
+                                       solver_options=solver_options)
+
         if coefficients[0] == 1:
             matrix = operators[0].matrix.astype(common_dtype)
         else:
@@ -383,7 +481,28 @@ class NumpyMatrixOperator(NumpyMatrixBasedOperator):
                                    range_id=self.range.id,
                                    solver_options=solver_options)
 
+    def _lincomb_pattern(self, operators):
+        """Union sparsity pattern for repeatedly assembled linear combinations.
+
+        Returns `None` unless `self` is a sparse CSR or CSC matrix and the same
+        `operators` are combined for (at least) the second time in a row. This avoids
+        spending time and memory on the pattern for one-off linear combinations.
+        """
+        if not (self.sparse and self.matrix.format in ('csr', 'csc')) \
+                or not all(op.sparse for op in operators if isinstance(op, NumpyMatrixOperator)):
+            return None
+        key = tuple(op.uid for op in operators)
+        last_key, pattern = getattr(self, '_last_lincomb_pattern', (None, None))
+        if key != last_key:
+            self._last_lincomb_pattern = (key, None)
+            return None
+        if pattern is None:
+            pattern = _union_sparsity_pattern(operators, self.matrix.shape, self.matrix.format)
+            self._last_lincomb_pattern = (key, pattern)
+        return pattern
+
     def __getstate__(self):
-        if hasattr(self.matrix, 'factorization'):  # remove unplicklable SuperLU factorization
-            del self.matrix.factorization
-        return self.__dict__
+        state = self.__dict__.copy()
+        state.pop('_factorization', None)  # factorizations are recomputed on demand
+        state.pop('_last_lincomb_pattern', None)
+        return state
@@ -9,14 +9,19 @@ from pymor.core.logger import getLogger
 from pymor.parallel.dummy import dummy_pool
 
 
-@defaults('ipython_num_engines', 'ipython_profile', 'allow_mpi')
-def new_parallel_pool(ipython_num_engines=None, ipython_profile=None, allow_mpi=True):
+@defaults('ipython_num_engines', 'ipython_profile', 'allow_mpi', 'process_num_workers')
+def new_parallel_pool(ipython_num_engines=None, ipython_profile=None, allow_mpi=True, process_num_workers=None):
     """Creates a new default |WorkerPool|.
 
     If `ipython_num_engines` or `ipython_profile` is provided as an argument or set as
     a |default|, an :class:`~pymor.parallel.ipython.IPythonPool` |WorkerPool| will
     be created using the given parameters via the `ipcluster` script.
 
+    Otherwise, if `process_num_workers` is provided as an argument or set as a
+    |default|, a :class:`~pymor.parallel.process.ProcessPool` |WorkerPool| with the
+    given number of local worker processes will be created. A value of `-1` creates
+    one worker process per available CPU.
+
     Otherwise, when `allow_mpi` is `True` and an MPI parallel run is detected,
     an :class:`~pymor.parallel.mpi.MPIPool` |WorkerPool| will be created.
 
@@ -36,6 +41,11 @@ def new_parallel_pool(ipython_num_engines=None, ipython_profile=None, allow_mpi=
         pool = nip.__enter__()
         _pool = ('ipython', pool, nip)
         return pool
+    elif process_num_workers:
+        from pymor.parallel.process import ProcessPool
+        pool = ProcessPool(num_workers=None if process_num_workers == -1 else process_num_workers)
+        _pool = ('process', pool)
+        return pool
     elif allow_mpi:
         from pymor.tools import mpi
         if mpi.parallel:
@@ -59,4 +69,6 @@ def _cleanup():
     global _pool
     if _pool and _pool[0] == 'ipython':
         _pool[2].__exit__(None, None, None)
+    elif _pool and _pool[0] == 'process':
+        _pool[1].shutdown()
     _pool = None
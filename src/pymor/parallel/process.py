@@ -0,0 +1,224 @@
+# This file is part of the pyMOR project (http://www.pymor.org).
+# Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
+
+"""|WorkerPool| based on local worker processes spawned via :mod:`multiprocessing`.
+
+In contrast to :class:`~pymor.parallel.ipython.IPythonPool` and
+:class:`~pymor.parallel.mpi.MPIPool`, no external cluster setup is required,
+making :class:`ProcessPool` the simplest way to parallelize algorithms like
+:func:`~pymor.algorithms.greedy.greedy` on a single many-core machine.
+
+Each worker is a dedicated process holding its own copies of the
+objects pushed to the pool. When Python's :mod:`multiprocessing.shared_memory`
+module is available (Python 3.8 and newer), :meth:`~ProcessPool.scatter_array`
+places the data of |NumpyVectorArrays| in a shared memory block, such that
+the workers operate on zero-copy views of the scattered data instead of
+unpickled copies. Likewise, the topology and geometry data already computed
+by grids contained in objects pushed to the pool is shared with the workers
+(see :mod:`pymor.grids.datastore`).
+"""
+
+from itertools import chain
+import multiprocessing
+import os
+
+import numpy as np
+
+from pymor.core.config import config
+from pymor.core.pickle import dumps, loads
+from pymor.grids.datastore import shared_grid_data
+from pymor.parallel.basic import WorkerPoolBase, RemoteObject
+from pymor.tools.counter import Counter
+from pymor.vectorarrays.numpy import NumpyVectorSpace
+
+if config.HAVE_SHARED_MEMORY:
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+
+
+class ProcessPool(WorkerPoolBase):
+    """|WorkerPool| based on local worker processes.
+
+    Parameters
+    ----------
+    num_workers
+        Number of worker processes to start. If `None`, the number of
+        available CPUs is used.
+    context
+        Name of the :mod:`multiprocessing` start method (`'fork'`, `'spawn'`,
+        `'forkserver'`) used to create the worker processes. If `None`,
+        the platform's default start method is used.
+    """
+
+    def __init__(self, num_workers=None, context=None):
+        super().__init__()
+        num_workers = num_workers or os.cpu_count() or 1
+        ctx = multiprocessing.get_context(context)
+        if config.HAVE_SHARED_MEMORY:
+            # make the workers share the resource tracker of this process, such that shared memory
+            # blocks attached by the workers are not considered leaked when the workers exit
+            resource_tracker.ensure_running()
+        self._workers = []
+        for _ in range(num_workers):
+            conn, worker_conn = ctx.Pipe()
+            process = ctx.Process(target=_worker_loop, args=(worker_conn,), daemon=True)
+            process.start()
+            worker_conn.close()
+            self._workers.append((process, conn))
+        self._remote_objects_created = Counter()
+        self._shared_memory = {}
+        self._apply(os.chdir, os.getcwd())
+        self.logger.info(f'Started {num_workers} worker processes')
+
+    def __del__(self):
+        self.shutdown()
+
+    def __len__(self):
+        return len(self._workers)
+
+    def shutdown(self):
+        """Stop all worker processes and release shared memory blocks."""
+        workers, self._workers = getattr(self, '_workers', []), []
+        for process, conn in workers:
+            try:
+                conn.send_bytes(dumps(('quit', None)))
+                conn.close()
+            except (OSError, ValueError):
+                pass
+        for process, _ in workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for remote_id in list(getattr(self, '_shared_memory', {})):
+            self._release_shared_memory(remote_id)
+
+    def scatter_array(self, U, copy=True):
+        if not config.HAVE_SHARED_MEMORY or not isinstance(U.space, NumpyVectorSpace):
+            return super().scatter_array(U, copy=copy)
+
+        array = U.to_numpy()
+        shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared_array = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        shared_array[:] = array
+        shape, dtype, space = array.shape, array.dtype, U.space
+        del shared_array, array
+        if not copy:
+            if U.is_view:
+                del U.base[U.ind]
+            else:
+                del U[:]
+        del U
+
+        remote_id = RemoteId(self._remote_objects_created.inc())
+        self._shared_memory[remote_id] = shm
+        length = shape[0]
+        slice_len = length // len(self) + (1 if length % len(self) else 0)
+        self._send_all([('attach_array', (remote_id, shm.name, shape, dtype,
+                                          min(i*slice_len, length), min((i+1)*slice_len, length), space))
+                        for i in range(len(self))])
+        return RemoteObject(self, remote_id)
+
+    def _push_object(self, obj):
+        remote_id = RemoteId(self._remote_objects_created.inc())
+        # let the workers attach to the data computed by grids contained in obj
+        with shared_grid_data():
+            self._send_all([('push', (remote_id, obj))] * len(self))
+        return remote_id
+
+    def _apply(self, function, *args, **kwargs):
+        return self._send_all([('call', (function, False, args, kwargs))] * len(self))
+
+    def _apply_only(self, function, worker, *args, **kwargs):
+        _, conn = self._workers[worker]
+        conn.send_bytes(dumps(('call', (function, False, args, kwargs))))
+        return _receive(conn)
+
+    def _map(self, function, chunks, **kwargs):
+        result = self._send_all([('call', (function, True, a, kwargs)) for a in zip(*chunks)])
+        return list(chain(*result))
+
+    def _remove_object(self, remote_id):
+        if self._workers:
+            self._send_all([('remove', remote_id)] * len(self))
+        self._release_shared_memory(remote_id)
+
+    def _release_shared_memory(self, remote_id):
+        shm = self._shared_memory.pop(remote_id, None)
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    def _send_all(self, messages):
+        # send all messages first, such that the workers can process them in parallel
+        for (_, conn), message in zip(self._workers, messages):
+            conn.send_bytes(dumps(message))
+        # read the replies of all workers before raising, such that no stale replies
+        # are left in the pipes
+        replies = [loads(conn.recv_bytes()) for _, conn in self._workers]
+        for success, result in replies:
+            if not success:
+                raise result
+        return [result for _, result in replies]
+
+
+class RemoteId(int):
+    pass
+
+
+def _receive(conn):
+    success, result = loads(conn.recv_bytes())
+    if not success:
+        raise result
+    return result
+
+
+def _worker_loop(conn):
+    remote_objects = {}
+    shared_memory = {}
+    while True:
+        try:
+            command, payload = loads(conn.recv_bytes())
+        except EOFError:
+            break
+        if command == 'quit':
+            break
+        try:
+            if command == 'call':
+                function, loop, args, kwargs = payload
+                kwargs = {k: (remote_objects[v] if isinstance(v, RemoteId) else v)
+                          for k, v in kwargs.items()}
+                if loop:
+                    result = [function(*a, **kwargs) for a in zip(*args)]
+                else:
+                    result = function(*args, **kwargs)
+            elif command == 'push':
+                remote_id, obj = payload
+                remote_objects[remote_id] = obj
+                result = None
+            elif command == 'attach_array':
+                remote_id, name, shape, dtype, start, stop, space = payload
+                shm = SharedMemory(name=name)
+                array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)[start:stop]
+                shared_memory[remote_id] = shm
+                remote_objects[remote_id] = space.make_array(array)
+                result = None
+            elif command == 'remove':
+                del remote_objects[payload]
+                shm = shared_memory.pop(payload, None)
+                if shm is not None:
+                    try:
+                        shm.close()
+                    except BufferError:
+                        pass  # the data is still referenced on the worker, will be closed on garbage collection
+                result = None
+            else:
+                raise ValueError(f'Unknown command {command}')
+        except Exception as e:
+            try:
+                conn.send_bytes(dumps((False, e)))
+            except Exception:
+                conn.send_bytes(dumps((False, RuntimeError(f'{type(e).__name__}: {e}'))))
+            continue
+        conn.send_bytes(dumps((True, result)))
+    conn.close()
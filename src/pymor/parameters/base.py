@@ -306,6 +306,82 @@ class Parameter(dict):
         return dict(self)
 
 
+class ParameterArray:
+    """Columnar storage of a list of |Parameters| of the same |ParameterType|.
+
+    While a |Parameter| stores the values of its parameter components for a
+    single sample, a |ParameterArray| stores, for each component, a single
+    |NumPy array| containing the values of the component for all samples,
+    stacked along the first axis. This allows vectorized evaluation of
+    parameter-dependent quantities like |ParameterFunctionals| for large sets
+    of |Parameters| (see
+    :meth:`~pymor.parameters.interfaces.ParameterFunctionalInterface.evaluate_many`).
+
+    Parameters
+    ----------
+    mus
+        List of |Parameters| (or anything that can be interpreted as a |Parameter|
+        of the given |ParameterType|) or another |ParameterArray|.
+    parameter_type
+        The |ParameterType| of the stored |Parameters|. If `None`, the |ParameterType|
+        of the first |Parameter| in `mus` is used. Components of the given |Parameters|
+        which are not part of `parameter_type` are ignored.
+
+    Attributes
+    ----------
+    parameter_type
+        The |ParameterType| of the stored |Parameters|.
+    components
+        Dict of |NumPy arrays| of shape `(len(self),) + parameter_type[component]`.
+    """
+
+    def __init__(self, mus, parameter_type=None):
+        if isinstance(mus, ParameterArray):
+            if parameter_type is None:
+                parameter_type = mus.parameter_type
+            assert all(mus.parameter_type.get(k) == v for k, v in parameter_type.items())
+            self.parameter_type = ParameterType(parameter_type)
+            self.components = {k: mus.components[k] for k in parameter_type}
+            self._len = len(mus)
+            return
+
+        mus = list(mus)
+        if parameter_type is None:
+            parameter_type = mus[0].parameter_type if mus else {}
+        parameter_type = ParameterType(parameter_type)
+        if parameter_type:
+            mus = [mu if mu.__class__ is Parameter else Parameter.from_parameter_type(mu, parameter_type)
+                   for mu in mus]
+        assert all(getattr(mu.get(k, None), 'shape', None) == v for mu in mus for k, v in parameter_type.items())
+        self.parameter_type = parameter_type
+        self.components = {k: np.array([mu[k] for mu in mus]).reshape((len(mus),) + v)
+                           for k, v in parameter_type.items()}
+        self._len = len(mus)
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, str):
+            return self.components[i]
+        elif isinstance(i, slice):
+            result = ParameterArray([], {})
+            result.parameter_type = self.parameter_type
+            result.components = {k: v[i] for k, v in self.components.items()}
+            result._len = len(range(*i.indices(len(self))))
+            return result
+        return Parameter({k: v[i] for k, v in self.components.items()})
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __str__(self):
+        return f'ParameterArray of {len(self)} parameters of type {self.parameter_type}'
+
+    __repr__ = __str__
+
+
 class Parametric:
     """Mixin class for objects representing mathematical entities depending on a |Parameter|.
 
@@ -367,6 +443,19 @@ class Parametric:
             f'Given parameter of type {mu.parameter_type} does not match expected parameter type {self.parameter_type}'
         return mu
 
+    def parse_parameter_array(self, mus):
+        """Interpret a list of user supplied parameters as a |ParameterArray|.
+
+        The resulting |ParameterArray| only contains the components of the
+        object's |ParameterType|.
+
+        Parameters
+        ----------
+        mus
+            List of |Parameters| or |ParameterArray| to parse.
+        """
+        return ParameterArray(mus, self.parameter_type or {})
+
     def strip_parameter(self, mu):
         """Remove all components of the |Parameter| `mu` which are not part of the object's |ParameterType|.
 
@@ -2,6 +2,7 @@
 # Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
+import ast
 from numbers import Number
 
 import numpy as np
@@ -43,6 +44,10 @@ class ProjectionParameterFunctional(ParameterFunctionalInterface):
         mu = self.parse_parameter(mu)
         return mu[self.component_name].item(self.coordinates)
 
+    def evaluate_many(self, mus):
+        mus = self.parse_parameter_array(mus)
+        return mus[self.component_name][(slice(None),) + tuple(self.coordinates)].copy()
+
 
 class GenericParameterFunctional(ParameterFunctionalInterface):
     """A wrapper making an arbitrary Python function a |ParameterFunctional|
@@ -77,6 +82,54 @@ class GenericParameterFunctional(ParameterFunctionalInterface):
             return value
 
 
+def _reduce_component_axes(reduction):
+    def wrapper(x, axis=None):
+        return reduction(x, axis=tuple(range(np.ndim(x) - 1)) if axis is None else axis)
+    return wrapper
+
+
+def _is_elementwise(node, components, functions, reductions):
+    """Check if the expression `node` acts elementwise on the trailing axis of all components.
+
+    Only parameter components, numbers, the given `functions`, arithmetic and single
+    comparison operators as well as indexing of parameter components with constant indices
+    are allowed. The `reductions` may only be called with a single argument.
+    """
+    def check(node):
+        if isinstance(node, ast.Num):
+            return isinstance(node.n, Number)
+        if isinstance(node, ast.Name):
+            return node.id in components or node.id in functions
+        if isinstance(node, ast.BinOp):
+            return not isinstance(node.op, ast.MatMult) and check(node.left) and check(node.right)
+        if isinstance(node, ast.UnaryOp):
+            return not isinstance(node.op, ast.Not) and check(node.operand)
+        if isinstance(node, ast.Compare):
+            return len(node.ops) == 1 and check(node.left) and check(node.comparators[0])
+        if isinstance(node, ast.Call):
+            if (not isinstance(node.func, ast.Name) or node.func.id not in functions or node.keywords
+                    or node.func.id in reductions and len(node.args) != 1):
+                return False
+            return all(check(a) for a in node.args)
+        if isinstance(node, ast.Subscript):
+            return (isinstance(node.value, ast.Name) and node.value.id in components
+                    and constant_index(node.slice))
+        return False
+
+    def constant_index(node):
+        if isinstance(node, ast.Index):
+            return constant_index(node.value)
+        if isinstance(node, ast.Slice):
+            return all(n is None or constant_index(n) for n in (node.lower, node.upper, node.step))
+        if isinstance(node, (ast.Tuple, ast.ExtSlice)):
+            return all(constant_index(n) for n in getattr(node, 'elts', getattr(node, 'dims', [])))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return constant_index(node.operand)
+        return isinstance(node, ast.Num) and isinstance(node.n, int)
+
+    return check(node)
+
+
 class ExpressionParameterFunctional(GenericParameterFunctional):
     """Turns a Python expression given as a string into a |ParameterFunctional|.
 
@@ -107,12 +160,45 @@ class ExpressionParameterFunctional(GenericParameterFunctional):
     functions['polar'] = lambda x: (np.linalg.norm(x, axis=-1), np.arctan2(x[..., 1], x[..., 0]) % (2*np.pi))
     functions['np'] = np
 
+    # names which can be evaluated for parameter components with an additional trailing
+    # sample axis by evaluate_many: elementwise functions and constants from `functions`, as
+    # well as variants of the reductions in `functions` which only reduce the component axes
+    batch_functions = {k: getattr(np, k) for k in ('sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'arctan2',
+                                                   'sinh', 'cosh', 'tanh', 'arcsinh', 'arccosh', 'arctanh',
+                                                   'exp', 'exp2', 'log', 'log2', 'log10', 'sqrt',
+                                                   'minimum', 'maximum', 'abs', 'sign', 'pi', 'e')}
+    batch_reductions = {k: _reduce_component_axes(getattr(np, k)) for k in ('min', 'max', 'sum', 'prod')}
+    batch_reductions['norm'] = lambda x: np.sqrt(np.sum(np.abs(x)**2, axis=tuple(range(np.ndim(x) - 1))))
+    batch_functions.update(batch_reductions)
+
     def __init__(self, expression, parameter_type, name=None):
         self.expression = expression
         code = compile(expression, '<expression>', 'eval')
         functions = self.functions
         mapping = lambda mu: eval(code, functions, mu)
         super().__init__(mapping, parameter_type, name)
+        self._code = code
+        self._vectorizable = _is_elementwise(ast.parse(expression, mode='eval').body,
+                                             set(self.parameter_type or {}), self.batch_functions,
+                                             self.batch_reductions)
+
+    def evaluate_many(self, mus):
+        mus = self.parse_parameter_array(mus)
+        if len(mus) == 0:
+            return np.empty(0)
+        if not self._vectorizable:
+            return super().evaluate_many(mus)
+
+        # Evaluate the expression for all samples at once. The sample axis is moved to the end, such
+        # that indexing of parameter components works in the same way as for a single Parameter.
+        try:
+            with np.errstate(all='ignore'):
+                values = eval(self._code, self.batch_functions,
+                              {k: np.moveaxis(v, 0, -1) for k, v in mus.components.items()})
+            return np.broadcast_to(values, (len(mus),)).copy()
+        except ValueError:
+            # the expression does not evaluate to a scalar for each sample
+            return super().evaluate_many(mus)
 
     def __repr__(self):
         return f'ExpressionParameterFunctional({self.expression}, {repr(self.parameter_type)})'
@@ -138,8 +224,13 @@ class ProductParameterFunctional(ParameterFunctionalInterface):
         assert all(isinstance(f, (ParameterFunctionalInterface, Number)) for f in factors)
         self.name = name
         self.factors = tuple(factors)
-        self.build_parameter_type(*(f for f in factors if isinstance(f, ProductParameterFunctional)))
+        self.build_parameter_type(*(f for f in factors if isinstance(f, ParameterFunctionalInterface)))
 
     def evaluate(self, mu=None):
         mu = self.parse_parameter(mu)
         return np.array([f.evaluate(mu) if hasattr(f, 'evaluate') else f for f in self.factors]).prod()
+
+    def evaluate_many(self, mus):
+        mus = self.parse_parameter_array(mus)
+        return np.array([f.evaluate_many(mus) if hasattr(f, 'evaluate_many') else np.full(len(mus), f)
+                         for f in self.factors]).prod(axis=0)
@@ -4,6 +4,8 @@
 
 from numbers import Number
 
+import numpy as np
+
 from pymor.core.interfaces import ImmutableInterface, abstractmethod
 from pymor.parameters.base import Parametric
 
@@ -37,6 +39,26 @@ class ParameterFunctionalInterface(ImmutableInterface, Parametric):
         """Evaluate the functional for the given |Parameter| `mu`."""
         pass
 
+    def evaluate_many(self, mus):
+        """Evaluate the functional for several |Parameters|.
+
+        The default implementation calls :meth:`evaluate` for each |Parameter|.
+        Implementors should override this method with a vectorized implementation
+        operating on the components of the given |ParameterArray|.
+
+        Parameters
+        ----------
+        mus
+            |ParameterArray| or list of |Parameters| for which to evaluate the
+            functional.
+
+        Returns
+        -------
+        |NumPy array| of the values of the functional for all |Parameters| in `mus`.
+        """
+        mus = self.parse_parameter_array(mus)
+        return np.array([self.evaluate(mu) for mu in mus])
+
     def __call__(self, mu=None):
         return self.evaluate(mu)
 
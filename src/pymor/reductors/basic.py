@@ -9,7 +9,8 @@ import numpy as np
 from pymor.algorithms.basic import almost_equal
 from pymor.algorithms.gram_schmidt import gram_schmidt
 from pymor.algorithms.pod import pod
-from pymor.algorithms.projection import project, project_to_subbasis
+from pymor.algorithms.projection import (project, project_incrementally, project_to_subbasis, _basis_digest,
+                                         _basis_extended)
 from pymor.core.defaults import defaults
 from pymor.core.exceptions import ExtensionError, AccuracyError
 from pymor.core.interfaces import BasicInterface, abstractmethod
@@ -39,6 +40,11 @@ class ProjectionBasedReductor(BasicInterface):
     check_tol
         If `check_orthonormality` is `True`, the numerical tolerance with which the checks
         are performed.
+
+    When the bases have only been extended since the last call of :meth:`reduce`
+    (e.g. via :meth:`extend_basis`), only the new basis vectors are projected (see
+    :meth:`project_operators_incrementally`). If any other modification of the bases
+    is detected, all operators are projected again.
     """
 
     @defaults('check_orthonormality', 'check_tol')
@@ -68,9 +74,15 @@ class ProjectionBasedReductor(BasicInterface):
             if d > len(self.bases[k]):
                 raise ValueError(f'Specified reduced state dimension larger than reduced basis {k}')
 
+        if self._last_rom is not None and not all(_basis_extended(self.bases[k], d)
+                                                  for k, d in self._last_rom_digests.items()):
+            self.logger.info('Bases have been modified, projecting all operators again.')
+            self._last_rom = None
+
         if self._last_rom is None or any(dims[b] > self._last_rom_dims[b] for b in dims):
             self._last_rom = self._reduce()
-            self._last_rom_dims = dict(dims)
+            self._last_rom_dims = {k: len(v) for k, v in self.bases.items()}
+            self._last_rom_digests = {k: _basis_digest(v) for k, v in self.bases.items()}
 
         if dims == self._last_rom_dims:
             return self._last_rom
@@ -79,7 +91,10 @@ class ProjectionBasedReductor(BasicInterface):
 
     def _reduce(self):
         with self.logger.block('Operator projection ...'):
-            projected_operators = self.project_operators()
+            if self._last_rom is not None:
+                projected_operators = self.project_operators_incrementally()
+            else:
+                projected_operators = self.project_operators()
 
         # ensure that no logging output is generated for estimator assembly in case there is
         # no estimator to assemble
@@ -108,6 +123,17 @@ class ProjectionBasedReductor(BasicInterface):
     def project_operators(self):
         pass
 
+    def project_operators_incrementally(self):
+        """Project operators after the bases have been extended.
+
+        Called instead of :meth:`project_operators` when a ROM for initial
+        segments of the current bases has already been built. The previously
+        projected operators can be obtained from `self._last_rom`, the
+        corresponding basis dimensions from `self._last_rom_dims`.
+        By default, :meth:`project_operators` is called.
+        """
+        return self.project_operators()
+
     def assemble_estimator(self):
         return None
 
@@ -181,6 +207,17 @@ class StationaryRBReductor(ProjectionBasedReductor):
                                'outputs':  {k: project(v, None, RB) for k, v in fom.outputs.items()}}
         return projected_operators
 
+    def project_operators_incrementally(self):
+        fom, rom = self.fom, self._last_rom
+        RB = self.bases['RB']
+        projected_operators = {'operator': project_incrementally(fom.operator, rom.operator, RB, RB),
+                               'rhs':      project_incrementally(fom.rhs, rom.rhs, RB, None),
+                               'products': {k: project_incrementally(v, rom.products[k], RB, RB)
+                                            for k, v in fom.products.items()},
+                               'outputs':  {k: project_incrementally(v, rom.outputs[k], None, RB)
+                                            for k, v in fom.outputs.items()}}
+        return projected_operators
+
     def project_operators_to_subbasis(self, dims):
         rom = self._last_rom
         dim = dims['RB']
@@ -228,6 +265,21 @@ class InstationaryRBReductor(ProjectionBasedReductor):
         self.product_is_mass = product_is_mass
 
     def project_operators(self):
+        fom = self.fom
+        RB = self.bases['RB']
+        projected_initial_data = self._project_initial_data()
+
+        projected_operators = {'mass':         (None if fom.mass is None or self.product_is_mass else
+                                                project(fom.mass, RB, RB)),
+                               'operator':     project(fom.operator, RB, RB),
+                               'rhs':          project(fom.rhs, RB, None) if fom.rhs is not None else None,
+                               'initial_data': projected_initial_data,
+                               'products':     {k: project(v, RB, RB) for k, v in fom.products.items()},
+                               'outputs':      {k: project(v, None, RB) for k, v in fom.outputs.items()}}
+
+        return projected_operators
+
+    def _project_initial_data(self):
         fom = self.fom
         RB = self.bases['RB']
         product = self.products['RB']
@@ -242,14 +294,29 @@ class InstationaryRBReductor(ProjectionBasedReductor):
         else:
             projected_initial_data = project(fom.initial_data, range_basis=RB, source_basis=None,
                                              product=product)
+        return projected_initial_data
+
+    def project_operators_incrementally(self):
+        fom, rom = self.fom, self._last_rom
+        RB = self.bases['RB']
+        product = self.products['RB']
+
+        if self.initial_data_product != product:
+            projected_initial_data = self._project_initial_data()
+        else:
+            projected_initial_data = project_incrementally(fom.initial_data, rom.initial_data, RB, None,
+                                                           product=product)
 
         projected_operators = {'mass':         (None if fom.mass is None or self.product_is_mass else
-                                                project(fom.mass, RB, RB)),
-                               'operator':     project(fom.operator, RB, RB),
-                               'rhs':          project(fom.rhs, RB, None) if fom.rhs is not None else None,
+                                                project_incrementally(fom.mass, rom.mass, RB, RB)),
+                               'operator':     project_incrementally(fom.operator, rom.operator, RB, RB),
+                               'rhs':          (project_incrementally(fom.rhs, rom.rhs, RB, None)
+                                                if fom.rhs is not None else None),
                                'initial_data': projected_initial_data,
-                               'products':     {k: project(v, RB, RB) for k, v in fom.products.items()},
-                               'outputs':      {k: project(v, None, RB) for k, v in fom.outputs.items()}}
+                               'products':     {k: project_incrementally(v, rom.products[k], RB, RB)
+                                                for k, v in fom.products.items()},
+                               'outputs':      {k: project_incrementally(v, rom.outputs[k], None, RB)
+                                                for k, v in fom.outputs.items()}}
 
         return projected_operators
 
@@ -467,7 +534,9 @@ def extend_basis(U, basis, product=None, method='gram_schmidt', pod_modes=1, pod
     elif method == 'pod':
         U_proj_err = U - basis.lincomb(U.inner(basis, product))
 
-        basis.append(pod(U_proj_err, modes=pod_modes, product=product, orthonormalize=False)[0])
+        # the orthonormality check of pod is redundant if the modes are re-orthonormalized anyway
+        basis.append(pod(U_proj_err, modes=pod_modes, product=product, orthonormalize=False,
+                         check=not pod_orthonormalize)[0])
 
         if pod_orthonormalize:
             gram_schmidt(basis, offset=basis_length, product=product, copy=False, check=False)
@@ -4,11 +4,13 @@
 
 import numpy as np
 
+from pymor.algorithms.to_matrix import to_matrix_batch
 from pymor.core.interfaces import ImmutableInterface
 from pymor.operators.constructions import LincombOperator, induced_norm
 from pymor.operators.numpy import NumpyMatrixOperator
+from pymor.parameters.interfaces import ParameterFunctionalInterface
 from pymor.reductors.basic import StationaryRBReductor
-from pymor.reductors.residual import ResidualReductor
+from pymor.reductors.residual import ResidualOperator, ResidualReductor
 from pymor.vectorarrays.numpy import NumpyVectorSpace
 
 
@@ -73,6 +75,26 @@ class CoerciveRBEstimator(ImmutableInterface):
             est /= self.coercivity_estimator(mu)
         return est
 
+    def estimate_batch(self, U, mus, m):
+        residual = self.residual
+        if not (type(residual) is ResidualOperator and residual.linear
+                and isinstance(residual.source, NumpyVectorSpace) and isinstance(residual.range, NumpyVectorSpace)):
+            return np.hstack([self.estimate(U[i], mu, m) for i, mu in enumerate(mus)])
+
+        mus = m.parse_parameter_array(mus)
+        U = U.to_numpy()
+        est = np.empty(len(mus))
+        batch_size = max(1, 2**24 // max(residual.range.dim * residual.source.dim, 1))
+        for i in range(0, len(mus), batch_size):
+            batch = mus[i:i+batch_size]
+            R = np.matmul(to_matrix_batch(residual.operator, batch), U[i:i+batch_size, :, np.newaxis])[..., 0]
+            if residual.rhs:
+                R = R - to_matrix_batch(residual.rhs, batch)[..., 0]
+            est[i:i+batch_size] = np.linalg.norm(R, axis=1)
+        if self.coercivity_estimator:
+            est /= _evaluate_coercivity_estimator(self.coercivity_estimator, mus)
+        return est
+
     def restricted_to_subbasis(self, dim, m):
         if self.residual_range_dims:
             residual_range_dims = self.residual_range_dims[:dim + 1]
@@ -237,6 +259,26 @@ class SimpleCoerciveRBEstimator(ImmutableInterface):
 
         return est
 
+    def estimate_batch(self, U, mus, m):
+        mus = m.parse_parameter_array(mus)
+        if not m.rhs.parametric:
+            CR = np.ones((len(mus), 1))
+        else:
+            CR = m.rhs.evaluate_coefficients_many(mus)
+
+        if not m.operator.parametric:
+            CO = np.ones((len(mus), 1))
+        else:
+            CO = m.operator.evaluate_coefficients_many(mus)
+
+        C = np.hstack((CR, (CO[:, :, np.newaxis] * U.to_numpy()[:, np.newaxis, :]).reshape((len(mus), -1))))
+
+        est = self.norm(NumpyVectorSpace.make_array(C))
+        if self.coercivity_estimator:
+            est /= _evaluate_coercivity_estimator(self.coercivity_estimator, mus)
+
+        return est
+
     def restricted_to_subbasis(self, dim, m):
         cr = 1 if not m.rhs.parametric else len(m.rhs.operators)
         co = 1 if not m.operator.parametric else len(m.operator.operators)
@@ -247,3 +289,10 @@ class SimpleCoerciveRBEstimator(ImmutableInterface):
         matrix = self.estimator_matrix.matrix[indices, :][:, indices]
 
         return SimpleCoerciveRBEstimator(NumpyMatrixOperator(matrix), self.coercivity_estimator)
+
+
+def _evaluate_coercivity_estimator(coercivity_estimator, mus):
+    if isinstance(coercivity_estimator, ParameterFunctionalInterface):
+        return coercivity_estimator.evaluate_many(mus)
+    else:
+        return np.array([coercivity_estimator(mu) for mu in mus])
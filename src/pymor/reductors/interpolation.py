@@ -301,7 +301,9 @@ class TFInterpReductor(BasicInterface):
     Parameters
     ----------
     fom
-        Model with `eval_tf` and `eval_dtf` methods.
+        Model with `eval_tf` and `eval_dtf` methods. If `fom` also has
+        `eval_tf_batch` and `eval_dtf_batch` methods, these are used to
+        evaluate the transfer function at all interpolation points at once.
     """
     def __init__(self, fom):
         self.fom = fom
@@ -349,8 +351,12 @@ class TFInterpReductor(BasicInterface):
         Br = np.empty((r, fom.input_dim), dtype=complex)
         Cr = np.empty((fom.output_dim, r), dtype=complex)
 
-        Hs = [fom.eval_tf(s) for s in sigma]
-        dHs = [fom.eval_dtf(s) for s in sigma]
+        if hasattr(fom, 'eval_tf_batch') and hasattr(fom, 'eval_dtf_batch'):
+            Hs = fom.eval_tf_batch(sigma)
+            dHs = fom.eval_dtf_batch(sigma)
+        else:
+            Hs = [fom.eval_tf(s) for s in sigma]
+            dHs = [fom.eval_dtf(s) for s in sigma]
 
         for i in range(r):
             for j in range(r):
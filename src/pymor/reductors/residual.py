@@ -5,7 +5,8 @@
 import numpy as np
 
 from pymor.algorithms.image import estimate_image_hierarchical
-from pymor.algorithms.projection import project, project_to_subbasis
+from pymor.algorithms.projection import (project, project_incrementally, project_to_subbasis, _basis_digest,
+                                         _basis_extended)
 from pymor.core.interfaces import BasicInterface
 from pymor.core.exceptions import ImageCollectionError
 from pymor.operators.basic import OperatorBase
@@ -44,6 +45,11 @@ class ResidualReductor(BasicInterface):
         residual_reductor.reconstruct(projected_residual.apply(u, mu))
             == residual.apply(RB.lincomb(u), mu)
 
+    When `RB` has only been extended since the last call of `reduce`, only the
+    new basis vectors and the new vectors of `residual_range` are projected
+    (see :func:`~pymor.algorithms.projection.project_incrementally`). If any
+    other modification of `RB` is detected, `residual_range` is computed again.
+
     Parameters
     ----------
     RB
@@ -69,8 +75,14 @@ class ResidualReductor(BasicInterface):
             RB, operator, rhs, product, riesz_representatives
         self.residual_range = operator.range.empty()
         self.residual_range_dims = []
+        self._last_projection = None
 
     def reduce(self):
+        if self._last_projection and not _basis_extended(self.RB, self._last_RB_digest):
+            self.residual_range = self.operator.range.empty()
+            self.residual_range_dims = []
+            self._last_projection = None
+
         if self.residual_range is not False:
             with self.logger.block('Estimating residual range ...'):
                 try:
@@ -89,12 +101,17 @@ class ResidualReductor(BasicInterface):
             return NonProjectedResidualOperator(operator, self.rhs, self.riesz_representatives, self.product)
 
         with self.logger.block('Projecting residual operator ...'):
-            if self.riesz_representatives:
-                operator = project(self.operator, self.residual_range, self.RB, product=None)  # the product cancels out.
-                rhs = project(self.rhs, self.residual_range, None, product=None)
+            product = None if self.riesz_representatives else self.product  # the product cancels out.
+            if self._last_projection:
+                last_operator, last_rhs = self._last_projection
+                operator = project_incrementally(self.operator, last_operator, self.residual_range, self.RB,
+                                                 product=product)
+                rhs = project_incrementally(self.rhs, last_rhs, self.residual_range, None, product=product)
             else:
-                operator = project(self.operator, self.residual_range, self.RB, product=self.product)
-                rhs = project(self.rhs, self.residual_range, None, product=self.product)
+                operator = project(self.operator, self.residual_range, self.RB, product=product)
+                rhs = project(self.rhs, self.residual_range, None, product=product)
+            self._last_projection = (operator, rhs)
+            self._last_RB_digest = _basis_digest(self.RB)
 
         return ResidualOperator(operator, rhs)
 
@@ -228,8 +245,14 @@ class ImplicitEulerResidualReductor(BasicInterface):
         self.product = product
         self.residual_range = operator.range.empty()
         self.residual_range_dims = []
+        self._last_projection = None
 
     def reduce(self):
+        if self._last_projection and not _basis_extended(self.RB, self._last_RB_digest):
+            self.residual_range = self.operator.range.empty()
+            self.residual_range_dims = []
+            self._last_projection = None
+
         if self.residual_range is not False:
             with self.logger.block('Estimating residual range ...'):
                 try:
@@ -249,9 +272,18 @@ class ImplicitEulerResidualReductor(BasicInterface):
             return NonProjectedImplicitEulerResidualOperator(operator, mass, self.rhs, self.dt, self.product)
 
         with self.logger.block('Projecting residual operator ...'):
-            operator = project(self.operator, self.residual_range, self.RB, product=None)  # the product always cancels out.
-            mass = project(self.mass, self.residual_range, self.RB, product=None)
-            rhs = project(self.rhs, self.residual_range, None, product=None)
+            # the product always cancels out
+            if self._last_projection:
+                last_operator, last_mass, last_rhs = self._last_projection
+                operator = project_incrementally(self.operator, last_operator, self.residual_range, self.RB)
+                mass = project_incrementally(self.mass, last_mass, self.residual_range, self.RB)
+                rhs = project_incrementally(self.rhs, last_rhs, self.residual_range, None)
+            else:
+                operator = project(self.operator, self.residual_range, self.RB, product=None)
+                mass = project(self.mass, self.residual_range, self.RB, product=None)
+                rhs = project(self.rhs, self.residual_range, None, product=None)
+            self._last_projection = (operator, mass, rhs)
+            self._last_RB_digest = _basis_digest(self.RB)
 
         return ImplicitEulerResidualOperator(operator, mass, rhs, self.dt)
 
@@ -2,11 +2,16 @@
 # Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
+from concurrent.futures import ThreadPoolExecutor
+import os
+import zlib
+
 import numpy as np
 
 from pymor.core.config import config
 from pymor.grids import referenceelements
 from pymor.grids.constructions import flatten_grid
+from pymor.vectorarrays.interfaces import VectorArrayInterface
 
 if config.HAVE_PYVTK:
     try:
@@ -105,3 +110,108 @@ def write_vtk(grid, data, filename_base, codim=2, binary_vtk=True, last_step=Non
     x, y, z = coordinates[:, 0].copy(), coordinates[:, 1].copy(), np.zeros(coordinates[:, 1].size)
     _write_vtu_series(grid, coordinates=(x, y, z), connectivity=subentities, data=data,
                       filename_base=filename_base, last_step=last_step, is_cell_data=(codim == 0))
+
+
+def write_xdmf(grid, data, filename_base, codim=2, compression_level=1, max_workers=None):
+    """Output grid-associated time series in XDMF format with HDF5 storage
+
+    In contrast to :func:`write_vtk`, the grid is written only once. The data of all
+    time steps is appended to a single compressed HDF5 dataset, and
+    `data` can be an iterable of |VectorArrays| containing consecutive
+    chunks of the time series, such that the whole series never needs to
+    be held in memory. The compression of the time steps is performed
+    by a thread pool.
+
+    Parameters
+    ----------
+    grid
+        A |Grid| with triangular or rectilinear reference element.
+    data
+        |VectorArray| or iterable of |VectorArrays| with either cell (ie one
+        datapoint per codim 0 entity) or vertex (ie one datapoint per codim 2
+        entity) data in each array element.
+    filename_base
+        Output is written to `filename_base.xdmf` and `filename_base.h5`.
+    codim
+        the codimension associated with the data
+    compression_level
+        zlib compression level (0-9) for the time series data.
+    max_workers
+        Maximum number of threads used for compression. If `None`, the
+        default of :class:`concurrent.futures.ThreadPoolExecutor` is used.
+    """
+    if not config.HAVE_H5PY:
+        raise ImportError('could not import h5py')
+    if grid.dim != 2:
+        raise NotImplementedError
+    if codim not in (0, 2):
+        raise NotImplementedError
+
+    ref = grid.reference_element
+    if ref is referenceelements.triangle:
+        topology_type = 'Triangle'
+    elif ref is referenceelements.square:
+        topology_type = 'Quadrilateral'
+    else:
+        raise NotImplementedError("xdmf output only available for grids with triangle or rectangle reference elments")
+
+    import h5py
+
+    subentities, coordinates, entity_map = flatten_grid(grid)
+    if isinstance(data, VectorArrayInterface):
+        data = [data]
+    size = len(coordinates) if codim == 2 else grid.size(0)
+
+    def compress(u):
+        return zlib.compress(u, compression_level)
+
+    steps = 0
+    with h5py.File(filename_base + '.h5', 'w') as f, ThreadPoolExecutor(max_workers) as executor:
+        f.create_dataset('geometry', data=coordinates, compression='gzip')
+        f.create_dataset('topology', data=subentities.astype(np.int32), compression='gzip')
+        # one chunk per time step, such that the steps can be compressed independently
+        dset = f.create_dataset('data', shape=(0, size), maxshape=(None, size), chunks=(1, size),
+                                dtype=np.float64, compression='gzip', compression_opts=compression_level)
+        for U in data:
+            U = U.to_numpy() if codim == 0 else U.to_numpy()[:, entity_map]
+            U = np.ascontiguousarray(U, dtype=np.float64)
+            dset.resize(steps + len(U), axis=0)
+            for i, chunk in enumerate(executor.map(compress, U)):
+                dset.id.write_direct_chunk((steps + i, 0), chunk)
+            steps += len(U)
+
+    h5_name = os.path.basename(filename_base) + '.h5'
+    float_item = 'NumberType="Float" Precision="8" Format="HDF"'
+    center = 'Node' if codim == 2 else 'Cell'
+    step_tpl = f"""      <Grid Name="step_{{i}}" GridType="Uniform">
+        <Time Value="{{i}}"/>
+        <Topology Reference="XML">/Xdmf/Domain/Topology[@Name="topology"]</Topology>
+        <Geometry Reference="XML">/Xdmf/Domain/Geometry[@Name="geometry"]</Geometry>
+        <Attribute Name="Data" AttributeType="Scalar" Center="{center}">
+          <DataItem ItemType="HyperSlab" Dimensions="1 {size}">
+            <DataItem Dimensions="3 2" Format="XML">{{i}} 0 1 1 1 {size}</DataItem>
+            <DataItem Dimensions="{steps} {size}" {float_item}>{h5_name}:/data</DataItem>
+          </DataItem>
+        </Attribute>
+      </Grid>
+"""
+    with open(filename_base + '.xdmf', 'w') as f:
+        f.write(f"""<?xml version="1.0" ?>
+<Xdmf Version="2.0">
+  <Domain>
+    <Topology Name="topology" TopologyType="{topology_type}" NumberOfElements="{len(subentities)}">
+      <DataItem Dimensions="{len(subentities)} {subentities.shape[1]}" NumberType="Int" Format="HDF">
+        {h5_name}:/topology
+      </DataItem>
+    </Topology>
+    <Geometry Name="geometry" GeometryType="XY">
+      <DataItem Dimensions="{len(coordinates)} 2" {float_item}>{h5_name}:/geometry</DataItem>
+    </Geometry>
+    <Grid Name="TimeSeries" GridType="Collection" CollectionType="Temporal">
+""")
+        for i in range(steps):
+            f.write(step_tpl.format(i=i))
+        f.write("""    </Grid>
+  </Domain>
+</Xdmf>
+""")
@@ -313,11 +313,7 @@ class ListVectorArray(VectorArrayInterface):
 
     def dot(self, other):
         assert self.space == other.space
-        R = np.empty((len(self._list), len(other)))
-        for i, a in enumerate(self._list):
-            for j, b in enumerate(other._list):
-                R[i, j] = a.dot(b)
-        return R
+        return self.space._dot_matrix(self._list, other._list)
 
     def pairwise_dot(self, other):
         assert self.space == other.space
@@ -325,15 +321,12 @@ class ListVectorArray(VectorArrayInterface):
         return np.array([a.dot(b) for a, b in zip(self._list, other._list)])
 
     def gramian(self, product=None):
-        if product is not None:
-            return super().gramian(product)
-        l = len(self._list)
-        R = np.empty((l, l))
-        for i in range(l):
-            for j in range(i, l):
-                R[i, j] = self._list[i].dot(self._list[j])
-                R[j, i] = R[i, j]
-        return R
+        if product is None:
+            return self.space._dot_matrix(self._list, self._list, symmetric=True)
+        assert self in product.source
+        MU = product.apply(self)
+        assert MU.space == self.space
+        return self.space._dot_matrix(self._list, MU._list, symmetric=True)
 
     def lincomb(self, coefficients):
         assert 1 <= coefficients.ndim <= 2
@@ -423,6 +416,21 @@ class ListVectorSpace(VectorSpaceInterface):
         assert count >= 0 and reserve >= 0
         return ListVectorArray([self.zero_vector() for _ in range(count)], self)
 
+    def _dot_matrix(self, left, right, symmetric=False):
+        """Matrix of inner products between two lists of vectors of this space.
+
+        If `symmetric` is `True`, the result is known to be symmetric, such that
+        only its upper triangle has to be computed. Override this method to batch
+        the computation using the facilities of the underlying solver.
+        """
+        R = np.empty((len(left), len(right)))
+        for i, a in enumerate(left):
+            for j in range(i if symmetric else 0, len(right)):
+                R[i, j] = a.dot(right[j])
+                if symmetric:
+                    R[j, i] = R[i, j]
+        return R
+
     @classinstancemethod
     def make_array(cls, obj, id_=None):
         if len(obj) == 0:
@@ -470,6 +478,14 @@ class NumpyListVectorSpace(ListVectorSpace):
     def vector_from_numpy(self, data, ensure_copy=False):
         return self.make_vector(data.copy() if ensure_copy else data)
 
+    def _dot_matrix(self, left, right, symmetric=False):
+        if len(left) == 0 or len(right) == 0:
+            return np.zeros((len(left), len(right)))
+        A = np.array([v._array for v in left])
+        B = A if right is left else np.array([v._array for v in right])
+        # for real data, NumPy computes A.dot(A.T) using BLAS syrk
+        return A.dot(B.T)
+
 
 class ListVectorArrayView(ListVectorArray):
 
@@ -0,0 +1,529 @@
+# This file is part of the pyMOR project (http://www.pymor.org).
+# Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
+
+"""Out-of-core |VectorArrays| backed by memory-mapped files.
+
+|MemmapVectorArrays| store their vectors in fixed-size blocks, each of which
+is a :class:`numpy.memmap` of an anonymous temporary file. Appending vectors
+only allocates new blocks, and all reductions (:meth:`~MemmapVectorArray.dot`,
+:meth:`~MemmapVectorArray.lincomb`, norms, ...) are computed block by block,
+so the memory footprint is bounded by a few blocks, independent of the number
+of vectors in the array. This allows, e.g., to compute a :func:`~pymor.algorithms.pod.pod`
+of snapshot sets which do not fit into main memory.
+"""
+
+import tempfile
+
+import numpy as np
+from scipy.sparse import issparse
+
+from pymor.core.interfaces import classinstancemethod
+from pymor.vectorarrays.interfaces import VectorArrayInterface, VectorSpaceInterface, _INDEXTYPES
+
+
+class MemmapVectorArray(VectorArrayInterface):
+    """|VectorArray| stored in blocks of memory-mapped files.
+
+    The vectors `i*block_size, ..., (i+1)*block_size - 1` are stored as
+    rows of the `i`-th block, where `block_size` is given by the
+    associated |MemmapVectorSpace|. The data type of the array is fixed
+    by the space.
+
+    Indexing returns a view which accesses the blocks of the original
+    array directly, without copying any data. As opposed to |NumpyVectorArray|,
+    :meth:`copy` always copies the data.
+    """
+
+    def __init__(self, space):
+        self.space = space
+        self._blocks = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, ind):
+        return MemmapVectorArrayView(self, ind)
+
+    def __delitem__(self, ind):
+        assert self.check_ind(ind)
+        ind = self._indices(ind)
+        remaining = np.setdiff1d(np.arange(self._len), ind)
+        blocks, length = self._blocks, self._len
+        self._blocks, self._len = [], 0
+        old = MemmapVectorArray(self.space)
+        old._blocks, old._len = blocks, length
+        self._append_chunks(old._chunks(remaining))
+
+    def _indices(self, ind):
+        if ind is None:
+            ind = slice(0, self._len)
+        if type(ind) is slice:
+            return np.arange(*ind.indices(self._len))
+        elif isinstance(ind, _INDEXTYPES):
+            return np.array([ind if 0 <= ind else self._len + ind])
+        else:
+            ind = np.array(ind, dtype=np.intp).reshape(-1)
+            ind[ind < 0] += self._len
+            return ind
+
+    def _runs(self, ind):
+        """Iterate over the vectors given by `ind` in runs of rows of a single block.
+
+        Yields tuples `(start, block, rows)` such that `block[rows]` are the vectors
+        `start, start+1, ...` of `self[ind]`. For contiguous index ranges, `rows`
+        is a slice, so `block[rows]` is a view into the memory-mapped data.
+        """
+        idx = self._indices(ind)
+        if len(idx) == 0:
+            return
+        block_size = self.space.block_size
+        block_idx, row_idx = np.divmod(idx, block_size)
+        splits = np.flatnonzero((np.diff(block_idx) != 0) | (np.diff(row_idx) != 1)) + 1
+        starts = np.concatenate(([0], splits))
+        stops = np.concatenate((splits, [len(idx)]))
+        pending_start, pending_block, pending_rows = None, None, []
+        for start, stop in zip(starts, stops):
+            b = block_idx[start]
+            if stop - start > 1 or pending_block is not None and pending_block != b:
+                if pending_rows:
+                    yield pending_start, self._blocks[pending_block], np.array(pending_rows)
+                    pending_start, pending_block, pending_rows = None, None, []
+            if stop - start > 1:
+                yield start, self._blocks[b], slice(row_idx[start], row_idx[stop - 1] + 1)
+            else:
+                if pending_start is None:
+                    pending_start, pending_block = start, b
+                pending_rows.append(row_idx[start])
+                if len(pending_rows) == block_size:
+                    yield pending_start, self._blocks[b], np.array(pending_rows)
+                    pending_start, pending_block, pending_rows = None, None, []
+        if pending_rows:
+            yield pending_start, self._blocks[pending_block], np.array(pending_rows)
+
+    def _chunks(self, ind=None):
+        """Iterate over `(start, data)` where `data` are the vectors `start, ...` of `self[ind]`."""
+        for start, block, rows in self._runs(ind):
+            yield start, block[rows]
+
+    def _new_block(self):
+        if self.dim == 0:
+            # empty files cannot be memory-mapped
+            self._blocks.append(np.zeros((self.space.block_size, 0), dtype=self.space.dtype))
+            return
+        with tempfile.TemporaryFile(dir=self.space.directory) as f:
+            block = np.memmap(f, dtype=self.space.dtype, mode='w+', shape=(self.space.block_size, self.dim))
+        self._blocks.append(block)
+
+    def _append_chunks(self, chunks):
+        block_size = self.space.block_size
+        for _, data in chunks:
+            pos = 0
+            while pos < len(data):
+                row = self._len % block_size
+                if row == 0 and self._len == len(self._blocks) * block_size:
+                    self._new_block()
+                count = min(len(data) - pos, block_size - row)
+                self._blocks[self._len // block_size][row:row + count] = data[pos:pos + count]
+                pos += count
+                self._len += count
+
+    def _zero_extend(self, count):
+        block_size = self.space.block_size
+        new_len = self._len + count
+        if self._len % block_size:
+            self._blocks[-1][self._len % block_size:] = 0
+        while len(self._blocks) * block_size < new_len:
+            self._new_block()
+        self._len = new_len
+
+    def to_numpy(self, ensure_copy=False, *, _ind=None):
+        result = np.empty((self.len_ind(_ind if _ind is not None else slice(None)), self.dim),
+                          dtype=self.space.dtype)
+        for start, data in self._chunks(_ind):
+            result[start:start + len(data)] = data
+        return result
+
+    def append(self, other, remove_from_other=False):
+        assert self.dim == other.dim
+        assert not remove_from_other or (other is not self and getattr(other, 'base', None) is not self)
+
+        if other is self or getattr(other, 'base', None) is self:
+            other = other.copy()
+        self._append_chunks(_chunks_of(other, 0, len(other)))
+
+        if remove_from_other:
+            if other.is_view:
+                del other.base[other.ind]
+            else:
+                del other[:]
+
+    def copy(self, deep=False, *, _ind=None):
+        C = MemmapVectorArray(self.space)
+        C._append_chunks(self._chunks(_ind))
+        return C
+
+    def _check_alpha(self, alpha, l):
+        assert isinstance(alpha, _INDEXTYPES) \
+            or isinstance(alpha, np.ndarray) and alpha.shape == (l,)
+        assert np.can_cast(np.result_type(alpha), self.space.dtype, casting='same_kind'), \
+            f'cannot cast {np.result_type(alpha)} to {self.space.dtype}'
+
+    def scal(self, alpha, *, _ind=None):
+        if _ind is None:
+            _ind = slice(0, self._len)
+        self._check_alpha(alpha, self.len_ind(_ind))
+
+        for start, block, rows in self._runs(_ind):
+            if type(alpha) is np.ndarray:
+                block[rows] *= alpha[start:start + _len_rows(rows), np.newaxis]
+            else:
+                block[rows] *= alpha
+
+    def axpy(self, alpha, x, *, _ind=None):
+        if _ind is None:
+            _ind = slice(0, self._len)
+        assert self.dim == x.dim
+        l = self.len_ind(_ind)
+        self._check_alpha(alpha, l)
+        assert l == len(x) or len(x) == 1
+
+        if len(x) == 1:
+            x_data = x.to_numpy()
+        elif getattr(x, 'base', x) is self:
+            x = x.copy()
+        for start, block, rows in self._runs(_ind):
+            stop = start + _len_rows(rows)
+            data = x_data if len(x) == 1 else _rows_of(x, start, stop)
+            if type(alpha) is np.ndarray:
+                block[rows] += alpha[start:stop, np.newaxis] * data
+            else:
+                block[rows] += alpha * data
+
+    def dot(self, other, *, _ind=None):
+        assert self.dim == other.dim
+        if _ind is None:
+            _ind = slice(0, self._len)
+
+        result = _BlockResult((self.len_ind(_ind), len(other)))
+        runs = list(self._runs(_ind))
+        if (isinstance(other, MemmapVectorArray) and getattr(other, 'base', other) is self
+                and _same_ind(self.normalize_ind(_ind), getattr(other, 'ind', slice(0, self._len, 1)))):
+            # Gramian: only compute the upper triangular blocks
+            for k, (i, block, rows) in enumerate(runs):
+                A = block[rows].conj()
+                i_stop = i + len(A)
+                for j, block_j, rows_j in runs[k:]:
+                    j_stop = j + _len_rows(rows_j)
+                    G = A.dot(block_j[rows_j].T)
+                    result.set(i, i_stop, j, j_stop, values=G)
+                    if j > i:
+                        result.set(j, j_stop, i, i_stop, values=G.T.conj())
+        else:
+            other_bounds = list(_chunk_bounds(other))
+            for i, block, rows in runs:
+                A = block[rows].conj()
+                i_stop = i + len(A)
+                for j, j_stop in other_bounds:
+                    result.set(i, i_stop, j, j_stop, values=A.dot(_rows_of(other, j, j_stop).T))
+        return result.array
+
+    def pairwise_dot(self, other, *, _ind=None):
+        assert self.dim == other.dim
+        if _ind is None:
+            _ind = slice(0, self._len)
+        l = self.len_ind(_ind)
+        assert l == len(other)
+
+        result = _BlockResult((l,))
+        for start, A in self._chunks(_ind):
+            stop = start + len(A)
+            result.set(start, stop, values=np.sum(A.conj() * _rows_of(other, start, stop), axis=1))
+        return result.array
+
+    def lincomb(self, coefficients, *, _ind=None):
+        if _ind is None:
+            _ind = slice(0, self._len)
+        assert 1 <= coefficients.ndim <= 2
+        if coefficients.ndim == 1:
+            coefficients = coefficients[np.newaxis, ...]
+        assert coefficients.shape[1] == self.len_ind(_ind)
+
+        block_size = self.space.block_size
+        result = self.space.zeros(len(coefficients))
+        for r in range(0, len(coefficients), block_size):
+            coeffs = coefficients[r:r + block_size]
+            assert np.can_cast(coeffs.dtype, self.space.dtype, casting='same_kind')
+            acc = np.zeros((len(coeffs), self.dim), dtype=np.promote_types(self.space.dtype, coeffs.dtype))
+            for start, A in self._chunks(_ind):
+                acc += coeffs[:, start:start + len(A)].dot(A)
+            result._blocks[r // block_size][:len(coeffs)] = acc
+        return result
+
+    def _reduce(self, func, _ind):
+        if _ind is None:
+            _ind = slice(0, self._len)
+        result = np.empty(self.len_ind(_ind))
+        for start, A in self._chunks(_ind):
+            result[start:start + len(A)] = func(A)
+        return result
+
+    def l1_norm(self, *, _ind=None):
+        return self._reduce(lambda A: np.linalg.norm(A, ord=1, axis=1), _ind)
+
+    def l2_norm(self, *, _ind=None):
+        return self._reduce(lambda A: np.linalg.norm(A, axis=1), _ind)
+
+    def l2_norm2(self, *, _ind=None):
+        return self._reduce(lambda A: np.sum((A * A.conj()).real, axis=1), _ind)
+
+    def sup_norm(self, *, _ind=None):
+        if self.dim == 0:
+            if _ind is None:
+                _ind = slice(0, self._len)
+            return np.zeros(self.len_ind(_ind))
+        else:
+            _, max_val = self.amax(_ind=_ind)
+            return max_val
+
+    def dofs(self, dof_indices, *, _ind=None):
+        if _ind is None:
+            _ind = slice(0, self._len)
+        assert isinstance(dof_indices, list) or isinstance(dof_indices, np.ndarray) and dof_indices.ndim == 1
+        dof_indices = np.array(dof_indices, dtype=np.intp)
+        assert len(dof_indices) == 0 or 0 <= np.min(dof_indices) and np.max(dof_indices) < self.dim
+
+        result = np.empty((self.len_ind(_ind), len(dof_indices)), dtype=self.space.dtype)
+        for start, A in self._chunks(_ind):
+            result[start:start + len(A)] = A[:, dof_indices]
+        return result
+
+    def amax(self, *, _ind=None):
+        if _ind is None:
+            _ind = slice(0, self._len)
+        assert self.dim > 0
+
+        max_ind = np.empty(self.len_ind(_ind), dtype=np.intp)
+        max_val = np.empty(self.len_ind(_ind))
+        for start, A in self._chunks(_ind):
+            A = np.abs(A)
+            stop = start + len(A)
+            max_ind[start:stop] = np.argmax(A, axis=1)
+            max_val[start:stop] = A[np.arange(len(A)), max_ind[start:stop]]
+        return max_ind, max_val
+
+    def __repr__(self):
+        return f'MemmapVectorArray(<{len(self)} vectors>, {self.space})'
+
+
+class MemmapVectorSpace(VectorSpaceInterface):
+    """|VectorSpace| of |MemmapVectorArrays|.
+
+    Parameters
+    ----------
+    dim
+        The dimension of the vectors contained in the space.
+    id_
+        See :attr:`~pymor.vectorarrays.interfaces.VectorSpaceInterface.id`.
+    block_size
+        Number of vectors stored in each memory-mapped block. If `None`,
+        the block size is chosen such that each block has a size of
+        roughly `block_bytes`.
+    directory
+        Directory in which the (anonymous) block files are created. If
+        `None`, the system's default temporary directory is used.
+    dtype
+        The data type of the vector entries.
+    block_bytes
+        Target size of a single block in bytes if `block_size` is `None`.
+    """
+
+    def __init__(self, dim, id_=None, block_size=None, directory=None, dtype=np.float64, block_bytes=2**26):
+        dtype = np.dtype(dtype)
+        if block_size is None:
+            block_size = max(1, block_bytes // max(dim * dtype.itemsize, 1))
+        assert block_size > 0
+        self.dim = dim
+        self.id = id_
+        self.block_size = block_size
+        self.directory = directory
+        self.dtype = dtype
+
+    def __eq__(self, other):
+        return (type(other) is type(self) and self.dim == other.dim and self.id == other.id
+                and self.dtype == other.dtype)
+
+    def __hash__(self):
+        return hash(self.dim) + hash(self.id)
+
+    def zeros(self, count=1, reserve=0):
+        assert count >= 0
+        assert reserve >= 0
+        va = MemmapVectorArray(self)
+        va._zero_extend(count)
+        return va
+
+    @classinstancemethod
+    def make_array(cls, obj, id_=None, **kwargs):
+        return cls._array_factory(obj, id_=id_, **kwargs)
+
+    @make_array.instancemethod
+    def make_array(self, obj):
+        return self._array_factory(obj, space=self)
+
+    @classinstancemethod
+    def from_numpy(cls, data, id_=None, ensure_copy=False, **kwargs):
+        return cls._array_factory(data, id_=id_, **kwargs)
+
+    @from_numpy.instancemethod
+    def from_numpy(self, data, ensure_copy=False):
+        return self._array_factory(data, space=self)
+
+    def from_vectorarray(self, U):
+        """Copy the vectors of any |VectorArray| blockwise into a new |MemmapVectorArray|."""
+        assert U.dim == self.dim
+        va = MemmapVectorArray(self)
+        va._append_chunks(_chunks_of(U, 0, len(U)))
+        return va
+
+    @classmethod
+    def _array_factory(cls, array, space=None, id_=None, **kwargs):
+        if issparse(array):
+            array = array.toarray()
+        elif not isinstance(array, np.ndarray):
+            array = np.array(array, ndmin=2)
+        if array.ndim != 2:
+            assert array.ndim == 1
+            array = np.reshape(array, (1, -1))
+        if space is None:
+            space = cls(array.shape[1], id_, dtype=array.dtype, **kwargs)
+        else:
+            assert array.shape[1] == space.dim
+        va = MemmapVectorArray(space)
+        va._append_chunks([(0, array)])
+        return va
+
+    def __repr__(self):
+        return f'MemmapVectorSpace({self.dim})' if self.id is None \
+            else f'MemmapVectorSpace({self.dim}, {self.id})'
+
+
+class MemmapVectorArrayView(MemmapVectorArray):
+
+    is_view = True
+
+    def __init__(self, array, ind):
+        assert array.check_ind(ind)
+        self.base = array
+        self.ind = array.normalize_ind(ind)
+        self.space = array.space
+
+    def __len__(self):
+        return self.base.len_ind(self.ind)
+
+    def __getitem__(self, ind):
+        return self.base[self.base.sub_index(self.ind, ind)]
+
+    def __delitem__(self, ind):
+        raise ValueError('Cannot remove from MemmapVectorArrayView')
+
+    def append(self, other, remove_from_other=False):
+        raise ValueError('Cannot append to MemmapVectorArrayView')
+
+    def to_numpy(self, ensure_copy=False):
+        return self.base.to_numpy(_ind=self.ind)
+
+    def copy(self, deep=False):
+        return self.base.copy(_ind=self.ind, deep=deep)
+
+    def _chunks(self, ind=None):
+        assert ind is None
+        return self.base._chunks(self.ind)
+
+    def scal(self, alpha):
+        assert self.base.check_ind_unique(self.ind)
+        self.base.scal(alpha, _ind=self.ind)
+
+    def axpy(self, alpha, x):
+        assert self.base.check_ind_unique(self.ind)
+        self.base.axpy(alpha, x, _ind=self.ind)
+
+    def dot(self, other):
+        return self.base.dot(other, _ind=self.ind)
+
+    def pairwise_dot(self, other):
+        return self.base.pairwise_dot(other, _ind=self.ind)
+
+    def lincomb(self, coefficients):
+        return self.base.lincomb(coefficients, _ind=self.ind)
+
+    def l1_norm(self):
+        return self.base.l1_norm(_ind=self.ind)
+
+    def l2_norm(self):
+        return self.base.l2_norm(_ind=self.ind)
+
+    def l2_norm2(self):
+        return self.base.l2_norm2(_ind=self.ind)
+
+    def sup_norm(self):
+        return self.base.sup_norm(_ind=self.ind)
+
+    def dofs(self, dof_indices):
+        return self.base.dofs(dof_indices, _ind=self.ind)
+
+    def amax(self):
+        return self.base.amax(_ind=self.ind)
+
+    def __repr__(self):
+        return f'MemmapVectorArrayView(<{len(self)} vectors>, {self.space})'
+
+
+def _len_rows(rows):
+    return rows.stop - rows.start if type(rows) is slice else len(rows)
+
+
+class _BlockResult:
+    """Result |NumPy array| assembled from blocks, with dtype determined by the blocks."""
+
+    def __init__(self, shape):
+        self.array = np.zeros(shape)
+
+    def set(self, *bounds, values):
+        if self.array.dtype != values.dtype:
+            self.array = self.array.astype(np.promote_types(self.array.dtype, values.dtype))
+        self.array[tuple(slice(a, b) for a, b in zip(bounds[::2], bounds[1::2]))] = values
+
+
+def _same_ind(ind1, ind2):
+    if type(ind1) is slice and type(ind2) is slice:
+        return (ind1.start, ind1.stop, ind1.step or 1) == (ind2.start, ind2.stop, ind2.step or 1)
+    return type(ind1) is type(ind2) and ind1 == ind2
+
+
+def _chunk_bounds(U):
+    """Split `range(len(U))` into intervals matching the blocks of `U` (if any)."""
+    if isinstance(U, MemmapVectorArray):
+        for start, block, rows in (U.base if U.is_view else U)._runs(U.ind if U.is_view else None):
+            yield start, start + _len_rows(rows)
+    else:
+        yield 0, len(U)
+
+
+def _rows_of(U, start, stop):
+    """Return the vectors `start, ..., stop-1` of `U` as a |NumPy array|."""
+    if isinstance(U, MemmapVectorArray):
+        if U.is_view:
+            return U.base.to_numpy(_ind=U.base.sub_index(U.ind, slice(start, stop)))
+        return U.to_numpy(_ind=slice(start, stop))
+    return U[start:stop].to_numpy()
+
+
+def _chunks_of(U, start, stop):
+    if isinstance(U, MemmapVectorArray):
+        ind = slice(start, stop)
+        if U.is_view:
+            return U.base._chunks(U.base.sub_index(U.ind, ind))
+        return U._chunks(ind)
+    return [(0, U[start:stop].to_numpy())]
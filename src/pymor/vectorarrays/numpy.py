@@ -6,6 +6,7 @@ import numpy as np
 from scipy.sparse import issparse
 
 from pymor.core import NUMPY_INDEX_QUIRK
+from pymor.core.defaults import defaults
 from pymor.core.interfaces import classinstancemethod
 from pymor.vectorarrays.interfaces import VectorArrayInterface, VectorSpaceInterface, _INDEXTYPES
 
@@ -176,6 +177,35 @@ class NumpyVectorArray(VectorArrayInterface):
         # .conj() is a no-op on non-complex data types
         return A.conj().dot(B.T)
 
+    def inner(self, other, product=None, *, _ind=None):
+        if product is None:
+            return self.dot(other, _ind=_ind)
+        matrix = _product_matrix(product)
+        if matrix is None or not isinstance(other, NumpyVectorArray):
+            return product.apply2(self if _ind is None else NumpyVectorArrayView(self, _ind), other)
+        if _ind is None:
+            _ind = slice(0, self._len)
+        assert self in product.range and other in product.source
+
+        A = self._array[_ind]
+        B = other.base._array[other.ind] if other.is_view else other._array[:other._len]
+        return _blocked_inner(A, matrix, B)
+
+    def gramian(self, product=None, *, _ind=None):
+        matrix = None if product is None else _product_matrix(product)
+        if product is not None and matrix is None:
+            V = self if _ind is None else NumpyVectorArrayView(self, _ind)
+            return product.apply2(V, V)
+        if _ind is None:
+            _ind = slice(0, self._len)
+
+        A = self._array[_ind]
+        if matrix is None:
+            # for real data, NumPy computes A.dot(A.T) using BLAS syrk
+            return A.conj().dot(A.T)
+        assert self in product.source and self in product.range
+        return _blocked_inner(A, matrix, A, hermitian=True)
+
     def pairwise_dot(self, other, *, _ind=None):
         if _ind is None:
             _ind = slice(0, self._len)
@@ -336,6 +366,50 @@ class NumpyVectorArray(VectorArrayInterface):
         return NumpyVectorArray(-self._array[:self._len], self.space)
 
 
+@defaults('block_bytes')
+def inner_options(block_bytes=2**26):
+    """Options for the computation of inner products w.r.t. product matrices.
+
+    Parameters
+    ----------
+    block_bytes
+        Maximum size in bytes of the blocks of `M U` computed at once, where
+        `M` is the matrix of the product and `U` the second factor.
+    """
+    return {'block_bytes': block_bytes}
+
+
+def _product_matrix(product):
+    from pymor.operators.numpy import NumpyMatrixBasedOperator
+    if isinstance(product, NumpyMatrixBasedOperator) and not product.parametric:
+        return product.assemble().matrix
+    return None
+
+
+def _blocked_inner(A, matrix, B, hermitian=False):
+    """Compute `A^H M B` without forming `M B` for all vectors at once.
+
+    If `hermitian` is `True`, `A` and `B` are assumed to be identical and `M` to be
+    Hermitian, such that only the lower block triangle of the result has to be computed.
+    """
+    dtype = np.promote_types(np.promote_types(A.dtype, B.dtype), matrix.dtype)
+    R = np.empty((len(A), len(B)), dtype=dtype)
+    if len(A) == 0 or len(B) == 0:
+        R[...] = 0
+        return R
+    AH = A.conj().T
+    block_size = max(1, inner_options()['block_bytes'] // (B.shape[1] * dtype.itemsize))
+    for start in range(0, len(B), block_size):
+        stop = min(start + block_size, len(B))
+        MB = matrix.dot(B[start:stop].T)
+        if hermitian:
+            R[start:stop, :stop] = MB.T.dot(AH[:, :stop]).conj()
+            R[:start, start:stop] = R[start:stop, :start].T.conj()
+        else:
+            R[:, start:stop] = AH.T.dot(MB)
+    return R
+
+
 class NumpyVectorSpace(VectorSpaceInterface):
     """|VectorSpace| of |NumpyVectorArrays|.
 
@@ -469,6 +543,12 @@ class NumpyVectorArrayView(NumpyVectorArray):
     def dot(self, other):
         return self.base.dot(other, _ind=self.ind)
 
+    def inner(self, other, product=None):
+        return self.base.inner(other, product, _ind=self.ind)
+
+    def gramian(self, product=None):
+        return self.base.gramian(product, _ind=self.ind)
+
     def pairwise_dot(self, other):
         return self.base.pairwise_dot(other, _ind=self.ind)
 
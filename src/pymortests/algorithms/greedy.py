@@ -0,0 +1,57 @@
+# This file is part of the pyMOR project (http://www.pymor.org).
+# Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
+
+import numpy as np
+import pytest
+
+from pymor.algorithms.greedy import greedy
+from pymor.analyticalproblems.thermalblock import thermal_block_problem
+from pymor.discretizers.cg import discretize_stationary_cg
+from pymor.parallel.dummy import dummy_pool
+from pymor.parameters.functionals import ExpressionParameterFunctional
+from pymor.reductors.coercive import CoerciveRBReductor
+from pymortests.base import runmodule
+
+
+def _thermalblock_setup():
+    fom, _ = discretize_stationary_cg(thermal_block_problem((2, 2)), diameter=1/10)
+    fom.disable_caching()
+    reductor = CoerciveRBReductor(
+        fom, product=fom.h1_0_semi_product,
+        coercivity_estimator=ExpressionParameterFunctional('min(diffusion)', fom.parameter_type)
+    )
+    samples = fom.parameter_space.sample_uniformly(3)
+    return fom, reductor, samples
+
+
+@pytest.mark.parametrize('batch_size', [1, 3])
+def test_greedy(batch_size):
+    fom, reductor, samples = _thermalblock_setup()
+    result = greedy(fom, reductor, samples, max_extensions=3, pool=dummy_pool, batch_size=batch_size)
+    assert result['extensions'] == 3
+    assert len(reductor.bases['RB']) == 3 * batch_size
+    assert np.all(np.diff(result['max_errs']) < 0)
+
+
+def test_lazy_greedy():
+    fom, reductor, samples = _thermalblock_setup()
+    result = greedy(fom, reductor, samples, max_extensions=3)
+    fom, lazy_reductor, samples = _thermalblock_setup()
+    lazy_result = greedy(fom, lazy_reductor, samples, max_extensions=3, lazy=True)
+    assert lazy_result['extensions'] == 3
+    assert lazy_result['max_errs'][0] == result['max_errs'][0]
+    assert np.all(np.diff(lazy_result['max_errs']) < 0)
+
+
+def test_greedy_coarse_samples():
+    fom, reductor, samples = _thermalblock_setup()
+    atol = 1e-1
+    result = greedy(fom, reductor, samples, coarse_samples=samples[::4], atol=atol, lazy=True)
+    assert result['max_errs'][-1] <= atol
+    rom = result['rom']
+    assert max(rom.estimate(rom.solve(mu), mu)[0] for mu in samples) <= atol
+
+
+if __name__ == "__main__":
+    runmodule(filename=__file__)
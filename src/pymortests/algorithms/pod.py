@@ -0,0 +1,40 @@
+# This file is part of the pyMOR project (http://www.pymor.org).
+# Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
+
+import numpy as np
+import pytest
+
+from pymor.algorithms.pod import pod
+from pymor.operators.numpy import NumpyMatrixOperator
+from pymor.vectorarrays.numpy import NumpyVectorSpace
+from pymortests.base import runmodule
+
+
+@pytest.mark.parametrize('method', ['method_of_snapshots_blocked', 'randomized'])
+@pytest.mark.parametrize('with_product', [False, True])
+def test_pod_methods(method, with_product):
+    np.random.seed(0)
+    A = NumpyVectorSpace.from_numpy(np.random.random((40, 6)) @ np.diag(2.**-np.arange(6)) @ np.random.random((6, 50)))
+    if with_product:
+        M = np.random.random((50, 50))
+        product = NumpyMatrixOperator(M @ M.T + 50 * np.eye(50))
+    else:
+        product = None
+
+    U, s = pod(A, product=product)
+    U2, s2 = pod(A, product=product, method=method, block_size=7)
+    assert len(U2) == len(U) == 6
+    assert np.allclose(s2, s)
+    assert np.allclose(np.abs(U2.inner(U, product)), np.eye(6), atol=1e-6)
+
+    U3, s3 = pod(A, modes=3, product=product, method=method, block_size=7)
+    assert np.allclose(s3, s[:3])
+
+    l2_err = 0.1 * s[2]
+    U4, s4 = pod(A, product=product, method=method, l2_err=l2_err)
+    assert len(U4) == len(pod(A, product=product, l2_err=l2_err)[0])
+
+
+if __name__ == "__main__":
+    runmodule(filename=__file__)
@@ -2,8 +2,347 @@
 # Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
+"""Benchmarks for performance critical parts of pyMOR.
+
+By default, each benchmark is only run once for its smallest problem size
+to ensure that the benchmarked code works. To actually benchmark, set the
+environment variable `PYMOR_BENCHMARK_JSON` to the name of a file to which
+the timings are written::
+
+    PYMOR_BENCHMARK_JSON=new.json py.test src/pymortests/benchmarks.py
+
+To catch regressions, set `PYMOR_BENCHMARK_COMPARE` to the name of a file
+written by a previous run. A benchmark then fails when its median run time
+exceeds the recorded median by more than a factor of
+`1 + PYMOR_BENCHMARK_TOLERANCE` (default: 0.2). The number of timed rounds
+per benchmark is controlled by `PYMOR_BENCHMARK_ROUNDS` (default: 5).
+"""
+
+import json
+import os
+import platform
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+import pytest
+import scipy
+import scipy.sparse as sps
+
+from pymor.algorithms.gram_schmidt import gram_schmidt
+from pymor.algorithms.greedy import greedy
+from pymor.algorithms.hapod import dist_vectorarray_hapod
+from pymor.algorithms.pod import pod
+from pymor.analyticalproblems.instationary import InstationaryProblem
+from pymor.analyticalproblems.thermalblock import thermal_block_problem
+from pymor.core.cache import CacheableInterface, MemoryRegion, cache_regions, cached
+from pymor.discretizers.cg import discretize_instationary_cg, discretize_stationary_cg
+from pymor.discretizers.fv import discretize_stationary_fv
+from pymor.functions.basic import ConstantFunction
+from pymor.grids.rect import RectGrid
+from pymor.grids.tria import TriaGrid
+from pymor.grids.unstructured import UnstructuredTriangleGrid
+from pymor.models.iosys import LTIModel
+from pymor.parameters.base import Parameter
+from pymor.parameters.functionals import ExpressionParameterFunctional
+from pymor.reductors.coercive import CoerciveRBReductor
+from pymor.vectorarrays.list import NumpyListVectorSpace
+from pymor.vectorarrays.numpy import NumpyVectorSpace
 from pymortests.base import runmodule
 
 
+BENCHMARK_JSON = os.environ.get('PYMOR_BENCHMARK_JSON')
+BENCHMARK_COMPARE = os.environ.get('PYMOR_BENCHMARK_COMPARE')
+BENCHMARK_TOLERANCE = float(os.environ.get('PYMOR_BENCHMARK_TOLERANCE', 0.2))
+BENCHMARK_ROUNDS = int(os.environ.get('PYMOR_BENCHMARK_ROUNDS', 5))
+BENCHMARKING = bool(BENCHMARK_JSON or BENCHMARK_COMPARE)
+
+
+def sizes(*values):
+    """Parametrization of problem sizes where only the first size is used when not benchmarking."""
+    skip = pytest.mark.skipif(not BENCHMARKING, reason='PYMOR_BENCHMARK_JSON/COMPARE not set')
+    return [pytest.param(*(v if isinstance(v, tuple) else (v,)), marks=() if i == 0 else skip)
+            for i, v in enumerate(values)]
+
+
+class Benchmark:
+    """Times a function and records the result under the name of the running test."""
+
+    def __init__(self, name, results, baseline):
+        self.name = name
+        self.results = results
+        self.baseline = baseline
+
+    def __call__(self, func, setup=None, throughput=None):
+        """Time `func`.
+
+        Parameters
+        ----------
+        func
+            The function to benchmark.
+        setup
+            If not `None`, a function called before each round whose return
+            value is passed as positional arguments to `func`. The time
+            spent in `setup` is not recorded.
+        throughput
+            If not `None`, the number of items processed by a call of `func`.
+
+        Returns
+        -------
+        The return value of the last call of `func`.
+        """
+        rounds = BENCHMARK_ROUNDS if BENCHMARKING else 1
+        if BENCHMARKING:  # warm-up
+            func(*(setup() if setup else ()))
+        times = []
+        for _ in range(rounds):
+            args = setup() if setup else ()
+            start = perf_counter()
+            result = func(*args)
+            times.append(perf_counter() - start)
+
+        times = np.array(times)
+        median = float(np.median(times))
+        self.results[self.name] = {'rounds': rounds,
+                                   'min': float(times.min()),
+                                   'max': float(times.max()),
+                                   'mean': float(times.mean()),
+                                   'median': median,
+                                   'stddev': float(times.std()),
+                                   'throughput': None if throughput is None else throughput / median}
+
+        if self.name in self.baseline:
+            limit = self.baseline[self.name]['median'] * (1 + BENCHMARK_TOLERANCE)
+            if median > limit:
+                pytest.fail(f'{self.name} regressed: median time {median:.3g}s exceeds '
+                            f'{limit:.3g}s (baseline {self.baseline[self.name]["median"]:.3g}s)')
+
+        return result
+
+
+def _load_baseline():
+    if not BENCHMARK_COMPARE:
+        return {}
+    with open(BENCHMARK_COMPARE) as f:
+        return json.load(f)['benchmarks']
+
+
+@pytest.fixture(scope='module')
+def benchmark_results():
+    results = {}
+    yield results
+    if BENCHMARK_JSON:
+        import pymor
+        machine_info = {'pymor': pymor.__version__,
+                        'numpy': np.__version__,
+                        'scipy': scipy.__version__,
+                        'python': platform.python_version(),
+                        'machine': platform.machine(),
+                        'node': platform.node(),
+                        'cpu_count': os.cpu_count(),
+                        'datetime': datetime.now().isoformat()}
+        with open(BENCHMARK_JSON, 'w') as f:
+            json.dump({'machine_info': machine_info, 'benchmarks': results}, f, indent=2, sort_keys=True)
+
+
+@pytest.fixture(scope='module')
+def benchmark_baseline():
+    return _load_baseline()
+
+
+@pytest.fixture
+def benchmark(request, benchmark_results, benchmark_baseline):
+    return Benchmark(request.node.name, benchmark_results, benchmark_baseline)
+
+
+def _random_array(space_type, dim, count, seed=0):
+    np.random.seed(seed)
+    space = NumpyVectorSpace(dim) if space_type == 'numpy' else NumpyListVectorSpace(dim)
+    return space.from_numpy(np.random.random((count, dim)))
+
+
+def _thermalblock_fom(num_intervals, grid_type=RectGrid):
+    fom, _ = discretize_stationary_cg(thermal_block_problem((2, 2)), diameter=np.sqrt(2) / num_intervals,
+                                      grid_type=grid_type)
+    fom.disable_caching()
+    return fom
+
+
+@pytest.mark.parametrize('dim,count', sizes((1000, 10), (100000, 100)))
+@pytest.mark.parametrize('kernel', ['axpy', 'dot', 'lincomb', 'gramian', 'append', 'delitem'])
+@pytest.mark.parametrize('space_type', ['numpy', 'list'])
+def test_vectorarray_kernel(benchmark, space_type, kernel, dim, count):
+    U = _random_array(space_type, dim, count)
+    copy = lambda: (U.copy(deep=True),)
+    if kernel == 'axpy':
+        alpha = np.linspace(0., 1., count)
+        benchmark(lambda V: V.axpy(alpha, U), setup=copy, throughput=count)
+    elif kernel == 'dot':
+        benchmark(lambda: U.dot(U), throughput=count * count)
+    elif kernel == 'lincomb':
+        coefficients = np.random.random((count, count))
+        benchmark(lambda: U.lincomb(coefficients), throughput=count * count)
+    elif kernel == 'gramian':
+        benchmark(lambda: U.gramian(), throughput=count * count)
+    elif kernel == 'append':
+        def append(V):
+            V.append(U)
+        benchmark(append, setup=copy, throughput=count)
+    elif kernel == 'delitem':
+        def delitem(V):
+            del V[::2]
+        benchmark(delitem, setup=copy, throughput=count // 2)
+
+
+@pytest.mark.parametrize('dim,count', sizes((1000, 20), (100000, 200)))
+def test_gram_schmidt(benchmark, dim, count):
+    U = _random_array('numpy', dim, count)
+    benchmark(lambda: gram_schmidt(U), throughput=count)
+
+
+@pytest.mark.parametrize('dim,count', sizes((1000, 20), (100000, 200)))
+def test_pod(benchmark, dim, count):
+    U = _random_array('numpy', dim, count)
+    benchmark(lambda: pod(U, rtol=1e-7), throughput=count)
+
+
+@pytest.mark.parametrize('dim,count', sizes((1000, 20), (100000, 200)))
+def test_hapod(benchmark, dim, count):
+    U = _random_array('numpy', dim, count)
+    benchmark(lambda: dist_vectorarray_hapod(4, U, 1e-4 * np.sqrt(count), 0.9), throughput=count)
+
+
+@pytest.mark.parametrize('num_intervals', sizes(10, 300))
+@pytest.mark.parametrize('grid_type', [RectGrid, TriaGrid])
+@pytest.mark.parametrize('discretizer', [discretize_stationary_cg, discretize_stationary_fv])
+def test_assembly(benchmark, discretizer, grid_type, num_intervals):
+    problem = thermal_block_problem((2, 2))
+    mu = problem.parameter_space.sample_randomly(1, seed=0)[0]
+
+    def assemble():
+        fom, _ = discretizer(problem, diameter=np.sqrt(2) / num_intervals, grid_type=grid_type)
+        return fom.operator.assemble(mu), fom.rhs.assemble(mu)
+
+    benchmark(assemble)
+
+
+@pytest.mark.parametrize('num_intervals', sizes(10, 500, 1581))
+@pytest.mark.parametrize('grid_type', [TriaGrid, UnstructuredTriangleGrid])
+def test_grid_topology(benchmark, grid_type, num_intervals):
+    def setup():
+        grid = TriaGrid(num_intervals=(num_intervals, num_intervals))
+        if grid_type is UnstructuredTriangleGrid:
+            grid = UnstructuredTriangleGrid(grid.centers(2), grid.subentities(0, 2))
+        return (grid,)
+
+    def build_topology(grid):
+        grid.subentities(1, 2)
+        grid.neighbours(0, 0)
+        grid.neighbours(0, 0, 2)
+        grid.boundaries(2)
+
+    benchmark(build_topology, setup=setup, throughput=4 * num_intervals**2)
+
+
+@pytest.mark.parametrize('num_intervals,nt', sizes((10, 10), (200, 100)))
+def test_implicit_euler_thermalblock(benchmark, num_intervals, nt):
+    problem = InstationaryProblem(thermal_block_problem((2, 2)), initial_data=ConstantFunction(0., dim_domain=2),
+                                  T=1.)
+    fom, _ = discretize_instationary_cg(problem, diameter=np.sqrt(2) / num_intervals, nt=nt)
+    fom.disable_caching()
+    mu = fom.parameter_space.sample_randomly(1, seed=0)[0]
+    benchmark(lambda: fom.solve(mu), throughput=nt)
+
+
+@pytest.mark.parametrize('num_intervals,num_samples', sizes((10, 2), (100, 4)))
+def test_greedy_thermalblock(benchmark, num_intervals, num_samples):
+    fom = _thermalblock_fom(num_intervals)
+    training_set = fom.parameter_space.sample_uniformly(num_samples)
+    coercivity_estimator = ExpressionParameterFunctional('min(diffusion)', fom.parameter_type)
+
+    def setup():
+        return (CoerciveRBReductor(fom, product=fom.h1_0_semi_product, coercivity_estimator=coercivity_estimator),)
+
+    benchmark(lambda reductor: greedy(fom, reductor, training_set, max_extensions=10), setup=setup)
+
+
+@pytest.mark.parametrize('num_intervals', sizes(10, 300))
+def test_generate_sid(benchmark, num_intervals):
+    benchmark(lambda fom: fom.generate_sid(), setup=lambda: (_thermalblock_fom(num_intervals),))
+
+
+class _CachedSquare(CacheableInterface):
+
+    def __init__(self, cache_region):
+        self.cache_region = cache_region
+
+    @cached
+    def square(self, x):
+        return x * x
+
+
+@pytest.mark.parametrize('count', sizes(100, 10000))
+@pytest.mark.parametrize('key_type', ['int', 'array'])
+def test_cache_lookup(benchmark, key_type, count):
+    # use a dedicated region which holds all keys, such that every call is a cache hit
+    cache_regions['benchmark_lookup'] = MemoryRegion(max_keys=count)
+    try:
+        obj = _CachedSquare('benchmark_lookup')
+        keys = list(range(count)) if key_type == 'int' else [np.full(10, i) for i in range(count)]
+        for k in keys:
+            obj.square(k)
+
+        def lookup():
+            for k in keys:
+                obj.square(k)
+
+        benchmark(lookup, throughput=count)
+        assert cache_regions['benchmark_lookup'].stats()['misses'] == count
+    finally:
+        del cache_regions['benchmark_lookup']
+
+
+class _CachedParameterFunction(CacheableInterface):
+
+    def __init__(self):
+        self.cache_region = 'memory'
+
+    @cached
+    def value(self, mu):
+        return mu['k'][0]
+
+    def uncached_value(self, mu):
+        return mu['k'][0]
+
+
+@pytest.mark.parametrize('count', sizes(100, 20000))
+@pytest.mark.parametrize('call', ['cached', 'cached_method_call'])
+def test_cache_key(benchmark, call, count):
+    obj = _CachedParameterFunction()
+    mu = Parameter({'diffusion': np.arange(4.), 'k': np.array([1.])})
+    if call == 'cached':
+        f = obj.value
+    else:
+        def f(mu):
+            return obj.cached_method_call(obj.uncached_value, mu)
+    f(mu)
+
+    def lookup():
+        for _ in range(count):
+            f(mu)
+
+    benchmark(lookup, throughput=count)
+
+
+@pytest.mark.parametrize('order,num_freqs', sizes((100, 10), (10000, 100)))
+def test_lti_bode(benchmark, order, num_freqs):
+    A = sps.diags([np.ones(order - 1), -2 * np.ones(order), np.ones(order - 1)], [-1, 0, 1], format='csc')
+    B = np.ones((order, 1))
+    C = np.ones((1, order))
+    lti = LTIModel.from_matrices(A * (order + 1)**2, B, C, cache_region=None)
+    w = np.logspace(-1, 3, num_freqs)
+    benchmark(lambda: lti.bode(w), throughput=num_freqs)
+
+
 if __name__ == "__main__":
     runmodule(filename=__file__)
@@ -104,6 +104,73 @@ class TestCache(TestInterface):
                 backend.set('mykey', 2)
                 assert backend.get('mykey') == (True, 1)
 
+    def test_memory_region_lru(self):
+        region = cache.MemoryRegion(max_keys=2)
+        region.set('a', 1)
+        region.set('b', 2)
+        assert region.get('a') == (True, 1)
+        region.set('c', 3)
+        assert region.get('b') == (False, None)
+        assert region.get('a') == (True, 1)
+        assert region.get('c') == (True, 3)
+        stats = region.stats()
+        assert stats['hits'] == 3 and stats['misses'] == 1 and stats['evictions'] == 1 and stats['keys'] == 2
+
+    def test_memory_region_max_size(self):
+        import numpy as np
+        region = cache.MemoryRegion(max_keys=100, max_size=2000)
+        for i in range(3):
+            region.set(i, np.zeros(100))
+        assert region.get(0) == (False, None)
+        assert region.get(2)[0]
+        region.set('huge', np.zeros(1000))
+        assert region.get('huge') == (False, None)
+        stats = region.stats()
+        assert stats['keys'] == 2 and stats['size'] == 1600 and stats['evictions'] == 1
+
+    def test_memory_region_pending(self):
+        region = cache.MemoryRegion(max_keys=3)
+        for i in range(10):
+            assert region.get(i) == (False, None)
+        assert list(region._pending) == [7, 8, 9]
+        region.set(9, 1)
+        assert list(region._pending) == [7, 8]
+
+    def test_memory_size(self):
+        import numpy as np
+        from pymor.vectorarrays.numpy import NumpyVectorSpace
+        assert cache._memory_size(NumpyVectorSpace(10).zeros(3)) == 240
+        assert cache._memory_size(NumpyVectorSpace.from_numpy(np.zeros((3, 10), dtype=complex))) == 480
+        assert cache._memory_size(NumpyVectorSpace(10).empty()) == 0
+
+    def test_disk_region_stats(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            region = cache.DiskRegion(path=os.path.join(tmpdir, str(uuid4())), max_size=1024 ** 2, persistent=False)
+            region.get('a')
+            region.set('a', 1)
+            region.get('a')
+            stats = region.stats()
+            assert stats['hits'] == 1 and stats['misses'] == 1 and stats['keys'] == 1
+            assert stats['max_size'] == 1024 ** 2 and stats['size'] > 0
+
+    def test_memory_region_hashable_keys(self):
+        import numpy as np
+        from pymor.parameters.base import Parameter
+        c = IamLimitedCached('memory')
+        region = cache.cache_regions['memory']
+        region.clear()
+        keys_before = len(region._cache)
+        mu = Parameter({'diffusion': np.arange(3.), 'k': np.array([1.])})
+        assert c.me_takey_no_time(mu['k']) == 1
+        assert c.me_takey_no_time(arg=Parameter(mu)['k'].copy()) == 1
+        assert c.me_takey_no_time(2.) == 2
+        assert c.me_takey_no_time(2) == 2
+        assert len(region._cache) == keys_before + 3
+        assert all(type(k) is tuple for k in region._cache)
+        assert cache._hashable_key(1) != cache._hashable_key(1.)
+        assert cache._hashable_key(np.arange(3.)) != cache._hashable_key(np.arange(3))
+        assert cache._hashable_key(mu) == cache._hashable_key(Parameter(mu))
+
 
 if __name__ == "__main__":
     runmodule(filename=__file__)
@@ -28,6 +28,24 @@ def test_defaults():
     assert func(0, 1, 5, d=None) == (0, 1, 5, 3, 4)
 
 
+@defaults('b')
+def func_with_varargs(a, *args, b=1, c, **kwargs):
+    return a, args, b, c, kwargs
+
+
+def test_defaults_signature():
+    import inspect
+    assert func_with_varargs(0, 1, c=2, d=3) == (0, (1,), 1, 2, {'d': 3})
+    assert func_with_varargs(0, b=None, c=2) == (0, (), 1, 2, {})
+    with pytest.raises(TypeError):
+        func(0, 1, 2, 3, 4, 5)
+    with pytest.raises(TypeError):
+        func(0, 1, a=0)
+    set_defaults({__name__ + '.func_with_varargs.b': 5})
+    assert func_with_varargs(0, c=2) == (0, (), 5, 2, {})
+    assert inspect.signature(func_with_varargs).parameters['b'].default == 5
+
+
 def test_print_defaults():
     print_defaults()
 
@@ -80,5 +80,31 @@ def test_withcopy_implementors():
     for TestType in subclassForImplemetorsOf(ImmutableInterface, WithcopyInterface):
         TestType().test_with_()
 
+
+def test_generate_sid_arrays():
+    import numpy as np
+    import scipy.sparse as sps
+    from pymor.core.interfaces import generate_sid, _digest_cache
+    a = np.arange(12.).reshape(3, 4)
+    sid = generate_sid(a)
+    assert sid == generate_sid(a.copy())
+    assert sid == generate_sid(np.asfortranarray(a))
+    assert sid != generate_sid(a.reshape(4, 3))
+    assert sid != generate_sid(a.astype(np.float32))
+    a[0, 0] = 1.
+    assert sid != generate_sid(a)
+    a = a.copy()
+    a.setflags(write=False)
+    sid = generate_sid(a)
+    assert id(a) in _digest_cache
+    assert sid == generate_sid(a)
+    m = sps.random(10, 10, density=0.3, format='csr', random_state=0)
+    sid = generate_sid(m)
+    assert sid == generate_sid(m.copy())
+    assert sid != generate_sid(m.tocsc())
+    m.data[0] += 1.
+    assert sid != generate_sid(m)
+
+
 if __name__ == "__main__":
     runmodule(filename=__file__)
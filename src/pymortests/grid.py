@@ -3,6 +3,8 @@
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
 from pickle import dumps, loads
+import os
+import struct
 from itertools import product
 
 import numpy as np
@@ -450,3 +452,149 @@ def test_visualize(grids_with_visualize):
         pytest.xfail("Qt missing")
     finally:
         stop_gui_processes()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 2**20])
+def test_unique_entries_per_row(chunk_size):
+    from pymor.grids.defaultimpl import _unique_entries_per_row
+    np.random.seed(0)
+    A = np.random.randint(-1, 6, size=(30, 8)).astype(np.int32)
+    R = _unique_entries_per_row(A, chunk_size=chunk_size)
+    for a, r in zip(A, R):
+        expected = [x for i, x in enumerate(a) if x >= 0 and x not in a[:i]]
+        assert list(r[:len(expected)]) == expected
+        assert np.all(r[len(expected):] == -1)
+    assert R.dtype == A.dtype
+
+
+def _msh_file(version, binary, tags, vertices, faces, lines, line_physical_tags):
+    out = [f'$MeshFormat\n{version} {int(binary)} 8\n'.encode()]
+    if binary:
+        out.append(struct.pack('<i', 1) + b'\n')
+    out.append(b'$EndMeshFormat\n$PhysicalNames\n3\n1 1 "bottom"\n1 2 "rest"\n2 3 "domain"\n$EndPhysicalNames\n')
+    bottom, rest = lines[line_physical_tags == 1], lines[line_physical_tags == 2]
+    if version == '2.2':
+        out.append(f'$Nodes\n{len(tags)}\n'.encode())
+        if binary:
+            out.extend(struct.pack('<iddd', t, x, y, 0.) for t, (x, y) in zip(tags, vertices))
+            out.append(b'\n')
+        else:
+            out.extend(f'{t} {x} {y} 0\n'.encode() for t, (x, y) in zip(tags, vertices))
+        out.append(f'$EndNodes\n$Elements\n{1 + len(lines) + len(faces)}\n'.encode())
+        if binary:
+            out.append(struct.pack('<7i', 15, 1, 2, 1, 0, 1, tags[0]))
+            out.append(struct.pack('<3i', 1, len(lines), 2))
+            out.extend(struct.pack('<5i', i, p, 1, *tags[l]) for i, (p, l) in enumerate(zip(line_physical_tags, lines)))
+            out.append(struct.pack('<3i', 2, len(faces), 2))
+            out.extend(struct.pack('<6i', i, 3, 1, *tags[f]) for i, f in enumerate(faces))
+            out.append(b'\n')
+        else:
+            # use different numbers of tags for different elements
+            out.append(f'1 15 2 0 1 {tags[0]}\n'.encode())
+            out.extend(f'{i} 1 2 {p} 1 {tags[l[0]]} {tags[l[1]]}\n'.encode()
+                       for i, (p, l) in enumerate(zip(line_physical_tags, lines)))
+            out.extend(f'{i} 2 3 3 1 0 {" ".join(map(str, tags[f]))}\n'.encode() for i, f in enumerate(faces))
+        out.append(b'$EndElements\n')
+    else:
+        # two curves with physical tags 1 and 2, one surface with physical tag 3;
+        # the first half of the nodes lies in a parametric block on the first curve
+        k = len(tags) // 2
+        node_blocks = [(1, 1, 1, tags[:k], np.hstack([vertices[:k], np.zeros((k, 2))])),
+                       (2, 1, 0, tags[k:], np.hstack([vertices[k:], np.zeros((len(tags) - k, 1))]))]
+        element_blocks = [(0, 1, 15, tags[:1, np.newaxis]), (1, 1, 1, tags[bottom]), (1, 2, 1, tags[rest]),
+                          (2, 1, 2, tags[faces])]
+        num_elements = sum(len(b[3]) for b in element_blocks)
+        if binary:
+            out.append(b'$Entities\n' + struct.pack('<4Q', 0, 2, 1, 0))
+            out.extend(struct.pack('<i6dQiQ', tag, 0, 0, 0, 1, 1, 0, 1, p, 0) for tag, p in [(1, 1), (2, 2), (1, 3)])
+            out.append(b'\n$EndEntities\n$Nodes\n' + struct.pack('<4Q', 2, len(tags), 1, len(tags)))
+            for dim, entity, parametric, t, x in node_blocks:
+                out.append(struct.pack('<3iQ', dim, entity, parametric, len(t)))
+                out.append(t.astype('<u8').tobytes() + x.astype('<f8').tobytes())
+            out.append(b'\n$EndNodes\n$Elements\n' + struct.pack('<4Q', 4, num_elements, 1, num_elements))
+            for dim, entity, t, n in element_blocks:
+                out.append(struct.pack('<3iQ', dim, entity, t, len(n)))
+                out.append(np.hstack([np.arange(len(n))[:, np.newaxis], n]).astype('<u8').tobytes())
+            out.append(b'\n$EndElements\n')
+        else:
+            out.append(b'$Entities\n0 2 1 0\n1 0 0 0 1 1 0 1 1 0\n2 0 0 0 1 1 0 1 2 0\n1 0 0 0 1 1 0 1 3 0\n'
+                       b'$EndEntities\n')
+            out.append(f'$Nodes\n2 {len(tags)} 1 {len(tags)}\n'.encode())
+            for dim, entity, parametric, t, x in node_blocks:
+                out.append(f'{dim} {entity} {parametric} {len(t)}\n'.encode())
+                out.extend(f'{i}\n'.encode() for i in t)
+                out.extend((' '.join(map(str, c)) + '\n').encode() for c in x)
+            out.append(f'$EndNodes\n$Elements\n4 {num_elements} 1 {num_elements}\n'.encode())
+            for dim, entity, t, n in element_blocks:
+                out.append(f'{dim} {entity} {t} {len(n)}\n'.encode())
+                out.extend(f'{i} {" ".join(map(str, e))}\n'.encode() for i, e in enumerate(n))
+            out.append(b'$EndElements\n')
+    return b''.join(out)
+
+
+@pytest.mark.parametrize('version,binary', product(['2.2', '4.1'], [False, True]))
+def test_load_gmsh(version, binary, tmp_path):
+    from pymor.grids.gmsh import load_gmsh, _TOPOLOGY
+    from pymor.grids.unstructured import UnstructuredTriangleGrid
+    vertices = np.array([[x, y] for y in range(4) for x in range(4)]) / 3.
+    faces = np.array([f for y in range(3) for x in range(3)
+                      for f in ([4*y+x, 4*y+x+1, 4*y+x+5], [4*y+x, 4*y+x+5, 4*y+x+4])])
+    ref = UnstructuredTriangleGrid(vertices, faces)
+    boundary_edges = ref.boundaries(1)
+    lines = ref.subentities(1, 2)[boundary_edges]
+    line_physical_tags = np.where(np.all(vertices[lines][:, :, 1] == 0, axis=1), 1, 2)
+    tags = np.arange(1, len(vertices) + 1) if version == '4.1' else 3 * np.arange(len(vertices)) + 10
+
+    path = tmp_path / 'grid.msh'
+    path.write_bytes(_msh_file(version, binary, tags, vertices, faces, lines, line_physical_tags))
+
+    with open(path, 'rb' if binary else 'r') as f:
+        g, bi = load_gmsh(f)
+    assert np.all(g.subentities(0, 2) == faces)
+    assert np.all(g.subentities(0, 1) == ref.subentities(0, 1))
+    assert bi.boundary_types == ['bottom', 'rest']
+    for name, tag in [('bottom', 1), ('rest', 2)]:
+        edges = boundary_edges[line_physical_tags == tag]
+        assert np.all(np.flatnonzero(bi.mask(name, 1)) == np.sort(edges))
+        assert np.all(np.flatnonzero(bi.mask(name, 2)) == np.unique(lines[line_physical_tags == tag]))
+
+    cache_file = str(tmp_path / 'grid.cache')
+    load_gmsh(str(path), cache_file=cache_file)
+    cached_grid, cached_bi = load_gmsh(str(path), cache_file=cache_file)
+    assert isinstance(cached_grid.superentities(2, 1), np.memmap)
+    assert np.all(cached_grid.centers(2) == g.centers(2))
+    for method, *args in _TOPOLOGY + (('subentities', 0, 1), ('subentities', 0, 2)):
+        assert np.all(getattr(cached_grid, method)(*args) == getattr(g, method)(*args))
+    assert cached_bi.boundary_types == bi.boundary_types
+    for name, codim in product(bi.boundary_types, [1, 2]):
+        assert np.all(cached_bi.mask(name, codim) == bi.mask(name, codim))
+
+    # rewrite the MSH-file with the same modification time, the cache has to be ignored
+    stat = os.stat(path)
+    path.write_bytes(_msh_file(version, binary, tags, vertices, faces[::-1], lines, line_physical_tags))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    with open(path, 'rb' if binary else 'r') as f:
+        g, _ = load_gmsh(f, cache_file=cache_file)
+    assert np.all(g.subentities(0, 2) == faces[::-1])
+    assert not isinstance(g.subentities(0, 2), np.memmap)
+    assert np.all(cached_grid.subentities(0, 2) == faces)  # the old cache file is still memory-mapped
+    cached_grid, _ = load_gmsh(str(path), cache_file=cache_file)
+    assert np.all(cached_grid.subentities(0, 2) == faces[::-1])
+    assert isinstance(cached_grid.superentities(2, 1), np.memmap)
+    assert sorted(os.listdir(tmp_path)) == ['grid.cache', 'grid.msh']
+
+
+def test_grid_data_store():
+    from pymor.core.cache import cache_regions, default_regions
+    from pymor.grids.tria import TriaGrid
+    if 'memory' not in cache_regions:
+        default_regions()
+    num_keys = cache_regions['memory'].stats()['keys']
+    g = TriaGrid((4, 4))
+    centers = g.centers(0)
+    assert g.centers(codim=0) is centers
+    assert ('_centers', 0) in g._grid_data
+    assert not centers.flags.writeable
+    assert g._grid_data.nbytes >= centers.nbytes
+    assert cache_regions['memory'].stats()['keys'] == num_keys
+    assert len(loads(dumps(g)).__dict__.get('_grid_data', ())) == 0
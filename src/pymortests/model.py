@@ -3,9 +3,11 @@
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
 import numpy as np
+import pytest
 
 from pymor.algorithms.basic import almost_equal
 from pymor.core.pickle import dumps, loads
+from pymor.models.basic import StationaryModel
 from pymortests.fixtures.model import model, picklable_model
 from pymortests.base import runmodule
 from pymortests.pickling import assert_picklable, assert_picklable_without_dumps_function
@@ -28,5 +30,103 @@ def test_pickle_by_solving(model):
         assert np.all(almost_equal(m.solve(mu), m2.solve(mu)))
 
 
+def test_solve_batch(model):
+    m = model
+    if not isinstance(m, StationaryModel):
+        return
+    m.disable_caching()
+    mus = m.parameter_space.sample_randomly(3, seed=234)
+    U = m.solve_batch(mus)
+    assert len(U) == 3
+    for i, mu in enumerate(mus):
+        assert np.all(almost_equal(U[i], m.solve(mu)))
+
+
+def test_solve_and_estimate_batch_reduced():
+    from pymor.algorithms.gram_schmidt import gram_schmidt
+    from pymor.analyticalproblems.thermalblock import thermal_block_problem
+    from pymor.discretizers.cg import discretize_stationary_cg
+    from pymor.reductors.coercive import CoerciveRBReductor, SimpleCoerciveRBReductor
+    fom, _ = discretize_stationary_cg(thermal_block_problem((2, 2)), diameter=1./10.)
+    mus = fom.parameter_space.sample_randomly(10, seed=123)
+    RB = fom.solution_space.empty()
+    for mu in mus[:5]:
+        RB.append(fom.solve(mu))
+    RB = gram_schmidt(RB, product=fom.h1_0_semi_product)
+    for reductor in (CoerciveRBReductor, SimpleCoerciveRBReductor):
+        rom = reductor(fom, RB, product=fom.h1_0_semi_product).reduce()
+        U = rom.solve_batch(mus)
+        assert np.allclose(U.to_numpy(), np.vstack([rom.solve(mu).to_numpy() for mu in mus]))
+        assert np.allclose(rom.estimate_batch(U, mus), np.hstack([rom.estimate(U[i], mu) for i, mu in enumerate(mus)]))
+
+
+@pytest.mark.parametrize('modification', ['gram_schmidt', 'replace', 'reappend'])
+def test_reduce_after_basis_modification(modification):
+    from pymor.algorithms.gram_schmidt import gram_schmidt
+    from pymor.analyticalproblems.thermalblock import thermal_block_problem
+    from pymor.discretizers.cg import discretize_stationary_cg
+    from pymor.reductors.coercive import CoerciveRBReductor
+    fom, _ = discretize_stationary_cg(thermal_block_problem((2, 2)), diameter=1./10.)
+    mus = fom.parameter_space.sample_randomly(6, seed=123)
+    U = fom.solution_space.empty()
+    for mu in mus[:5]:
+        U.append(fom.solve(mu))
+    reductor = CoerciveRBReductor(fom, U[:3].copy(), check_orthonormality=False)
+    RB = reductor.bases['RB']
+    reductor.reduce()
+    if modification == 'gram_schmidt':
+        gram_schmidt(RB, copy=False)
+    elif modification == 'replace':
+        del RB[1:]
+        RB.append(U[3])
+        RB.append(U[1:3])
+    else:
+        del RB[0]
+        RB.append(U[0])
+    RB.append(U[4])
+    rom = reductor.reduce()
+    rom_full = CoerciveRBReductor(fom, RB.copy(), check_orthonormality=False).reduce()
+    for mu in mus:
+        u, u_full = rom.solve(mu), rom_full.solve(mu)
+        assert np.allclose(u.to_numpy(), u_full.to_numpy())
+        assert np.allclose(rom.estimate(u, mu), rom_full.estimate(u_full, mu))
+
+
+@pytest.mark.parametrize('with_E', [False, True])
+@pytest.mark.parametrize('m,p', [(2, 3), (3, 1)])
+def test_lti_eval_tf_batch(with_E, m, p):
+    from pymor.models.iosys import LTIModel
+    np.random.seed(0)
+    n = 10
+    A = np.random.randn(n, n) - 5 * np.eye(n)
+    E = np.eye(n) + 0.1 * np.random.randn(n, n) if with_E else None
+    lti = LTIModel.from_matrices(A, np.random.randn(n, m), np.random.randn(p, n), np.random.randn(p, m), E)
+    s = np.array([0.5, 1j, 2 + 3j])
+    assert np.allclose(lti.eval_tf_batch(s), np.stack([lti.eval_tf(si) for si in s]))
+    assert np.allclose(lti.eval_dtf_batch(s), np.stack([lti.eval_dtf(si) for si in s]))
+
+
+def test_tf_interp_reductor_without_batch_methods():
+    from types import SimpleNamespace
+    from pymor.models.iosys import TransferFunction
+    from pymor.reductors.interpolation import TFInterpReductor
+    from pymor.vectorarrays.numpy import NumpyVectorSpace
+
+    def H(s):
+        return np.array([[np.exp(-s) / (0.1 * s + 1)]])
+
+    def dH(s):
+        return np.array([[-(0.1 * s + 1.1) * np.exp(-s) / (0.1 * s + 1) ** 2]])
+
+    tf = TransferFunction(NumpyVectorSpace(1, 'INPUT'), NumpyVectorSpace(1, 'OUTPUT'), H, dH)
+    fom = SimpleNamespace(eval_tf=H, eval_dtf=dH, input_dim=1, output_dim=1, cont_time=True,
+                          input_space=tf.input_space, output_space=tf.output_space)
+    sigma = np.array([1., 1 + 1j, 1 - 1j])
+    rom = TFInterpReductor(fom).reduce(sigma, np.ones((1, 3)), np.ones((1, 3)))
+    rom_batch = TFInterpReductor(tf).reduce(sigma, np.ones((1, 3)), np.ones((1, 3)))
+    assert np.allclose(rom.eval_tf(2.), rom_batch.eval_tf(2.))
+    assert np.allclose(rom.eval_tf(1 + 1j), H(1 + 1j))
+
+
 if __name__ == "__main__":
     runmodule(filename=__file__)
@@ -6,7 +6,7 @@ import numpy as np
 import pytest
 
 from pymor.algorithms.basic import almost_equal
-from pymor.algorithms.projection import project
+from pymor.algorithms.projection import project, project_incrementally
 from pymor.core.exceptions import InversionError, LinAlgError
 from pymor.operators.constructions import SelectionOperator, InverseOperator, InverseAdjointOperator
 from pymor.parameters.base import ParameterType
@@ -75,6 +75,123 @@ def test_lincomb_op():
         assert almost_equal(pa, p.apply(vx)).all()
 
 
+@pytest.mark.parametrize('kind', ['spd', 'nonsymmetric', 'complex'])
+def test_numpy_dense_factorization(kind):
+    from pymor.operators.numpy import NumpyMatrixOperator
+    np.random.seed(0)
+    A = np.random.random((10, 10))
+    if kind == 'spd':
+        A = A @ A.T + np.eye(10)
+    elif kind == 'complex':
+        A = A + 1j * np.random.random((10, 10))
+    op = NumpyMatrixOperator(A)
+    V = op.range.from_numpy(np.random.random((3, 10)) + 1j * np.random.random((3, 10)))
+    for _ in range(2):
+        assert np.allclose(op.apply_inverse(V).to_numpy().T, np.linalg.solve(A, V.to_numpy().T))
+        assert np.allclose(op.apply_inverse_adjoint(V).to_numpy().T, np.linalg.solve(A.T.conj(), V.to_numpy().T))
+    assert op._factorization[0] == ('cholesky' if kind == 'spd' else 'lu')
+    assert op.generate_sid() == NumpyMatrixOperator(A).generate_sid()
+    singular_op = NumpyMatrixOperator(np.ones((3, 3)))
+    with pytest.raises(InversionError):
+        singular_op.apply_inverse(singular_op.range.from_numpy(np.ones(3)))
+
+
+def test_numpy_dense_factorization_integer_matrix():
+    from pymor.operators.numpy import NumpyMatrixOperator
+    A = np.array([[2, 1], [1, 3]])
+    op = NumpyMatrixOperator(A)
+    V = op.range.from_numpy(np.array([[1., 2.], [3., 4.]]))
+    assert np.allclose(op.apply_inverse(V).to_numpy().T, np.linalg.solve(A, V.to_numpy().T))
+    assert op._factorization[0] == 'cholesky'
+    op = NumpyMatrixOperator(np.array([[0, 1], [1, 0]]))
+    assert np.allclose(op.apply_inverse(V).to_numpy(), V.to_numpy()[:, ::-1])
+
+
+def test_cg_assembly_reuses_sparsity_pattern():
+    from pymor.functions.basic import ExpressionFunction
+    from pymor.grids.boundaryinfos import AllDirichletBoundaryInfo
+    from pymor.grids.tria import TriaGrid
+    from pymor.operators.cg import DiffusionOperatorP1, _sparsity_patterns
+    grid = TriaGrid(num_intervals=(10, 10))
+    boundary_info = AllDirichletBoundaryInfo(grid)
+    f = ExpressionFunction('c * (1 + x[..., 0])', 2, (), {'c': ()})
+    op = DiffusionOperatorP1(grid, boundary_info, diffusion_function=f, dirichlet_clear_columns=True,
+                             dirichlet_clear_diag=True)
+    A1 = op.assemble(mu=1.).matrix
+    A2 = op.assemble(mu=2.).matrix
+    assert len(_sparsity_patterns[grid]) == 1
+    assert np.array_equal(A1.indices, A2.indices) and np.array_equal(A1.indptr, A2.indptr)
+    assert np.allclose(A2.toarray(), 2 * A1.toarray())
+    assert np.allclose(A1.toarray(), A1.toarray().T)
+
+
+@pytest.mark.parametrize('format', ['csr', 'csc'])
+def test_sparse_lincomb_assembly(format):
+    import scipy.sparse as sps
+    from pymor.operators.constructions import IdentityOperator, LincombOperator, ZeroOperator
+    from pymor.operators.numpy import NumpyMatrixOperator
+    from pymor.parameters.functionals import ProjectionParameterFunctional
+    matrices = [sps.random(20, 20, density=0.2, format=format, random_state=i) for i in range(3)]
+    ops = [NumpyMatrixOperator(m) for m in matrices]
+    ops += [IdentityOperator(ops[0].source), ZeroOperator(ops[0].range, ops[0].source)]
+    op = LincombOperator(ops, [ProjectionParameterFunctional('theta', (len(ops),), (i,)) for i in range(len(ops))])
+    for coefficients in ([1., 2., -3., 4., 5.], [0.5, 0., 2., 0., 1.], [1j, 2., 3., -1j, 0.]):
+        assembled = op.assemble({'theta': np.array(coefficients)}).matrix
+        expected = sum(c * m.toarray() for c, m in zip(coefficients, matrices)) + coefficients[3] * np.eye(20)
+        assert assembled.format == format
+        assert np.allclose(assembled.toarray(), expected)
+    assert ops[0]._last_lincomb_pattern[1] is not None
+
+
+@pytest.mark.parametrize('num_flux', ['lax_friedrichs', 'engquist_osher', 'simplified_engquist_osher'])
+def test_nonlinear_advection_apply_multiple_vectors(num_flux):
+    from pymor.analyticalproblems.burgers import burgers_problem_2d
+    from pymor.discretizers.fv import discretize_instationary_fv
+    problem = burgers_problem_2d(vx=1., vy=1., initial_data_type='sin', parameter_range=(1., 2.))
+    fom, _ = discretize_instationary_fv(problem, diameter=1/5, nt=1, num_flux=num_flux)
+    op = fom.operator
+    U = op.source.from_numpy(np.random.RandomState(0).rand(7, op.source.dim))
+    R = op.apply(U, mu=1.5)
+    for i in range(len(U)):
+        assert np.allclose(R[i].to_numpy(), op.apply(U[i], mu=1.5).to_numpy())
+
+
+def test_nonlinear_advection_apply_chunks(monkeypatch):
+    from pymor.analyticalproblems.burgers import burgers_problem_2d
+    from pymor.discretizers.fv import discretize_instationary_fv
+    problem = burgers_problem_2d(vx=1., vy=1., initial_data_type='sin', parameter_range=(1., 2.))
+    fom, _ = discretize_instationary_fv(problem, diameter=1/100, nt=1)
+    op = fom.operator
+    assert op.grid.size(1) > 2**14
+    flux_type = type(op.numerical_flux)
+    evaluate_stage1 = flux_type.evaluate_stage1
+    chunk_lengths = []
+
+    def counting_evaluate_stage1(self, U, mu=None):
+        chunk_lengths.append(len(U) // op.source.dim)
+        return evaluate_stage1(self, U, mu)
+
+    monkeypatch.setattr(flux_type, 'evaluate_stage1', counting_evaluate_stage1)
+    U = op.source.from_numpy(np.random.RandomState(0).rand(5, op.source.dim))
+    op.apply(U, mu=1.5)
+    assert max(chunk_lengths) > 1
+
+
+@pytest.mark.parametrize('num_flux', ['lax_friedrichs', 'engquist_osher', 'simplified_engquist_osher'])
+def test_nonlinear_advection_jacobian(num_flux):
+    from pymor.analyticalproblems.burgers import burgers_problem_2d
+    from pymor.discretizers.fv import discretize_instationary_fv
+    problem = burgers_problem_2d(vx=1., vy=1., initial_data_type='sin', parameter_range=(1., 2.))
+    fom, _ = discretize_instationary_fv(problem, diameter=1/5, nt=1, num_flux=num_flux)
+    op = fom.operator
+    U = op.source.from_numpy(np.random.RandomState(0).rand(op.source.dim) + 0.5)
+    J = op.jacobian(U, mu=1.5).matrix.toarray()
+    h = 1e-6
+    E = op.source.from_numpy(np.eye(op.source.dim) * h)
+    J_fd = ((op.apply(U + E, mu=1.5) - op.apply(U - E, mu=1.5)).to_numpy() / (2 * h)).T
+    assert np.allclose(J, J_fd, rtol=1e-2, atol=1e-5 * np.abs(J_fd).max())
+
+
 def test_pickle(operator):
     assert_picklable(operator)
 
@@ -254,6 +371,25 @@ def test_project_with_product_2(operator_with_arrays_and_products):
     assert np.all(almost_equal(Y0, Y2))
 
 
+def test_project_incrementally(operator_with_arrays_and_products):
+    op, mu, U, V, sp, rp = operator_with_arrays_and_products
+    op_UV = project(op, V, U, product=rp)
+    op_UV_inc = project_incrementally(op, project(op, V[:len(V) // 2], U[:len(U) // 2], product=rp), V, U,
+                                      product=rp)
+    op_U_inc = project_incrementally(op, project(op, None, U[:len(U) // 2]), None, U)
+    op_V_inc = project_incrementally(op, project(op, V[:len(V) // 2], None, product=rp), V, None, product=rp)
+    assert op_UV_inc.source == op_UV.source and op_UV_inc.range == op_UV.range
+    np.random.seed(4711 + U.dim + len(V))
+    W = op_UV.source.make_array(np.random.random(len(U)))
+    Y0 = op_UV.apply(W, mu=mu)
+    Y1 = op_UV_inc.apply(W, mu=mu)
+    Y2 = project(op_U_inc, V, None, product=rp).apply(W, mu=mu)
+    Y3 = project(op_V_inc, None, U).apply(W, mu=mu)
+    assert np.all(almost_equal(Y0, Y1))
+    assert np.all(almost_equal(Y0, Y2))
+    assert np.all(almost_equal(Y0, Y3))
+
+
 def test_jacobian(operator_with_arrays):
     op, mu, U, _ = operator_with_arrays
     if len(U) == 0:
@@ -0,0 +1,116 @@
+# This file is part of the pyMOR project (http://www.pymor.org).
+# Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
+
+import numpy as np
+import pytest
+
+from pymor.grids.tria import TriaGrid
+from pymor.parallel.dummy import dummy_pool
+from pymor.parallel.process import ProcessPool
+from pymor.vectorarrays.numpy import NumpyVectorSpace
+from pymortests.base import runmodule
+
+
+@pytest.fixture(scope='module', params=['dummy', 'process'])
+def pool(request):
+    if request.param == 'dummy':
+        yield dummy_pool
+    else:
+        pool = ProcessPool(num_workers=3)
+        yield pool
+        pool.shutdown()
+
+
+def _sum(x, offset=0):
+    return sum(x) + offset
+
+
+def _norms(U=None):
+    return U.l2_norm()
+
+
+def _scale(U=None):
+    U.scal(2.)
+
+
+def _fail_on_odd(x):
+    if x % 2:
+        raise ValueError(x)
+    return x
+
+
+def _length(l=None):
+    return len(l)
+
+
+def _grid_centers(grid=None):
+    stored = ('_centers', 0) in grid._grid_data
+    centers = grid.centers(0)
+    return stored, centers.flags.writeable, centers.copy()
+
+
+def test_apply(pool):
+    assert pool.apply(_sum, [1, 2, 3], offset=1) == [7] * len(pool)
+
+
+def test_apply_only(pool):
+    assert pool.apply_only(_sum, len(pool) - 1, [1, 2], offset=3) == 6
+
+
+def test_map(pool):
+    assert pool.map(_sum, [[i, i] for i in range(10)], offset=1) == [2*i + 1 for i in range(10)]
+
+
+def test_map_after_error(pool):
+    with pytest.raises(ValueError):
+        pool.map(_fail_on_odd, list(range(len(pool) * 2)))
+    assert pool.apply(_sum, [1, 2, 3], offset=1) == [7] * len(pool)
+    assert pool.map(_sum, [[i, i] for i in range(10)], offset=1) == [2*i + 1 for i in range(10)]
+
+
+def test_push(pool):
+    U = NumpyVectorSpace(4).from_numpy(np.arange(8.).reshape((2, 4)))
+    with pool.push(U) as remote_U:
+        norms = pool.apply(_norms, U=remote_U)
+    assert all(np.allclose(n, U.l2_norm()) for n in norms)
+
+
+def test_push_grid_data(pool):
+    grid = TriaGrid((64, 64))
+    centers = grid.centers(0)
+    with pool.push(grid) as remote_grid:
+        results = pool.apply(_grid_centers, grid=remote_grid)
+    assert all(stored and not writeable and np.all(c == centers) for stored, writeable, c in results)
+
+
+@pytest.mark.parametrize('copy', [True, False])
+def test_scatter_array(pool, copy):
+    U = NumpyVectorSpace(5).from_numpy(np.random.random((11, 5)))
+    norms = U.l2_norm()
+    with pool.scatter_array(U, copy=copy) as remote_U:
+        assert not copy or len(U) == 11
+        pool.apply(_scale, U=remote_U)
+        assert np.allclose(np.hstack(pool.apply(_norms, U=remote_U)), 2 * norms)
+
+
+def test_scatter_list(pool):
+    with pool.scatter_list(list(range(11))) as remote_l:
+        assert sum(pool.apply(_length, l=remote_l)) == 11
+
+
+def test_eval_tf_batch(pool):
+    import scipy.sparse as sps
+    from pymor.models.iosys import LTIModel
+    np.random.seed(0)
+    A = sps.csc_matrix(np.random.randn(10, 10) - 5 * np.eye(10))  # a sparse A is not handled by the dense path
+    lti = LTIModel.from_matrices(A, np.random.randn(10, 2), np.random.randn(3, 10))
+    assert not lti._has_dense_pencil()
+    s = np.array([0.5, 1j, 2 + 3j, 4j])
+    assert np.allclose(lti.eval_tf_batch(s, pool=pool), np.stack([lti.eval_tf(si) for si in s]))
+    assert np.allclose(lti.eval_dtf_batch(s, pool=pool), np.stack([lti.eval_dtf(si) for si in s]))
+    assert lti.eval_tf_batch(np.array([]), pool=pool).shape == (0, 3, 2)
+
+
+if __name__ == "__main__":
+    runmodule(filename=__file__)
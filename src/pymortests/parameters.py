@@ -2,11 +2,15 @@
 # Copyright 2013-2019 pyMOR developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (http://opensource.org/licenses/BSD-2-Clause)
 
+import numpy as np
+import pytest
+
+from pymor.parameters.base import ParameterArray
+from pymor.parameters.functionals import (ExpressionParameterFunctional, GenericParameterFunctional,
+                                          ProjectionParameterFunctional)
 from pymor.parameters.spaces import CubicParameterSpace
 from pymortests.base import runmodule
 
-import pytest
-
 
 num_samples = 100
 
@@ -30,5 +34,44 @@ def test_randomly(space):
         assert space.contains(value)
 
 
+def test_parameter_array():
+    space = CubicParameterSpace({'diffusion': (2,), 'c': ()}, 0.1, 1)
+    mus = space.sample_randomly(10, seed=1)
+    mus_array = ParameterArray(mus)
+    assert len(mus_array) == 10
+    assert mus_array['diffusion'].shape == (10, 2) and mus_array['c'].shape == (10,)
+    assert all(mu.allclose(mu_array) for mu, mu_array in zip(mus, mus_array))
+    assert len(mus_array[2:5]) == 3 and mus_array[2:5][0].allclose(mus[2])
+    assert list(ParameterArray(mus_array, {'c': ()}).components) == ['c']
+
+
+@pytest.mark.parametrize('expression', ['min(diffusion)', 'diffusion[1] * c**2', 'sum(diffusion) + exp(c)',
+                                        'norm(diffusion)', '2.', 'np.prod(diffusion) * c'])
+def test_evaluate_many(expression):
+    space = CubicParameterSpace({'diffusion': (2,), 'c': ()}, 0.1, 1)
+    mus = space.sample_randomly(10, seed=1)
+    functionals = [ExpressionParameterFunctional(expression, space.parameter_type),
+                   ProjectionParameterFunctional('diffusion', (2,), (1,)),
+                   GenericParameterFunctional(lambda mu: mu['c'] * 2, {'c': ()})]
+    functionals.append(functionals[0] * functionals[1] * 3.)
+    for f in functionals:
+        assert np.allclose(f.evaluate_many(mus), [f.evaluate(mu) for mu in mus])
+        assert np.allclose(f.evaluate_many(ParameterArray(mus)), [f.evaluate(mu) for mu in mus])
+
+
+@pytest.mark.parametrize('expression', ['np.max(c)', 'max(c, 0)', 'c if c > 0.5 else 1.', 'array([c, 1.])[0]'])
+def test_evaluate_many_not_elementwise(expression):
+    f = ExpressionParameterFunctional(expression, {'c': ()})
+    assert not f._vectorizable
+    assert np.array_equal(f.evaluate_many([{'c': 1.}, {'c': .5}, {'c': 1.}]),
+                          [f.evaluate({'c': c}) for c in (1., .5, 1.)])
+
+
+def test_evaluate_many_elementwise():
+    parameter_type = {'diffusion': (2,), 'c': ()}
+    assert all(ExpressionParameterFunctional(e, parameter_type)._vectorizable
+               for e in ['min(diffusion)', 'diffusion[-1] * c**2', 'sum(diffusion[0:2]) + exp(-c)', '2.'])
+
+
 if __name__ == "__main__":
     runmodule(filename=__file__)
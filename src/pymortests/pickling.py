@@ -13,9 +13,10 @@ from pymor.grids.subgrid import SubGrid
 from pymor.operators.numpy import NumpyMatrixBasedOperator
 
 is_equal_ignored_attributes = \
-    ((SubGrid, {'_uid', '_CacheableInterface__cache_region', '_SubGrid__parent_grid'}),
-     (NumpyMatrixBasedOperator, {'_uid', '_CacheableInterface__cache_region', '_assembled_operator'}),
-     (BasicInterface, {'_name', '_uid', '_CacheableInterface__cache_region'}))
+    ((SubGrid, {'_uid', '_CacheableInterface__cache_region', '_SubGrid__parent_grid', '_grid_data'}),
+     (NumpyMatrixBasedOperator, {'_uid', '_CacheableInterface__cache_region', '_assembled_operator',
+                                 '_last_lincomb_pattern'}),
+     (BasicInterface, {'_name', '_uid', '_CacheableInterface__cache_region', '_grid_data'}))
 
 is_equal_dispatch_table = {}
 
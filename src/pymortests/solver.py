@@ -65,3 +65,29 @@ def test_numpy_sparse_solvers(numpy_sparse_solver):
     rhs = op.range.make_array(np.ones(10))
     solution = op.apply_inverse(rhs)
     assert ((op.apply(solution) - rhs).l2_norm() / rhs.l2_norm())[0] < 1e-8
+
+
+def test_scipy_factorization_cache():
+    from pymor.bindings.scipy import FactorizationCache, factorization_cache
+    from pymor.core.pickle import dumps, loads
+    cache = factorization_cache()
+    cache.clear()
+    hits, misses = cache.hits, cache.misses
+    n = 100
+    A = diags([-2 * np.ones(n), np.ones(n - 1), np.ones(n - 1)], [0, 1, -1], format='csc')
+    E = diags([np.arange(1., n + 1)], [0], format='csc')
+    rhs = NumpyVectorSpace(n).make_array(np.random.RandomState(0).rand(2, n))
+    for s in [1., 2., 3.]:
+        op = NumpyMatrixOperator((s * E - A).tocsc())
+        solution = op.apply_inverse(rhs)
+        assert np.all((op.apply(solution) - rhs).l2_norm() / rhs.l2_norm() < 1e-10)
+    assert cache.misses == misses + 3 and len(cache._orderings) == 1
+
+    op2 = loads(dumps(op))
+    op2.apply_inverse(rhs)
+    assert cache.misses == misses + 3 and cache.hits == hits + 1
+
+    small_cache = FactorizationCache(max_memory=0)
+    for s in [1., 2.]:
+        small_cache.factorization((s * E - A).tocsc(), np.float64, 'COLAMD')
+    assert len(small_cache._factorizations) == 1
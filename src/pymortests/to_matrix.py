@@ -6,11 +6,12 @@ import numpy as np
 import scipy.linalg as spla
 import scipy.sparse as sps
 
-from pymor.algorithms.to_matrix import to_matrix
+from pymor.algorithms.to_matrix import to_matrix, to_matrix_batch
 from pymor.operators.block import BlockOperator, BlockDiagonalOperator
 from pymor.operators.constructions import (AdjointOperator, ComponentProjection, IdentityOperator, VectorArrayOperator,
                                            ZeroOperator)
 from pymor.operators.numpy import NumpyMatrixOperator
+from pymor.parameters.functionals import ProjectionParameterFunctional
 from pymor.vectorarrays.numpy import NumpyVectorSpace
 
 
@@ -219,3 +220,21 @@ def test_to_matrix_ZeroOperator():
 
     Zop = ZeroOperator(NumpyVectorSpace(n), NumpyVectorSpace(m))
     assert_type_and_allclose(Z, Zop, 'sparse')
+
+
+def test_to_matrix_batch():
+    np.random.seed(0)
+    A = np.random.randn(3, 3)
+    B = np.random.randn(3, 3)
+    C = np.random.randn(3, 3)
+    theta = ProjectionParameterFunctional('mu', (2,), (0,))
+    Aop = NumpyMatrixOperator(A)
+    Bop = NumpyMatrixOperator(sps.csc_matrix(B))
+    Cop = NumpyMatrixOperator(C)
+    Op = Aop + (Bop * theta) @ Cop + Bop * ProjectionParameterFunctional('mu', (2,), (1,))
+    mus = [{'mu': np.random.randn(2)} for _ in range(4)]
+    mats = to_matrix_batch(Op, mus)
+    assert mats.shape == (4, 3, 3)
+    for mu, mat in zip(mus, mats):
+        assert np.allclose(mat, A + mu['mu'][0] * B.dot(C) + mu['mu'][1] * B)
+    assert to_matrix_batch(Aop, mus).shape == (1, 3, 3)
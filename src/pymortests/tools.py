@@ -6,7 +6,9 @@ from math import sin, pi, exp
 import numpy as np
 import pytest
 import itertools
+import os
 
+from pymor.core.config import config
 from pymor.tools.io import SafeTemporaryFileName
 from pymortests.base import TestInterface, runmodule
 from pymortests.fixtures.grid import rect_or_tria_grid
@@ -14,7 +16,7 @@ from pymortests.base import polynomials
 from pymor.tools.deprecated import Deprecated
 from pymor.tools.quadratures import GaussQuadratures
 from pymor.tools.floatcmp import float_cmp, float_cmp_all
-from pymor.tools.vtkio import write_vtk
+from pymor.tools.vtkio import write_vtk, write_xdmf
 from pymor.vectorarrays.numpy import NumpyVectorSpace
 from pymor.tools import timing
 
@@ -99,6 +101,27 @@ def test_vtkio(rect_or_tria_grid):
                     write_vtk(grid, data, out_name, codim=codim)
 
 
+@pytest.mark.skipif(not config.HAVE_H5PY, reason='h5py not available')
+def test_xdmf(rect_or_tria_grid):
+    import h5py
+    from pymor.grids.constructions import flatten_grid
+    grid = rect_or_tria_grid
+    entity_map = flatten_grid(grid)[2]
+    for codim in range(grid.dim + 1):
+        data = np.random.RandomState(0).rand(5, grid.size(codim))
+        chunks = (NumpyVectorSpace.from_numpy(data[i:i+2]) for i in range(0, 5, 2))
+        with SafeTemporaryFileName('wb') as out_name:
+            if codim == 1:
+                with pytest.raises(NotImplementedError):
+                    write_xdmf(grid, chunks, out_name, codim=codim)
+                continue
+            write_xdmf(grid, chunks, out_name, codim=codim)
+            with h5py.File(out_name + '.h5', 'r') as f:
+                assert np.all(f['data'][...] == (data if codim == 0 else data[:, entity_map]))
+            os.remove(out_name + '.h5')
+            os.remove(out_name + '.xdmf')
+
+
 class TestTiming(TestInterface):
 
     def testTimingContext(self):
@@ -14,7 +14,7 @@ from pymor.vectorarrays.interfaces import VectorSpaceInterface, _INDEXTYPES
 from pymortests.fixtures.vectorarray import \
     (vector_array_without_reserve, vector_array, compatible_vector_array_pair_without_reserve,
      compatible_vector_array_pair, incompatible_vector_array_pair,
-     picklable_vector_array_without_reserve, picklable_vector_array)
+     picklable_vector_array_without_reserve, picklable_vector_array, memmap_numpy_vector_array_pair)
 from pymortests.pickling import assert_picklable_without_dumps_function
 
 
@@ -1047,3 +1047,93 @@ def test_pairwise_dot_wrong_ind(compatible_vector_array_pair):
 
 def test_pickle(picklable_vector_array):
     assert_picklable_without_dumps_function(picklable_vector_array)
+
+
+def test_memmap_vector_array():
+    from pymor.vectorarrays.memmap import MemmapVectorSpace
+    from pymor.vectorarrays.numpy import NumpyVectorSpace
+    np.random.seed(0)
+    D = np.random.random((23, 7))
+    space = MemmapVectorSpace(7, block_size=4)
+    U = space.from_numpy(D)
+    assert len(U._blocks) == 6
+    assert np.allclose(U.to_numpy(), D)
+    assert np.allclose(U.gramian(), D @ D.T)
+    ind = [3, 1, 1, 20, 21, 22, 5]
+    assert np.allclose(U[ind].to_numpy(), D[ind])
+    assert np.allclose(U[ind].dot(U[2:9]), D[ind] @ D[2:9].T)
+    assert np.allclose(U[::3].gramian(), D[::3] @ D[::3].T)
+    c = np.random.random((5, 23))
+    assert np.allclose(U.lincomb(c).to_numpy(), c @ D)
+    assert np.allclose(U.l2_norm(), np.linalg.norm(D, axis=1))
+    assert np.allclose(U.sup_norm(), np.abs(D).max(axis=1))
+    assert np.allclose(U.dofs([0, 6]), D[:, [0, 6]])
+
+    W = U.copy()
+    W[5:12].axpy(np.arange(7.), U[0:7])
+    E = D.copy()
+    E[5:12] += np.arange(7.)[:, np.newaxis] * D[0:7]
+    assert np.allclose(W.to_numpy(), E)
+    assert np.allclose(U.to_numpy(), D)
+
+    U.append(NumpyVectorSpace.from_numpy(D[:3]))
+    del U[[0, 5, 25]]
+    assert np.allclose(U.to_numpy(), np.delete(np.vstack([D, D[:3]]), [0, 5, 25], axis=0))
+
+    assert MemmapVectorSpace(7, dtype=np.complex128) != MemmapVectorSpace(7)
+    assert U not in MemmapVectorSpace(7, dtype=np.float32)
+
+
+def test_memmap_with_numpy_vector_array(memmap_numpy_vector_array_pair):
+    v1, v2 = memmap_numpy_vector_array_pair
+    d1, d2 = v1.to_numpy(), v2.to_numpy()
+    for ind1, ind2 in chain(valid_inds_of_different_length(v1, v2), valid_inds_of_same_length(v1, v2)):
+        assert np.allclose(v1[ind1].dot(v2[ind2]), indexed(d1, ind1).dot(indexed(d2, ind2).T))
+    for ind1, ind2 in valid_inds_of_same_length(v1, v2):
+        assert np.allclose(v1[ind1].pairwise_dot(v2[ind2]), np.sum(indexed(d1, ind1) * indexed(d2, ind2), axis=1))
+        if not v1.check_ind_unique(ind1):
+            continue
+        c = v1.copy()
+        c[ind1].axpy(2., v2[ind2])
+        d = d1.copy()
+        d[ind1] = indexed(d1, ind1) + 2. * indexed(d2, ind2)
+        assert np.allclose(c.to_numpy(), d)
+    c = v1.copy()
+    c.append(v2)
+    assert np.all(c.to_numpy() == np.vstack([d1, d2]))
+    assert np.all(v1.space.from_vectorarray(v2).to_numpy() == d2)
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.complex128])
+def test_gramian_inner_with_product(dtype):
+    import scipy.sparse as sps
+    from pymor.core.defaults import set_defaults
+    from pymor.operators.constructions import IdentityOperator
+    from pymor.operators.numpy import NumpyMatrixOperator
+    from pymor.vectorarrays.list import NumpyListVectorSpace
+    np.random.seed(0)
+    M = sps.random(50, 50, density=0.1, format='csr', dtype=np.float64) + sps.eye(50)
+    if dtype is np.complex128:
+        M = M + 1j * sps.random(50, 50, density=0.1, format='csr')
+    M = M + M.T.conj()
+    product = NumpyMatrixOperator(M)
+    D = np.random.random((17, 50)).astype(dtype)
+    if dtype is np.complex128:
+        D += 1j * np.random.random((17, 50))
+    U = product.source.from_numpy(D)
+    ind = [3, 1, 1, 12, 0]
+    for block_bytes in (50 * 16 * 3, 2**26):
+        set_defaults({'pymor.vectorarrays.numpy.inner_options.block_bytes': block_bytes})
+        try:
+            assert np.allclose(U.gramian(product), product.apply2(U, U))
+            assert np.allclose(U[ind].gramian(product), product.apply2(U[ind], U[ind]))
+            assert np.allclose(U[ind].inner(U[2:9], product), product.apply2(U[ind], U[2:9]))
+            assert np.allclose(U.gramian(), D.conj() @ D.T)
+        finally:
+            set_defaults({'pymor.vectorarrays.numpy.inner_options.block_bytes': 2**26})
+
+    if dtype is np.float64:
+        V = NumpyListVectorSpace.from_numpy(D)
+        assert np.allclose(V.gramian(), D @ D.T)
+        assert np.allclose(V[ind].dot(V[2:9]), D[ind] @ D[2:9].T)
+        assert np.allclose(V.gramian(2 * IdentityOperator(V.space)), 2 * D @ D.T)